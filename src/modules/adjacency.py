@@ -0,0 +1,176 @@
+"""
+Precomputed neighbors of the open nodes of a maze.
+
+`grid.Grid.neighbors()` checks the bounds and walls around a node, and builds
+a new list, every time a search expands the node. An `Adjacency` index keeps
+the neighbors of every open node in compressed sparse row (CSR) form: the
+neighbors of the node at `index` are `targets[offsets[index]]` up to, but not
+including, `targets[offsets[index+1]]`, in the same order
+`grid.Grid.neighbors()` returns them. Walls have no neighbors in the index.
+A search walks them with `range(offsets[index], offsets[index+1])`, without
+allocating anything per node.
+
+Building the index takes about half as long as a BFS of the whole maze, so
+it only pays off when a maze is solved more than once. It's built on the
+second solve of a maze that wasn't changed since the first, and kept on the
+grid (see `grid.Grid.incremental`) after that. The cells changed since it
+was last used are read from `grid.Grid.changes_since()`, and only the rows of
+those nodes and the nodes around them are rebuilt.
+"""
+# Compact per-node arrays
+from array import array
+# Used to build the index without a Python loop over every node
+from itertools import accumulate, chain, compress
+# Grid model the index is built from
+from modules import grid
+
+
+# Key of the index in grid.Grid.incremental
+ADJACENCY_KEY = 'adjacency'
+
+# Key in grid.Grid.cache noting that the maze was solved without an index.
+# Emptied with the rest of the cache when the cells are changed.
+SOLVED_KEY = 'adjacency_solved'
+
+# The index is dropped, and built again later, instead of being patched, if
+# more than 1/PATCH_LIMIT of the maze's cells were changed
+PATCH_LIMIT = 16
+
+# Translates grid.Grid.cells into 1 for open nodes, and 0 for walls
+OPEN_NODES = bytes(0 if state == grid.WALL else 1 for state in range(256))
+
+
+class Adjacency(object):
+    """
+    The neighbors of every open node of `maze`.
+
+    Attributes:
+        `version` (int): The maze version the index is up to date with.
+        `offsets` (array): Start of each node's row in `targets`, followed
+            by the length of `targets`.
+        `targets` (array): The rows of neighbor indexes, one after another.
+
+    Args:
+        `maze` (grid.Grid): The maze to index.
+    """
+    def __init__(self, maze: grid.Grid) -> None:
+        self.maze = maze
+        self.rebuild()
+
+
+    def rebuild(self) -> None:
+        """
+        Builds the index from scratch. The open nodes are turned into one
+        big integer with a byte per node, which is shifted by a row or a
+        column and masked to find the open neighbors in each direction at
+        once. Only the rows themselves are put together node by node, by
+        `compress()`.
+        """
+        maze = self.maze
+        width = maze.width
+        size = maze.size
+        self.version = maze.version
+        bits = 8 * size
+        nodes = int.from_bytes(maze.cells.translate(OPEN_NODES), 'little')
+        # Nodes in every column but the last and the first
+        not_last = bytearray([1]) * size
+        not_last[width-1::width] = bytes(maze.height)
+        not_first = bytearray([1]) * size
+        not_first[::width] = bytes(maze.height)
+        # 1 for each open node with an open neighbor in that direction,
+        # in the same order as grid.Grid.neighbors()
+        directions = (
+            nodes & (nodes << 8*width) & ((1 << bits) - 1),
+            nodes & (nodes >> 8) & int.from_bytes(not_last, 'little'),
+            nodes & (nodes >> 8*width),
+            nodes & (nodes << 8) & int.from_bytes(not_first, 'little'),
+        )
+        # No byte can carry into the next, as it's at most 4
+        degrees = sum(directions).to_bytes(size, 'little')
+        self.offsets = array('i', accumulate(degrees, initial=0))
+        # Interleave the four directions, a group of four per node
+        selected = bytearray(4 * size)
+        for direction, mask in enumerate(directions):
+            selected[direction::4] = mask.to_bytes(size, 'little')
+        candidates = chain.from_iterable(zip(
+            range(-width, size-width), range(1, size+1),
+            range(width, size+width), range(-1, size-1)))
+        self.targets = array('i', compress(candidates, selected))
+
+
+    def update(self) -> bool:
+        """
+        Brings the index up to date with the maze, by rebuilding the rows of
+        the changed nodes and their neighbors, and shifting the rows in
+        between. Returns `False` if the index can't be patched, because the
+        cells were changed all at once or too many of them were changed.
+        """
+        maze = self.maze
+        changes = maze.changes_since(self.version)
+        if changes is None or len(changes) > maze.size // PATCH_LIMIT:
+            return False
+        if not changes:
+            return True
+        self.version = maze.version
+        width = maze.width
+        cells = maze.cells
+        # A node's row lists its neighbors, so the rows of the nodes around
+        # a changed node list it, or used to
+        rows = set()
+        for index in changes:
+            rows.add(index)
+            if index >= width:
+                rows.add(index-width)
+            if index % width != width-1:
+                rows.add(index+1)
+            if index+width < maze.size:
+                rows.add(index+width)
+            if index % width != 0:
+                rows.add(index-1)
+        offsets = self.offsets
+        targets = self.targets
+        new_offsets = array('i')
+        new_targets = array('i')
+        # How much further along the rows after the last rebuilt one are
+        shift = 0
+        node = 0
+        for index in sorted(rows):
+            # The rows up to this one are unchanged, but move by shift
+            if shift:
+                new_offsets.extend(map(shift.__add__, offsets[node:index]))
+            else:
+                new_offsets.extend(offsets[node:index])
+            new_targets.extend(targets[offsets[node]:offsets[index]])
+            new_offsets.append(len(new_targets))
+            if cells[index] != grid.WALL:
+                new_targets.extend(maze.neighbors(index))
+            shift = len(new_targets) - offsets[index+1]
+            node = index + 1
+        new_offsets.extend(map(shift.__add__, offsets[node:]))
+        new_targets.extend(targets[offsets[node]:])
+        self.offsets = new_offsets
+        self.targets = new_targets
+        return True
+
+
+def get_adjacency(maze: grid.Grid) -> Adjacency:
+    """
+    Returns the index kept on the grid, brought up to date with the maze,
+    or `None` if the solve asking for it should use `grid.Grid.neighbors()`.
+
+    The first solve of a maze, or of a maze changed since its last solve,
+    is only noted in `grid.Grid.cache`, and the index is built if the maze
+    is solved again without being changed in between. An index that can't
+    be patched is dropped, and built again the same way.
+    """
+    index = maze.incremental.get(ADJACENCY_KEY)
+    if index is not None:
+        if index.update():
+            return index
+        del maze.incremental[ADJACENCY_KEY]
+    if not maze.cache.get(SOLVED_KEY):
+        maze.cache[SOLVED_KEY] = True
+        return None
+    index = Adjacency(maze)
+    maze.incremental[ADJACENCY_KEY] = index
+    return index
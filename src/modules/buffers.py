@@ -0,0 +1,165 @@
+"""
+Pooled per-node arrays for the solvers.
+
+Every solve needs a few arrays with an entry per node, like parent links and
+path costs. Allocating them for a large maze takes longer than a short solve
+itself, so solves take their arrays from an `ArrayPool` and give them back
+when they're done.
+
+Pooled arrays aren't cleared between solves either, which would take as long
+as visiting every node. Instead, a solve takes a `Stamps` array along with
+them, which starts a new epoch: an entry of the solve's arrays only counts if
+its node was stamped with the current epoch, and every other entry is left
+over from an earlier solve. Starting a solve is then the same amount of work
+whether it searches a few nodes or the whole maze.
+
+A pooled array is only ever handed to one solve at a time, so solves never
+share state, and any number of them can run at once on the same maze.
+
+Parent links and path costs are both kept in `'i'` arrays, 4 bytes per node.
+Node indexes fit as long as a maze has fewer than 2**31 nodes, and terrain
+costs are whole numbers of at most `max(grid.COSTS)` per move, so path costs
+fit as long as a maze has fewer than `2**31 // max(grid.COSTS)` (about 429
+million) nodes.
+"""
+# Compact per-node arrays
+from array import array
+# Used to hand out arrays to solves running in different threads
+from threading import Lock
+
+
+# Epochs are stored in 2 bytes per node, and start over after this one
+EPOCH_LIMIT = 0xFFFF
+
+# Key of the Stamps arrays kept by ArrayPool, next to array typecodes
+STAMPS_KEY = 'stamps'
+
+# Most bytes of arrays ArrayPool keeps by default. Enough for the arrays of
+# a few solves of a 2001x2001 maze, or of a single 4096x4096 one.
+MAX_BYTES = 128 * 1024 * 1024
+
+
+class Stamps(object):
+    """
+    The epoch each node was last reached in, by the solves that used the
+    arrays taken along with this one.
+
+    Attributes:
+        `stamps` (array): The epoch each node was last stamped with.
+        `epoch` (int): The epoch of the solve the stamps were taken by.
+
+    Args:
+        `size` (int): Number of nodes.
+    """
+    def __init__(self, size: int) -> None:
+        self.stamps = array('H', [0]) * size
+        self.epoch = 0
+
+
+    def __len__(self) -> int:
+        """Returns the number of nodes."""
+        return len(self.stamps)
+
+    def next_epoch(self) -> int:
+        """
+        Starts a new epoch, in which no node has been stamped yet.
+        Returns the new epoch.
+        """
+        self.epoch += 1
+        if self.epoch > EPOCH_LIMIT:
+            self.stamps = array('H', [0]) * len(self.stamps)
+            self.epoch = 1
+        return self.epoch
+
+
+class ArrayPool(object):
+    """
+    Arrays given back by finished solves, kept to be reused.
+    Only arrays of the size last asked for are kept, so the pool never holds
+    on to the arrays of a maze that was resized or closed.
+
+    Args:
+        `limit` (int: Optional): Most arrays of each type kept.
+        `max_bytes` (int: Optional): Most bytes of arrays kept in total.
+            Arrays given back past it are dropped.
+    """
+    def __init__(self, limit: int = 4, max_bytes: int = MAX_BYTES) -> None:
+        self.limit = limit
+        self.max_bytes = max_bytes
+        self._size = None
+        # Lists of arrays, keyed by typecode or STAMPS_KEY
+        self._free = {}
+        # Bytes taken by the arrays in _free
+        self._bytes = 0
+        self._lock = Lock()
+
+
+    def _take_free(self, key: str, size: int):
+        """Returns a kept array of `key` and `size`, or `None`."""
+        with self._lock:
+            if size != self._size:
+                self._free = {}
+                self._bytes = 0
+                self._size = size
+            free = self._free.get(key)
+            if free:
+                buffer = free.pop()
+                self._bytes -= nbytes(buffer)
+                return buffer
+        return None
+
+
+    def take(self, typecode: str, size: int) -> array:
+        """
+        Returns an array of `size` items of `typecode`. Its items are left
+        over from earlier solves, so only read the items of nodes stamped in
+        the current epoch (see `take_stamps()`).
+        """
+        buffer = self._take_free(typecode, size)
+        if buffer is None:
+            buffer = array(typecode, [0]) * size
+        return buffer
+
+
+    def take_stamps(self, size: int) -> Stamps:
+        """Returns `Stamps` for `size` nodes, started on a new epoch."""
+        stamps = self._take_free(STAMPS_KEY, size)
+        if stamps is None:
+            stamps = Stamps(size)
+        stamps.next_epoch()
+        return stamps
+
+
+    def give_back(self, *buffers) -> None:
+        """
+        Returns arrays and `Stamps` to the pool. They mustn't be used again
+        afterwards. Ones that aren't of the size the pool holds, or don't fit
+        in `limit` and `max_bytes`, are dropped.
+        """
+        with self._lock:
+            for buffer in buffers:
+                if isinstance(buffer, Stamps):
+                    key = STAMPS_KEY
+                elif isinstance(buffer, array):
+                    key = buffer.typecode
+                else:
+                    continue
+                if len(buffer) != self._size:
+                    continue
+                free = self._free.setdefault(key, [])
+                size = nbytes(buffer)
+                if (len(free) < self.limit and
+                        self._bytes + size <= self.max_bytes):
+                    free.append(buffer)
+                    self._bytes += size
+
+
+def nbytes(buffer) -> int:
+    """Returns the number of bytes taken by an array or `Stamps`."""
+    if isinstance(buffer, Stamps):
+        buffer = buffer.stamps
+    return len(buffer) * buffer.itemsize
+
+
+# Pool shared by the solvers
+POOL = ArrayPool()
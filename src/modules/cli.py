@@ -0,0 +1,392 @@
+"""
+Command-line interface for solving mazes without the GUI.
+
+Run from the src directory, e.g.:
+    `python -m pathpyinder solve ../mazes/*.txt --algo astar --jobs 8`
+
+Each maze file is solved without rendering, and one JSON object per file is
+written as a line to stdout (or to `--output`).
+
+The `bench` command times algorithms and priority queues against each other,
+on maze files or on randomly generated mazes, e.g.:
+    `python -m pathpyinder bench --generate 501x501 --algo dijkstra astar`
+
+The `queues` command records the priority queue operations of real solves
+with every queue backend, and replays them on the backend they were recorded
+with (see `queue_trace`), e.g.:
+    `python -m pathpyinder queues ../mazes/*.txt --queue heap pairing radix`
+"""
+# Used to parse command-line arguments
+import argparse
+# Used to write results as JSON lines
+from json import dumps as jsondumps
+# Used to expand file patterns on shells that don't (e.g. Windows cmd)
+from glob import glob
+# Used to solve mazes in parallel
+from multiprocessing import Pool
+# Used to time maze loading
+from time import perf_counter
+# Used to generate the same benchmark mazes every run
+import random
+# Used to report errors
+import sys
+# Used to load maze files
+from modules import grid
+# Headless pathfinding algorithms
+from modules import solver
+# Precomputed jump distances, saved next to maze files
+from modules import jump_table
+# Priority queues the solvers can be benchmarked with
+from modules import priority_queue as pq
+# Recorded queue workloads, replayed to time each queue backend
+from modules import queue_trace
+
+
+def solve_file(filename: str, algorithm: str, include_path=True,
+               queue: str = None, check_connected=False,
+               save_tables=False, dead_end_filling=False) -> dict:
+    """
+    Loads and solves a single maze file, optionally with a given priority
+    queue, checking that the maze can be solved before searching it, and
+    filling in its dead ends first (see `solver.solve()`).
+    Returns a JSON serializable dictionary describing the result. If the file
+    can't be loaded, the dictionary has an `'error'` key instead.
+
+    JPS+ reuses the jump table saved next to the maze file, or builds one if
+    there isn't an up to date one. If `save_tables` is `True`, a built table
+    is saved next to the maze file. Saving is best effort: if the table
+    can't be written, a warning is printed to stderr, and the maze is still
+    solved.
+    """
+    record = {'file': filename, 'algorithm': algorithm}
+    try:
+        started = perf_counter()
+        maze = grid.load_maze_file(filename)
+        built_table = False
+        if algorithm == 'jpsplus' and not jump_table.load_for(maze, filename):
+            jump_table.get(maze)
+            built_table = True
+        record['load_time'] = perf_counter() - started
+    except (OSError, ValueError) as e:
+        record['error'] = str(e)
+        return record
+    if built_table and save_tables:
+        try:
+            jump_table.save_for(maze, filename)
+        except OSError as e:
+            print(f'Could not save the jump table of {filename}: {e}',
+                  file=sys.stderr)
+    try:
+        result = solver.solve(maze, algorithm=algorithm, queue=queue,
+                              check_connected=check_connected,
+                              dead_end_filling=dead_end_filling)
+    except ValueError as e:
+        record['error'] = str(e)
+        return record
+
+    record['width'] = maze.width
+    record['height'] = maze.height
+    record.update(result.to_dict())
+    # Report the path as (x, y) coordinates rather than grid indexes
+    if result.path and include_path:
+        record['path'] = [maze.coords(index) for index in result.path]
+    else:
+        del record['path']
+    return record
+
+
+def _solve_file_job(job: tuple) -> dict:
+    """
+    Unpacks a `(filename, algorithm, include_path, queue, check_connected,
+    save_tables, dead_end_filling)` job for `Pool.imap`.
+    """
+    return solve_file(*job)
+
+
+def expand_patterns(patterns: list) -> list:
+    """
+    Returns the files matched by a list of file names and glob patterns.
+    Patterns that don't match anything are returned as-is, so they're
+    reported as errors.
+    """
+    filenames = []
+    for pattern in patterns:
+        matches = sorted(glob(pattern))
+        filenames.extend(matches if matches else [pattern])
+    return filenames
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """Creates the command-line argument parser."""
+    parser = argparse.ArgumentParser(
+        prog='pathpyinder',
+        description='Solve PathPyinder mazes without the GUI.')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    solve_parser = commands.add_parser(
+        'solve', help='Solve maze .txt files and write JSON lines.')
+    solve_parser.add_argument(
+        'files', nargs='+', help='Maze .txt files or glob patterns.')
+    solve_parser.add_argument(
+        '--algo', default='bfs', choices=list(solver.ALGORITHMS),
+        help='Pathfinding algorithm to use (default: bfs).')
+    solve_parser.add_argument(
+        '--jobs', type=int, default=1,
+        help='Number of mazes to solve in parallel (default: 1).')
+    solve_parser.add_argument(
+        '--output', '-o', default=None,
+        help='File to write JSON lines to (default: stdout).')
+    solve_parser.add_argument(
+        '--no-path', action='store_true',
+        help='Leave the solution paths out of the output.')
+    solve_parser.add_argument(
+        '--queue', default=None, choices=list(pq.QUEUES),
+        help='Priority queue for the ' + ', '.join(solver.QUEUE_ALGORITHMS) +
+             ' algorithms (default: heap).')
+    solve_parser.add_argument(
+        '--check-connected', action='store_true',
+        help='Check that a path connects the start and end nodes before '
+             'searching, so unsolvable mazes are rejected without searching '
+             'them. Costs about as much as a BFS of a solvable maze.')
+    solve_parser.add_argument(
+        '--save-jump-tables', action='store_true',
+        help='Save the jump tables built by jpsplus as .jps files next to '
+             'the maze files, to be reused by later runs.')
+    solve_parser.add_argument(
+        '--dead-end-filling', action='store_true',
+        help='Fill in dead ends before searching, with the ' +
+             ', '.join(solver.DEAD_END_ALGORITHMS) + ' algorithms.')
+
+    bench_parser = commands.add_parser(
+        'bench', help='Time algorithms and priority queues on mazes.')
+    add_maze_arguments(bench_parser)
+    bench_parser.add_argument(
+        '--algo', nargs='+', default=list(solver.QUEUE_ALGORITHMS),
+        choices=list(solver.ALGORITHMS),
+        help='Algorithms to time (default: ' +
+             ' '.join(solver.QUEUE_ALGORITHMS) + ').')
+    bench_parser.add_argument(
+        '--queue', nargs='+', default=list(pq.QUEUES),
+        choices=list(pq.QUEUES),
+        help='Priority queues to time the ' +
+             ', '.join(solver.QUEUE_ALGORITHMS) + ' algorithms with '
+             '(default: all).')
+    bench_parser.add_argument(
+        '--repeat', type=int, default=3,
+        help='Number of times to solve each maze, keeping the fastest '
+             '(default: 3).')
+
+    queues_parser = commands.add_parser(
+        'queues', help='Record and replay the priority queue operations '
+                       'of solves with every queue backend.')
+    add_maze_arguments(queues_parser)
+    queues_parser.add_argument(
+        '--algo', nargs='+', default=list(solver.QUEUE_ALGORITHMS),
+        choices=list(solver.QUEUE_ALGORITHMS),
+        help='Algorithms to record the queue operations of (default: all).')
+    queues_parser.add_argument(
+        '--queue', nargs='+', default=list(pq.QUEUES),
+        choices=list(pq.QUEUES),
+        help='Priority queues to record and replay with (default: all).')
+    queues_parser.add_argument(
+        '--repeat', type=int, default=3,
+        help='Number of times to replay each recording, keeping the fastest '
+             '(default: 3).')
+    return parser
+
+
+def add_maze_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Adds the arguments that pick the mazes to benchmark on, read by
+    `benchmark_mazes()`.
+    """
+    parser.add_argument(
+        'files', nargs='*', help='Maze .txt files or glob patterns.')
+    parser.add_argument(
+        '--generate', default=None, metavar='WIDTHxHEIGHT',
+        help='Benchmark on randomly generated mazes of this size.')
+    parser.add_argument(
+        '--mazes', type=int, default=3,
+        help='Number of mazes to generate (default: 3).')
+    parser.add_argument(
+        '--terrain', type=float, default=0.0, metavar='FRACTION',
+        help='Fraction of the open nodes of generated mazes to turn into '
+             'mud or water (default: 0).')
+    parser.add_argument(
+        '--seed', type=int, default=0,
+        help='Random seed for the generated mazes (default: 0).')
+
+
+def solve_command(args: argparse.Namespace) -> int:
+    """
+    Runs the `solve` command.
+    Returns an exit status of 1 if any file could not be loaded.
+    """
+    jobs = [(filename, args.algo, not args.no_path, args.queue,
+             args.check_connected, args.save_jump_tables,
+             args.dead_end_filling)
+            for filename in expand_patterns(args.files)]
+    output = open(args.output, 'w', encoding='utf8') if args.output \
+        else sys.stdout
+    failed = 0
+    try:
+        if args.jobs > 1:
+            with Pool(args.jobs) as pool:
+                records = pool.imap(_solve_file_job, jobs, chunksize=4)
+                failed = write_records(records, output)
+        else:
+            failed = write_records(map(_solve_file_job, jobs), output)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    if failed:
+        print(f'{failed} of {len(jobs)} maze files could not be loaded.',
+              file=sys.stderr)
+    return 1 if failed else 0
+
+
+def benchmark_maze(maze: grid.Grid, name: str, algorithms: list,
+                   queues: list, repeat: int) -> list:
+    """
+    Times every algorithm on a maze, with every priority queue for the
+    algorithms that take one.
+    Returns a JSON serializable dictionary for each timing, keeping the
+    fastest of `repeat` solves.
+    """
+    records = []
+    for algorithm in algorithms:
+        for queue in (queues if algorithm in solver.QUEUE_ALGORITHMS
+                      else [None]):
+            results = [solver.solve(maze, algorithm=algorithm, queue=queue)
+                       for _ in range(repeat)]
+            fastest = min(results, key=lambda result: result.wall_time)
+            records.append({
+                'maze': name,
+                'width': maze.width,
+                'height': maze.height,
+                'algorithm': algorithm,
+                'queue': queue,
+                'wall_time': fastest.wall_time,
+                'expanded': fastest.expanded,
+                'path_cost': fastest.cost,
+            })
+    return records
+
+
+def benchmark_mazes(args: argparse.Namespace):
+    """
+    Yields `(name, maze)` pairs for the `bench` command: the maze files,
+    followed by the generated mazes.
+    Raises a `ValueError` if the maze size can't be read.
+    """
+    for filename in expand_patterns(args.files):
+        yield filename, grid.load_maze_file(filename)
+    if args.generate:
+        try:
+            width, height = (int(side) for side in
+                             args.generate.lower().split('x'))
+        except ValueError:
+            raise ValueError(f'Invalid maze size {args.generate!r}, '
+                             f'expected WIDTHxHEIGHT')
+        random.seed(args.seed)
+        for number in range(args.mazes):
+            maze = grid.Grid(width, height)
+            for _ in grid.generate_maze(maze):
+                pass
+            for index in range(maze.size):
+                if (maze.cells[index] == grid.EMPTY and
+                        random.random() < args.terrain):
+                    maze.cells[index] = random.choice((grid.MUD, grid.WATER))
+            maze.invalidate()
+            yield f'generated {args.generate} #{number+1}', maze
+
+
+def bench_command(args: argparse.Namespace) -> int:
+    """
+    Runs the `bench` command, writing a JSON line per timing to stdout.
+    Returns an exit status of 1 if a maze could not be loaded or generated.
+    """
+    return run_benchmark(args, benchmark_maze)
+
+
+def benchmark_queues(maze: grid.Grid, name: str, algorithms: list,
+                     queues: list, repeat: int) -> list:
+    """
+    Records the priority queue operations of solving a maze with every
+    algorithm and every priority queue, and replays each recording on the
+    queue it was recorded with.
+    Returns a JSON serializable dictionary for each replay (see
+    `queue_trace.benchmark()`).
+    """
+    records = []
+    for algorithm in algorithms:
+        for queue in queues:
+            trace = queue_trace.record_trace(maze, algorithm,
+                                             pq.QUEUES[queue])
+            record = {
+                'maze': name,
+                'width': maze.width,
+                'height': maze.height,
+                'algorithm': algorithm,
+                'queue': queue,
+            }
+            record.update(queue_trace.benchmark(trace, pq.QUEUES[queue],
+                                                repeat))
+            records.append(record)
+    return records
+
+
+def queues_command(args: argparse.Namespace) -> int:
+    """
+    Runs the `queues` command, writing a JSON line per replay to stdout.
+    Returns an exit status of 1 if a maze could not be loaded or generated.
+    """
+    return run_benchmark(args, benchmark_queues)
+
+
+def run_benchmark(args: argparse.Namespace, benchmark) -> int:
+    """
+    Runs `benchmark(maze, name, algorithms, queues, repeat)` on every maze
+    picked by the arguments, writing the records it returns to stdout.
+    Returns an exit status of 1 if a maze could not be loaded or generated.
+    """
+    if not args.files and not args.generate:
+        print('Give maze files or --generate a maze size to benchmark.',
+              file=sys.stderr)
+        return 1
+    try:
+        for name, maze in benchmark_mazes(args):
+            records = benchmark(maze, name, args.algo, args.queue,
+                                args.repeat)
+            write_records(records, sys.stdout)
+    except (OSError, ValueError) as e:
+        print(e, file=sys.stderr)
+        return 1
+    return 0
+
+
+def write_records(records, output) -> int:
+    """
+    Writes result dictionaries as JSON lines.
+    Returns the number of records that had an error.
+    """
+    failed = 0
+    for record in records:
+        if 'error' in record:
+            failed += 1
+        output.write(jsondumps(record, ensure_ascii=False) + '\n')
+        output.flush()
+    return failed
+
+
+def main(argv: list = None) -> int:
+    """Runs the command-line interface. Returns an exit status."""
+    args = create_parser().parse_args(argv)
+    if args.command == 'solve':
+        return solve_command(args)
+    if args.command == 'bench':
+        return bench_command(args)
+    if args.command == 'queues':
+        return queues_command(args)
+    return 0
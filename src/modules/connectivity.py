@@ -0,0 +1,161 @@
+"""
+Connected components of the open nodes of a maze.
+
+A `Connectivity` index is a union-find (disjoint set) structure over the
+nodes that aren't walls, where two nodes share a set if a path leads from one
+to the other. It answers whether a maze can be solved at all in near-constant
+time, without searching it.
+
+The index is kept on the grid (see `grid.Grid.incremental`), and reads the
+cells changed since it was last used from `grid.Grid.changes_since()`.
+Erasing walls only ever joins components, so those changes are applied as
+they are. Drawing a wall can split a component, which a union-find can't
+undo. The index is then stale: nodes in different sets are still certain to
+be disconnected, but nodes in the same set may not be connected anymore, and
+the index is only rebuilt when such a pair is asked about.
+"""
+# Compact per-node arrays
+from array import array
+# Grid model the index is built from
+from modules import grid
+# Used to find the runs of open nodes in each row
+import re
+
+
+# Key of the index in grid.Grid.incremental
+CONNECTIVITY_KEY = 'connectivity'
+
+# Translates grid.Grid.cells into 1 for open nodes, and 0 for walls
+OPEN_NODES = bytes(0 if state == grid.WALL else 1 for state in range(256))
+
+# Matches a run of open nodes in a row
+RUN = re.compile(b'\x01+')
+
+
+class Connectivity(object):
+    """
+    The connected components of the open nodes of `maze`.
+
+    Attributes:
+        `version` (int): The maze version the index is up to date with.
+        `open` (bytearray): `1` for every node the index holds as open.
+        `parents` (array): Parent of each node in its set. The node at the
+            root of a set stands for its whole component.
+        `sizes` (array): Number of nodes in each set, for root nodes.
+        `stale` (bool): `True` if walls were drawn since the index was
+            built, so nodes in the same set may have been split apart.
+
+    Args:
+        `maze` (grid.Grid): The maze to index.
+    """
+    def __init__(self, maze: grid.Grid) -> None:
+        self.maze = maze
+        self.rebuild()
+
+
+    def rebuild(self) -> None:
+        """
+        Builds the index from scratch, a row at a time. Each run of open
+        nodes in a row is made a set, and joined to the runs above it that
+        it touches.
+        """
+        maze = self.maze
+        width = maze.width
+        self.version = maze.version
+        self.stale = False
+        self.open = bytearray(maze.cells.translate(OPEN_NODES))
+        self.parents = array('l', range(maze.size))
+        self.sizes = array('l', [1]) * maze.size
+        parents = self.parents
+        above = []
+        for row in range(0, maze.size, width):
+            runs = [match.span() for match in
+                    RUN.finditer(self.open, row, row+width)]
+            for start, end in runs:
+                parents[start:end] = array('l', [start]) * (end-start)
+                self.sizes[start] = end-start
+            # Join the runs that overlap, walking both rows left to right
+            i = 0
+            for start, end in runs:
+                while i < len(above) and above[i][1]+width <= start:
+                    i += 1
+                j = i
+                while j < len(above) and above[j][0]+width < end:
+                    self.union(start, above[j][0])
+                    j += 1
+            above = runs
+
+
+    def update(self) -> None:
+        """Brings the index up to date with the maze."""
+        maze = self.maze
+        changes = maze.changes_since(self.version)
+        if changes is None:
+            self.rebuild()
+            return
+        self.version = maze.version
+        opened = []
+        for index in set(changes):
+            is_open = maze.cells[index] != grid.WALL
+            if is_open == bool(self.open[index]):
+                continue    # Terrain changed, or the change was undone
+            self.open[index] = is_open
+            if is_open:
+                opened.append(index)
+            else:
+                self.stale = True
+        for index in opened:
+            for neighbor in maze.neighbors(index):
+                self.union(index, neighbor)
+
+
+    def find(self, index: int) -> int:
+        """Returns the root node of the set a node is in."""
+        parents = self.parents
+        while parents[index] != index:
+            # Point every other node on the way at its grandparent,
+            # so later finds take fewer steps
+            parents[index] = parents[parents[index]]
+            index = parents[index]
+        return index
+
+
+    def union(self, index: int, other: int) -> None:
+        """Joins the sets of two nodes, hanging the smaller off the larger."""
+        root = self.find(index)
+        other_root = self.find(other)
+        if root == other_root:
+            return
+        if self.sizes[root] < self.sizes[other_root]:
+            root, other_root = other_root, root
+        self.parents[other_root] = root
+        self.sizes[root] += self.sizes[other_root]
+
+
+    def connected(self, index: int, other: int) -> bool:
+        """
+        Returns `True` if a path leads from one open node to the other.
+        A stale index is rebuilt if the nodes are in the same set.
+        """
+        if not (self.open[index] and self.open[other]):
+            return False
+        if self.find(index) != self.find(other):
+            return False
+        if self.stale:
+            self.rebuild()
+            return self.find(index) == self.find(other)
+        return True
+
+
+def get_connectivity(maze: grid.Grid) -> Connectivity:
+    """
+    Returns the index kept on the grid, brought up to date with the maze,
+    building it if there isn't one yet.
+    """
+    index = maze.incremental.get(CONNECTIVITY_KEY)
+    if index is None:
+        index = Connectivity(maze)
+        maze.incremental[CONNECTIVITY_KEY] = index
+    else:
+        index.update()
+    return index
@@ -0,0 +1,366 @@
+"""
+Compact grid model for PathPyinder mazes.
+
+A maze is stored as a flat `bytearray` of cell states indexed by
+`y*width+x`, rather than as one Python object per cell. The start and end
+points are stored as cell indexes. Nothing in this module depends on the GUI,
+so mazes can be loaded, generated, edited and saved without a window.
+"""
+# Used in maze generation
+from random import choice as random_choice
+# Compact per-cell flag epochs
+from array import array
+
+
+# Cell states stored in Grid.cells
+EMPTY = 0
+WALL = 1
+MUD = 2
+WATER = 3
+
+# Cost of moving into a cell, indexed by cell state.
+# Every cost is at least 1, so distance heuristics stay admissible.
+# Walls can't be moved into, so their cost is never used.
+COSTS = (1, 0, 3, 5)
+
+# Visualization flags stored in Grid.flags
+VISITED = 1
+ACTIVE = 2
+
+# Flag epochs are stored in 2 bytes per cell, and start over after this one
+EPOCH_LIMIT = 0xFFFF
+
+# Characters used in maze .txt files
+CHAR_EMPTY = ' '
+CHAR_WALL = '█'
+CHAR_START = 'S'
+CHAR_END = 'E'
+CHAR_MUD = '▒'
+CHAR_WATER = '~'
+
+# Cell states of the characters above, other than the start and end
+STATES = {CHAR_EMPTY: EMPTY, CHAR_WALL: WALL,
+          CHAR_MUD: MUD, CHAR_WATER: WATER}
+
+
+class Grid(object):
+    """
+    A `width` by `height` maze grid.
+
+    Attributes:
+        `cells` (bytearray): The state of every cell: `EMPTY`, `WALL`, or a
+            weighted terrain state (`MUD`, `WATER`). See `COSTS`.
+        `flags` (bytearray): `VISITED`/`ACTIVE` flags used while visualizing.
+            A cell's flags only count if its `stamps` entry is the current
+            `epoch`, so use `get_flags()` and `set_flags()` to access them.
+        `epoch` (int): Incremented every time the flags are cleared.
+        `stamps` (array): The epoch each cell's flags were last set in.
+        `touched` (list): Indexes of the cells flagged since the flags were
+            last cleared.
+        `start` (int): Index of the start cell, or `None`.
+        `end` (int): Index of the end cell, or `None`.
+        `version` (int): Incremented every time the cells are changed.
+        `cache` (dict): Data derived from the cells, e.g. jump tables, keyed
+            by name. Emptied every time the cells are changed.
+        `incremental` (dict): Data derived from the cells that is kept up to
+            date with `changes_since()` instead of being discarded, e.g.
+            incremental planners, keyed by name.
+    """
+    def __init__(self, width: int, height: int) -> None:
+        self.width = int(width)
+        self.height = int(height)
+        self.size = self.width * self.height
+        self.cells = bytearray(self.size)
+        self.flags = bytearray(self.size)
+        self.epoch = 1
+        self.stamps = array('H', [0]) * self.size
+        self.touched = []
+        self.start = None
+        self.end = None
+        self.version = 0
+        self.cache = {}
+        self.incremental = {}
+        # Indexes of the cells changed by set_cell() since version
+        # _edits_start. Cleared when the cells are changed all at once.
+        self._edits = []
+        self._edits_start = 0
+
+
+    def index(self, x: int, y: int) -> int:
+        """Returns the cell index of the `(x, y)` coordinates."""
+        return y * self.width + x
+
+
+    def coords(self, index: int) -> tuple:
+        """Returns the `(x, y)` coordinates of a cell index."""
+        return (index % self.width, index // self.width)
+
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        """Returns `True` if `(x, y)` is inside the grid."""
+        return 0 <= x < self.width and 0 <= y < self.height
+
+
+    def is_wall(self, index: int) -> bool:
+        """Returns `True` if the cell at `index` is a wall."""
+        return self.cells[index] == WALL
+
+
+    def cost(self, index: int) -> int:
+        """Returns the cost of moving into the cell at `index`."""
+        return COSTS[self.cells[index]]
+
+
+    def is_weighted(self) -> bool:
+        """Returns `True` if any cell costs more than 1 to move into."""
+        return self.cells.count(MUD) > 0 or self.cells.count(WATER) > 0
+
+
+    def path_cost(self, path: list) -> int:
+        """Returns the cost of moving along `path`, a list of cell indexes."""
+        cells = self.cells
+        return sum(COSTS[cells[index]] for index in path[1:])
+
+
+    def neighbors(self, index: int) -> list:
+        """
+        Returns a list of in-bound, non-wall cell indexes above, right of,
+        below, and left of the cell at `index`, in that order.
+        """
+        width = self.width
+        cells = self.cells
+        x = index % width
+        neighbors = []
+        if index >= width and cells[index-width] != WALL:
+            neighbors.append(index-width)   # top
+        if x != width-1 and cells[index+1] != WALL:
+            neighbors.append(index+1)       # right
+        if index+width < self.size and cells[index+width] != WALL:
+            neighbors.append(index+width)   # bottom
+        if x != 0 and cells[index-1] != WALL:
+            neighbors.append(index-1)       # left
+        return neighbors
+
+
+    def set_cell(self, index: int, state: int) -> None:
+        """Sets the cell at `index` to `state`."""
+        if self.cells[index] != state:
+            self.cells[index] = state
+            self.version += 1
+            self.cache.clear()
+            self._edits.append(index)
+            # Don't keep a longer log than it'd take to rebuild from scratch
+            if len(self._edits) > self.size:
+                self.invalidate()
+
+
+    def invalidate(self) -> None:
+        """
+        Discards the data cached from the cells, and marks every cell as
+        changed. Called by `fill()`. Call it after writing to `cells` directly.
+        """
+        self.version += 1
+        self.cache.clear()
+        self._edits = []
+        self._edits_start = self.version
+
+
+    def changes_since(self, version: int) -> list:
+        """
+        Returns the indexes of the cells changed since `version`, or `None`
+        if the cells were changed all at once since then, and anything
+        derived from them has to be rebuilt.
+        """
+        if version < self._edits_start:
+            return None
+        return self._edits[version-self._edits_start:]
+
+
+    def fill(self, state: int) -> None:
+        """Sets every cell to `state` and removes the start and end points."""
+        self.cells[:] = bytes([state]) * self.size
+        self.clear_flags()
+        self.start = None
+        self.end = None
+        self.invalidate()
+
+
+    def get_flags(self, index: int) -> int:
+        """Returns the `VISITED`/`ACTIVE` flags of the cell at `index`."""
+        if self.stamps[index] != self.epoch:
+            return 0
+        return self.flags[index]
+
+
+    def set_flags(self, index: int, flags: int) -> None:
+        """Sets the flags of the cell at `index`, noting it as touched."""
+        if self.stamps[index] != self.epoch:
+            if not flags:
+                return      # Already clear
+            self.stamps[index] = self.epoch
+            self.touched.append(index)
+        self.flags[index] = flags
+
+
+    def clear_flags(self) -> list:
+        """
+        Removes all `VISITED` and `ACTIVE` flags by starting a new epoch,
+        without visiting every cell.
+        Returns the indexes of the cells that were flagged, e.g. to redraw.
+        """
+        touched = self.touched
+        self.touched = []
+        self.epoch += 1
+        if self.epoch > EPOCH_LIMIT:
+            self.stamps = array('H', [0]) * self.size
+            self.epoch = 1
+        return touched
+
+
+    def to_text(self) -> str:
+        """Returns the grid in the maze .txt file format."""
+        chars = {state: char for char, state in STATES.items()}
+        rows = []
+        for y in range(self.height):
+            row = [chars[state] for state in
+                   self.cells[y*self.width:(y+1)*self.width]]
+            if self.start is not None and self.start // self.width == y:
+                row[self.start % self.width] = CHAR_START
+            if self.end is not None and self.end // self.width == y:
+                row[self.end % self.width] = CHAR_END
+            rows.append(''.join(row))
+        return '\n'.join(rows)
+
+
+    @classmethod
+    def from_text(cls, text: str) -> 'Grid':
+        """
+        Creates a grid from text in the maze .txt file format.
+        Raises a `ValueError` if the rows are not all the same width, or if
+        the text contains a character that is not a maze node.
+
+        Files without weighted terrain only contain `' '`, `'█'`, `'S'` and
+        `'E'`, exactly as before terrain was added.
+        """
+        rows = text.splitlines()
+        # Ignore a trailing blank line
+        while rows and not rows[-1]:
+            rows.pop()
+        if not rows:
+            raise ValueError('Maze file is empty')
+        width = len(rows[0])
+        new_grid = cls(width, len(rows))
+        for y, row in enumerate(rows):
+            if len(row) != width:
+                raise ValueError(f'Row {y} of the maze is {len(row)} nodes '
+                                 f'wide, expected {width}')
+            for x, char in enumerate(row):
+                if char in STATES:
+                    new_grid.cells[y*width+x] = STATES[char]
+                elif char == CHAR_START:
+                    new_grid.start = y*width+x
+                elif char == CHAR_END:
+                    new_grid.end = y*width+x
+                else:
+                    raise ValueError(f'Invalid maze node {char!r} '
+                                     f'at ({x}, {y})')
+        return new_grid
+
+
+def load_maze_file(filename: str) -> Grid:
+    """Loads a grid from a maze .txt file."""
+    with open(filename, 'r', encoding='utf8') as maze_file:
+        return Grid.from_text(maze_file.read())
+
+
+def save_maze_file(grid: Grid, filename: str) -> None:
+    """Saves a grid to a maze .txt file."""
+    with open(filename, 'w', encoding='utf8') as maze_file:
+        maze_file.write(grid.to_text())
+
+
+def build_path(parents, end: int) -> list:
+    """
+    Returns the list of cell indexes from the start cell to `end`, by
+    following `parents` (where the start cell's parent is `-1`).
+    """
+    path = []
+    index = end
+    while index != -1:
+        path.append(index)
+        index = parents[index]
+    path.reverse()
+    return path
+
+
+def generate_maze(grid: Grid):
+    """
+    Carves a new maze into `grid` via a depth-first search algorithm,
+    starting at a random point in the maze.
+
+    This is a generator that yields the index of every cell as it is emptied,
+    so the carving can be animated. Exhaust it to generate a maze headlessly:
+    `for _ in generate_maze(grid): pass`
+    """
+    width = grid.width
+    height = grid.height
+    cells = grid.cells
+
+    # Populate the grid with walls
+    grid.fill(WALL)
+    # Set a start node
+    grid.start = grid.index(1, 0)
+    cells[grid.start] = EMPTY
+    yield grid.start
+    # Set an end node
+    if width % 2 == 0: # If the maze width is an even number
+        # The last two columns of nodes will be walls,
+        # so the end node has to be two nodes away from the rightmost edge
+        grid.end = grid.index(width-3, height-1)
+    else:
+        grid.end = grid.index(width-2, height-1)
+    cells[grid.end] = EMPTY
+    yield grid.end
+    # Make sure a path to the end node exists
+    if height % 2 == 0:
+        cells[grid.end-width] = EMPTY
+        yield grid.end-width
+
+    # Initialize stack with a randomly picked point on the grid
+    # Permissible starting points have odd x and y coordinates
+    stack = [grid.index(random_choice(range(1, width-1, 2)),
+                        random_choice(range(1, height-1, 2)))]
+    cells[stack[0]] = EMPTY
+    yield stack[0]
+
+    # As long as there's a node in the stack
+    while stack:
+        current = stack[-1]
+        x, y = grid.coords(current)
+        # Look two nodes ahead in each direction.
+        # That node must not be on the edge of the maze,
+        # and must not already be an empty node.
+        directions = []
+        if y+2 <= height-2 and cells[current+2*width] == WALL:
+            directions.append(width)    # down
+        if x+2 <= width-2 and cells[current+2] == WALL:
+            directions.append(1)        # right
+        if y-2 >= 1 and cells[current-2*width] == WALL:
+            directions.append(-width)   # up
+        if x-2 >= 1 and cells[current-2] == WALL:
+            directions.append(-1)       # left
+
+        # If there's nowhere for the current node to go,
+        # remove it from the stack
+        if not directions:
+            stack.pop()
+            continue
+
+        # Dig through the wall in a random direction, to the node beyond it
+        step = random_choice(directions)
+        cells[current+step] = EMPTY
+        yield current+step
+        cells[current+2*step] = EMPTY
+        yield current+2*step
+        stack.append(current+2*step)
+    grid.invalidate()
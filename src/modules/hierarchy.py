@@ -0,0 +1,382 @@
+"""
+Cluster abstraction of a maze, used by the HPA* pathfinding algorithm.
+
+The maze is split into square clusters of `CLUSTER_SIZE` by `CLUSTER_SIZE`
+nodes. Wherever a path can cross the border between two clusters, an
+entrance is placed: a pair of nodes facing each other across the border, in
+the middle of each open stretch of the border. The entrances form a much
+smaller, abstract graph of the maze:
+    Nodes on either side of an entrance are linked to each other.
+    Entrance nodes in the same cluster are linked by the cost of the
+    cheapest path between them inside the cluster.
+
+Finding the entrances only takes a pass over the borders, but linking the
+entrance nodes of a cluster takes a search from each of them. So clusters
+are only linked when a search first reaches them, and a solve only pays for
+the clusters its search reaches.
+
+A `Hierarchy` is kept on the grid (see `grid.Grid.incremental`). When cells
+change, only the borders that contain them are rebuilt, and the clusters
+that contain them are linked again when they're next reached.
+"""
+# Queue used in the breadth-first local searches
+from collections import deque
+# Grid model and terrain costs
+from modules import grid
+
+
+# Width and height of a cluster, in nodes
+CLUSTER_SIZE = 16
+
+# Key of the hierarchy in grid.Grid.incremental
+HIERARCHY_KEY = 'hierarchy'
+
+
+def local_graph(maze: grid.Grid, bounds: tuple) -> tuple:
+    """
+    Finds the neighbors of every open node inside `bounds` that are inside
+    it too, so that several searches of the same cluster only check its
+    walls and bounds once.
+
+    Returns a tuple of `(neighbors, weighted)`, where `neighbors` has a list
+    of neighbor indexes for every open node, keyed by node index, in the
+    same order as `grid.Grid.neighbors()`, and `weighted` is `True` if any
+    node inside `bounds` has weighted terrain.
+    """
+    x0, y0, x1, y1 = bounds
+    width = maze.width
+    cells = maze.cells
+    wall = grid.WALL
+    neighbors = {}
+    weighted = False
+    for y in range(y0, y1):
+        row = y * width
+        for index in range(row + x0, row + x1):
+            state = cells[index]
+            if state == wall:
+                continue
+            if state != grid.EMPTY:
+                weighted = True
+            x = index - row
+            links = []
+            if y > y0 and cells[index-width] != wall:
+                links.append(index-width)   # top
+            if x < x1-1 and cells[index+1] != wall:
+                links.append(index+1)       # right
+            if y < y1-1 and cells[index+width] != wall:
+                links.append(index+width)   # bottom
+            if x > x0 and cells[index-1] != wall:
+                links.append(index-1)       # left
+            neighbors[index] = links
+    return (neighbors, weighted)
+
+
+def local_search(maze: grid.Grid, source: int, bounds: tuple,
+                 targets: set = None, reverse: bool = False,
+                 graph: tuple = None) -> tuple:
+    """
+    Finds the cheapest paths from `source`, without leaving `bounds`.
+    Bounds without weighted terrain are searched breadth-first, as every
+    move costs the same, and others with Dijkstra's algorithm.
+
+    Args:
+        `maze` (grid.Grid): The maze to search.
+        `source` (int): Index of the node to search from.
+        `bounds` (tuple): `(x0, y0, x1, y1)`, the nodes the search may
+            enter, where `x1` and `y1` are exclusive.
+        `targets` (set: Optional): Indexes of nodes to stop the search at,
+            once the cheapest path to every one of them has been found.
+        `reverse` (bool: Optional): Search for paths into `source` rather
+            than out of it, so each distance is the cost of moving from
+            that node to `source`.
+        `graph` (tuple: Optional): The result of `local_graph()` for
+            `bounds`, if it was already found.
+
+    Returns a tuple of `(distances, parents, expanded)`, where `distances`
+    and `parents` are dictionaries keyed by node index.
+    """
+    neighbors, weighted = graph or local_graph(maze, bounds)
+    distances = {source: 0}
+    parents = {source: -1}
+    remaining = len(targets) if targets else -1
+    expanded = 0
+    if not weighted:
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            if targets and current in targets:
+                remaining -= 1
+                if remaining == 0:
+                    break
+            expanded += 1
+            distance = distances[current] + 1
+            for neighbor in neighbors[current]:
+                if neighbor not in distances:
+                    distances[neighbor] = distance
+                    parents[neighbor] = current
+                    queue.append(neighbor)
+        return (distances, parents, expanded)
+
+    # Dijkstra's algorithm with a bucket queue: every move costs at most
+    # max(costs), so the queued nodes always fit in that many buckets past
+    # the current distance, which are reused in turn
+    cells = maze.cells
+    costs = grid.COSTS
+    buckets = [[] for _ in range(max(costs) + 1)]
+    buckets[0].append(source)
+    queued = 1
+    distance = 0
+    while queued:
+        bucket = buckets[distance % len(buckets)]
+        while bucket:
+            current = bucket.pop()
+            queued -= 1
+            if distances[current] != distance:
+                continue    # Queued again after a cheaper path was found
+            if targets and current in targets:
+                remaining -= 1
+                if remaining == 0:
+                    return (distances, parents, expanded)
+            expanded += 1
+            for neighbor in neighbors[current]:
+                # Moving backwards costs the node moved out of
+                step = cells[current] if reverse else cells[neighbor]
+                cost = distance + costs[step]
+                if neighbor in distances and cost >= distances[neighbor]:
+                    continue
+                distances[neighbor] = cost
+                parents[neighbor] = current
+                buckets[cost % len(buckets)].append(neighbor)
+                queued += 1
+        distance += 1
+    return (distances, parents, expanded)
+
+
+class Hierarchy(object):
+    """
+    The abstract entrance graph of a maze.
+
+    Attributes:
+        `version` (int): The maze version the hierarchy is up to date with.
+        `entrances` (dict): `(a, b)` entrance node pairs, keyed by border.
+            Borders are keyed by `('v', cx, cy)` for the border right of
+            cluster `(cx, cy)`, and `('h', cx, cy)` for the border below it.
+        `intra` (dict): Links between the entrance nodes of each cluster
+            linked so far, as `{node: [(other, cost), ...]}`, keyed by
+            cluster. See `cluster_links()`.
+        `inter` (dict): Links across borders, as `[(other, cost), ...]`,
+            keyed by entrance node.
+
+    Args:
+        `maze` (grid.Grid): The maze to abstract.
+        `cluster_size` (int: Optional): Width and height of the clusters.
+    """
+    def __init__(self, maze: grid.Grid,
+                 cluster_size: int = CLUSTER_SIZE) -> None:
+        self.maze = maze
+        self.cluster_size = cluster_size
+        self.columns = -(-maze.width // cluster_size)
+        self.rows = -(-maze.height // cluster_size)
+        self.rebuild()
+
+
+    def cluster_of(self, index: int) -> tuple:
+        """Returns the `(cx, cy)` cluster of a node."""
+        width = self.maze.width
+        return ((index % width) // self.cluster_size,
+                (index // width) // self.cluster_size)
+
+
+    def bounds(self, cluster: tuple) -> tuple:
+        """Returns the `(x0, y0, x1, y1)` bounds of a cluster."""
+        x0 = cluster[0] * self.cluster_size
+        y0 = cluster[1] * self.cluster_size
+        return (x0, y0, min(x0 + self.cluster_size, self.maze.width),
+                min(y0 + self.cluster_size, self.maze.height))
+
+
+    def borders_of(self, cluster: tuple) -> list:
+        """Returns the keys of the borders around a cluster."""
+        cx, cy = cluster
+        borders = []
+        if cx < self.columns-1:
+            borders.append(('v', cx, cy))
+        if cx > 0:
+            borders.append(('v', cx-1, cy))
+        if cy < self.rows-1:
+            borders.append(('h', cx, cy))
+        if cy > 0:
+            borders.append(('h', cx, cy-1))
+        return borders
+
+
+    def rebuild(self) -> None:
+        """
+        Builds the whole hierarchy from scratch, leaving the clusters to be
+        linked when they're first reached.
+        """
+        self.version = self.maze.version
+        self.entrances = {}
+        self.intra = {}
+        for cy in range(self.rows):
+            for cx in range(self.columns):
+                if cx < self.columns-1:
+                    self.find_entrances(('v', cx, cy))
+                if cy < self.rows-1:
+                    self.find_entrances(('h', cx, cy))
+        self.link_borders()
+
+
+    def update(self) -> int:
+        """
+        Brings the hierarchy up to date with the maze, rebuilding only the
+        borders that contain changed cells, and unlinking the clusters that
+        contain them or have new entrances.
+        Returns the number of clusters that were unlinked, or all of them if
+        the hierarchy was rebuilt.
+        """
+        changes = self.maze.changes_since(self.version)
+        if changes is None:
+            self.rebuild()
+            return self.columns * self.rows
+        self.version = self.maze.version
+        if not changes:
+            return 0
+        size = self.cluster_size
+        width = self.maze.width
+        clusters = set()
+        borders = set()
+        for index in set(changes):
+            cx, cy = self.cluster_of(index)
+            clusters.add((cx, cy))
+            # Cells on the edge of a cluster can change its entrances
+            x, y = index % width, index // width
+            if x % size == size-1 and cx < self.columns-1:
+                borders.add(('v', cx, cy))
+            if x % size == 0 and cx > 0:
+                borders.add(('v', cx-1, cy))
+            if y % size == size-1 and cy < self.rows-1:
+                borders.add(('h', cx, cy))
+            if y % size == 0 and cy > 0:
+                borders.add(('h', cx, cy-1))
+        for border in borders:
+            self.find_entrances(border)
+            # Both clusters on the border have new entrance nodes
+            direction, cx, cy = border
+            clusters.add((cx, cy))
+            clusters.add((cx+1, cy) if direction == 'v' else (cx, cy+1))
+        for cluster in clusters:
+            self.intra.pop(cluster, None)
+        if borders:
+            self.link_borders()
+        return len(clusters)
+
+
+    def find_entrances(self, border: tuple) -> None:
+        """
+        Places an entrance in the middle of every stretch of a border where
+        the nodes on both sides are open.
+        """
+        direction, cx, cy = border
+        x0, y0, x1, y1 = self.bounds((cx, cy))
+        width = self.maze.width
+        cells = self.maze.cells
+        if direction == 'v':
+            # Nodes in the cluster's right column, and the ones right of them
+            inside = [y*width + x1-1 for y in range(y0, y1)]
+            step = 1
+        else:
+            # Nodes in the cluster's bottom row, and the ones below them
+            inside = [(y1-1)*width + x for x in range(x0, x1)]
+            step = width
+        entrances = []
+        stretch = []
+        for index in inside + [-1]:
+            if (index != -1 and cells[index] != grid.WALL and
+                    cells[index+step] != grid.WALL):
+                stretch.append(index)
+            elif stretch:
+                middle = stretch[len(stretch) // 2]
+                entrances.append((middle, middle+step))
+                stretch = []
+        self.entrances[border] = entrances
+
+
+    def cluster_nodes(self, cluster: tuple) -> set:
+        """Returns the entrance nodes inside a cluster."""
+        nodes = set()
+        for border in self.borders_of(cluster):
+            for pair in self.entrances.get(border, ()):
+                for node in pair:
+                    if self.cluster_of(node) == cluster:
+                        nodes.add(node)
+        return nodes
+
+
+    def link_cluster(self, cluster: tuple) -> None:
+        """Links every entrance node of a cluster to the others."""
+        nodes = sorted(self.cluster_nodes(cluster))
+        bounds = self.bounds(cluster)
+        graph = local_graph(self.maze, bounds)
+        costs = grid.COSTS
+        cells = self.maze.cells
+        links = {node: [] for node in nodes}
+        for i, node in enumerate(nodes):
+            # The paths to the nodes before this one were found by their
+            # own searches, so only search for the ones after it
+            later = nodes[i+1:]
+            if not later:
+                break
+            distances = local_search(self.maze, node, bounds, set(later),
+                                     graph=graph)[0]
+            for other in later:
+                if other not in distances:
+                    continue
+                links[node].append((other, distances[other]))
+                # The same path backwards enters node instead of other
+                links[other].append((node, distances[other] -
+                                     costs[cells[other]] +
+                                     costs[cells[node]]))
+        self.intra[cluster] = links
+
+
+    def cluster_links(self, cluster: tuple) -> dict:
+        """
+        Returns the links between the entrance nodes of a cluster, linking
+        them first if the cluster hasn't been linked since it last changed.
+        """
+        if cluster not in self.intra:
+            self.link_cluster(cluster)
+        return self.intra[cluster]
+
+
+    def link_borders(self) -> None:
+        """Links the nodes on either side of every entrance."""
+        costs = grid.COSTS
+        cells = self.maze.cells
+        inter = {}
+        for pairs in self.entrances.values():
+            for a, b in pairs:
+                inter.setdefault(a, []).append((b, costs[cells[b]]))
+                inter.setdefault(b, []).append((a, costs[cells[a]]))
+        self.inter = inter
+
+
+    def links(self, node: int) -> list:
+        """Returns the `(other, cost)` links of an entrance node."""
+        return (self.cluster_links(self.cluster_of(node)).get(node, []) +
+                self.inter.get(node, []))
+
+
+def get_hierarchy(maze: grid.Grid) -> Hierarchy:
+    """
+    Returns the hierarchy kept on the grid, brought up to date with the maze,
+    building it if there isn't one yet.
+    """
+    hierarchy = maze.incremental.get(HIERARCHY_KEY)
+    if hierarchy is None:
+        hierarchy = Hierarchy(maze)
+        maze.incremental[HIERARCHY_KEY] = hierarchy
+    else:
+        hierarchy.update()
+    return hierarchy
@@ -0,0 +1,187 @@
+"""
+Incremental replanning with Lifelong Planning A* (LPA*).
+
+An `LPAStar` planner keeps its search state between solves. When cells of the
+maze change, only the nodes whose cost from the start node is affected by the
+change are searched again, instead of solving the whole maze from scratch.
+This makes replanning after a wall is drawn or erased near-instant.
+
+Planners are kept on the grid (see `grid.Grid.incremental`), and read the
+cells changed since their last solve from `grid.Grid.changes_since()`.
+"""
+# Data structure used to order the nodes to search
+from modules import priority_queue as pq
+# Grid model and terrain costs
+from modules import grid
+# Compact per-node arrays
+from array import array
+
+
+INFINITY = float('inf')
+
+# Key of the planner in grid.Grid.incremental
+PLANNER_KEY = 'lpastar'
+
+
+class LPAStar(object):
+    """
+    A Lifelong Planning A* search from `start` to `end` on `maze`.
+
+    Every node has a cost `g`, the cost of the best path from the start node
+    found so far, and a cost `rhs`, the lowest `g` of its neighbors plus the
+    cost of moving into the node. Nodes where the two differ are queued, and
+    are searched in A* order until the end node's cost is settled.
+
+    Args:
+        `maze` (grid.Grid): The maze to plan on.
+        `start` (int): Index of the start node.
+        `end` (int): Index of the end node.
+    """
+    def __init__(self, maze: grid.Grid, start: int, end: int) -> None:
+        self.maze = maze
+        self.start = start
+        self.end = end
+        self.reset()
+
+
+    def reset(self) -> None:
+        """Discards the search state, so the next solve starts from scratch."""
+        size = self.maze.size
+        self.version = self.maze.version
+        self.g = array('d', [INFINITY]) * size
+        self.rhs = array('d', [INFINITY]) * size
+        self.rhs[self.start] = 0
+        self.queue = pq.UpdateableQueue()
+        self.queue.push(self.start, self.key(self.start))
+
+
+    def key(self, index: int) -> tuple:
+        """Returns the queue priority of a node: `(f, g)`."""
+        cost = min(self.g[index], self.rhs[index])
+        width = self.maze.width
+        return (cost + abs(index % width - self.end % width) +
+                abs(index // width - self.end // width), cost)
+
+
+    def update_node(self, index: int) -> None:
+        """Recalculates the `rhs` of a node, and queues it if it changed."""
+        maze = self.maze
+        g = self.g
+        if index != self.start:
+            if maze.cells[index] == grid.WALL:
+                self.rhs[index] = INFINITY
+            else:
+                self.rhs[index] = (min((g[neighbor] for neighbor in
+                                        maze.neighbors(index)),
+                                       default=INFINITY) +
+                                   grid.COSTS[maze.cells[index]])
+        queue = self.queue
+        if g[index] != self.rhs[index]:
+            if index in queue:
+                queue.update(index, self.key(index))
+            else:
+                queue.push(index, self.key(index))
+        elif index in queue:
+            queue.remove(index)
+
+
+    def apply_changes(self) -> int:
+        """
+        Updates the search state for the cells changed since the last solve.
+        Returns the number of changed cells, or `-1` if the state had to be
+        reset because the whole maze changed.
+        """
+        changes = self.maze.changes_since(self.version)
+        self.version = self.maze.version
+        if changes is None:
+            self.reset()
+            return -1
+        width = self.maze.width
+        size = self.maze.size
+        for index in set(changes):
+            # Changing a cell changes the cost of moving into it, and
+            # whether its neighbors can be reached through it
+            self.update_node(index)
+            x = index % width
+            if index >= width:
+                self.update_node(index-width)
+            if x != width-1:
+                self.update_node(index+1)
+            if index+width < size:
+                self.update_node(index+width)
+            if x != 0:
+                self.update_node(index-1)
+        return len(changes)
+
+
+    def compute_shortest_path(self, observer=None) -> tuple:
+        """
+        Searches until the cost of the end node is settled.
+        `observer` is called like in `solver.solve()`.
+        Returns a tuple of `(expanded, peak_frontier, interrupted)`.
+        """
+        g = self.g
+        rhs = self.rhs
+        end = self.end
+        queue = self.queue
+        expanded = 0
+        peak_frontier = len(queue)
+        while len(queue) > 0 and (queue.peek()[1] < self.key(end) or
+                                  rhs[end] != g[end]):
+            current = queue.peek()[0]
+            # Check for input before popping, so an interrupted search
+            # can be resumed later
+            if observer and observer('active', current):
+                return (expanded, peak_frontier, True)
+            queue.pop()
+            expanded += 1
+            if g[current] > rhs[current]:
+                # The node got cheaper
+                g[current] = rhs[current]
+            else:
+                # The node got more expensive, or was walled off
+                g[current] = INFINITY
+                self.update_node(current)
+            for neighbor in self.maze.neighbors(current):
+                self.update_node(neighbor)
+                if observer and neighbor in queue:
+                    observer('neighbor', neighbor)
+            if observer:
+                observer('visited', current)
+            peak_frontier = max(peak_frontier, len(queue))
+        return (expanded, peak_frontier, False)
+
+
+    def parents(self):
+        """
+        Returns an array of parent links along the cheapest path from the end
+        node back to the start node, for `grid.build_path()`. Returns `None`
+        if the end node can't be reached.
+        """
+        maze = self.maze
+        g = self.g
+        if g[self.end] == INFINITY:
+            return None
+        parents = array('l', [-1]) * maze.size
+        index = self.end
+        while index != self.start:
+            # Step back to the neighbor the cheapest path came from
+            parent = min(maze.neighbors(index), key=g.__getitem__)
+            parents[index] = parent
+            index = parent
+        return parents
+
+
+def get_planner(maze: grid.Grid, start: int, end: int) -> LPAStar:
+    """
+    Returns the planner kept on the grid for `start` and `end`, updated for
+    the cells changed since its last solve. A new planner is made if there
+    isn't one, or if the start or end node moved.
+    """
+    planner = maze.incremental.get(PLANNER_KEY)
+    if planner is None or planner.start != start or planner.end != end:
+        planner = LPAStar(maze, start, end)
+        maze.incremental[PLANNER_KEY] = planner
+    else:
+        planner.apply_changes()
+    return planner
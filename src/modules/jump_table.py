@@ -0,0 +1,208 @@
+"""
+Precomputed jump distances for the JPS+ pathfinding algorithm.
+
+For every cell and each of the four directions, a `JumpTable` stores how far
+away the next jump point is (see `solver.jump_point_search()`), or how far
+away the next wall is if there's no jump point before it. Mazes don't change
+between solves, so the table is built once and then read by every JPS+ solve
+on the same maze, instead of scanning for jump points each time.
+
+Tables are cached on the grid (see `grid.Grid.cache`), so they are discarded
+as soon as a cell is changed. They can also be saved next to a maze .txt file,
+as a .jps file, and are only loaded from it if it still matches the maze.
+"""
+# Compact distance arrays
+from array import array
+# Used to name table files after maze files
+from os import path
+# Used to store tables in a byte order independent format
+import sys
+# Used to check that a table file matches its maze
+from zlib import crc32
+# Grid model the tables are built from
+from modules import grid
+
+
+# Directions, in the same order as grid.Grid.neighbors()
+UP = 0
+RIGHT = 1
+DOWN = 2
+LEFT = 3
+
+# First line of every table file
+FILE_HEADER = 'PathPyinder JPS+'
+
+# Key of the table in grid.Grid.cache
+CACHE_KEY = 'jump_table'
+
+
+class JumpTable(object):
+    """
+    Jump distances for every cell of a maze.
+
+    `distances[index*4 + direction]` is `n > 0` if there's a jump point `n`
+    cells away from the cell at `index` in that direction. Otherwise it is
+    `-n`, where `n` is the number of cells before the next wall or the edge
+    of the maze.
+
+    Args:
+        `width` (int): Width of the maze.
+        `height` (int): Height of the maze.
+        `distances` (array): Jump distances, as described above.
+        `signature` (int): Checksum of the cells the table was built from.
+    """
+    def __init__(self, width: int, height: int, distances: array,
+                 signature: int) -> None:
+        self.width = width
+        self.height = height
+        self.distances = distances
+        self.signature = signature
+
+
+    def matches(self, maze: grid.Grid) -> bool:
+        """Returns `True` if the table was built from the cells of `maze`."""
+        return (self.width == maze.width and self.height == maze.height and
+                self.signature == signature(maze))
+
+
+    def save(self, filename: str) -> None:
+        """Saves the table to a .jps file."""
+        distances = self.distances
+        if sys.byteorder == 'big':
+            distances = array('i', distances)
+            distances.byteswap()
+        with open(filename, 'wb') as table_file:
+            table_file.write(f'{FILE_HEADER} {self.width} {self.height} '
+                             f'{self.signature}\n'.encode('ascii'))
+            distances.tofile(table_file)
+
+
+    @classmethod
+    def load(cls, filename: str) -> 'JumpTable':
+        """
+        Loads a table from a .jps file.
+        Raises a `ValueError` if the file isn't a table file.
+        """
+        with open(filename, 'rb') as table_file:
+            header = table_file.readline().decode('ascii', 'replace').split()
+            if (len(header) != 5 or ' '.join(header[:2]) != FILE_HEADER or
+                    not all(field.isdigit() for field in header[2:])):
+                raise ValueError(f'{filename} is not a jump table file')
+            width, height, checksum = (int(field) for field in header[2:])
+            distances = array('i')
+            try:
+                distances.fromfile(table_file, width * height * 4)
+            except EOFError:
+                raise ValueError(f'{filename} is incomplete')
+        if sys.byteorder == 'big':
+            distances.byteswap()
+        return cls(width, height, distances, checksum)
+
+
+def signature(maze: grid.Grid) -> int:
+    """Returns a checksum of the cells of `maze`."""
+    return crc32(maze.cells)
+
+
+def table_filename(maze_filename: str) -> str:
+    """Returns the name of the .jps file kept next to a maze .txt file."""
+    return path.splitext(maze_filename)[0] + '.jps'
+
+
+def build(maze: grid.Grid) -> JumpTable:
+    """
+    Builds the jump table of a maze.
+
+    A cell is a jump point when moving horizontally if there's an open cell
+    above or below it that's behind a wall when seen from the previous cell.
+    When moving vertically, the same goes for the cells left and right of it,
+    and it's also a jump point if there's a horizontal jump point from it.
+    """
+    width = maze.width
+    height = maze.height
+    cells = maze.cells
+    wall = grid.WALL
+    distances = array('i', [0]) * (maze.size * 4)
+
+    def is_open(x: int, y: int) -> bool:
+        """Returns `True` if `(x, y)` is an in-bound, non-wall cell."""
+        return (0 <= x < width and 0 <= y < height and
+                cells[y*width+x] != wall)
+
+    def sweep(direction: int, dx: int, dy: int, is_jump_point) -> None:
+        """
+        Fills in the distances of one direction, walking the maze backwards
+        so that each cell's distance follows from the next cell's.
+        """
+        xs = range(width-1, -1, -1) if dx > 0 else range(width)
+        ys = range(height-1, -1, -1) if dy > 0 else range(height)
+        for y in ys:
+            for x in xs:
+                index = y*width + x
+                if cells[index] == wall or not is_open(x+dx, y+dy):
+                    continue    # Distance 0: the next cell is a wall
+                following = (index + dy*width + dx) * 4 + direction
+                if is_jump_point(x+dx, y+dy, dx, dy):
+                    distances[index*4 + direction] = 1
+                elif distances[following] > 0:
+                    distances[index*4 + direction] = distances[following] + 1
+                else:
+                    distances[index*4 + direction] = distances[following] - 1
+
+    def is_horizontal_jump_point(x: int, y: int, dx: int, dy: int) -> bool:
+        return ((is_open(x, y-1) and not is_open(x-dx, y-1)) or
+                (is_open(x, y+1) and not is_open(x-dx, y+1)))
+
+    def is_vertical_jump_point(x: int, y: int, dx: int, dy: int) -> bool:
+        index = y*width + x
+        return ((is_open(x-1, y) and not is_open(x-1, y-dy)) or
+                (is_open(x+1, y) and not is_open(x+1, y-dy)) or
+                distances[index*4 + LEFT] > 0 or
+                distances[index*4 + RIGHT] > 0)
+
+    # Vertical jump points depend on the horizontal distances,
+    # so those are filled in first
+    sweep(RIGHT, 1, 0, is_horizontal_jump_point)
+    sweep(LEFT, -1, 0, is_horizontal_jump_point)
+    sweep(UP, 0, -1, is_vertical_jump_point)
+    sweep(DOWN, 0, 1, is_vertical_jump_point)
+    return JumpTable(width, height, distances, signature(maze))
+
+
+def get(maze: grid.Grid) -> JumpTable:
+    """
+    Returns the jump table of a maze, building it if it isn't cached on the
+    grid yet.
+    """
+    table = maze.cache.get(CACHE_KEY)
+    if table is None:
+        table = build(maze)
+        maze.cache[CACHE_KEY] = table
+    return table
+
+
+def load_for(maze: grid.Grid, maze_filename: str) -> bool:
+    """
+    Caches the jump table saved next to a maze file on the grid, if there is
+    one and it matches the maze. Returns `True` if a table was loaded.
+    """
+    try:
+        table = JumpTable.load(table_filename(maze_filename))
+    except (OSError, ValueError):
+        return False
+    if not table.matches(maze):
+        return False
+    maze.cache[CACHE_KEY] = table
+    return True
+
+
+def save_for(maze: grid.Grid, maze_filename: str) -> bool:
+    """
+    Saves the jump table cached on the grid next to a maze file.
+    Returns `True` if there was a table to save.
+    """
+    table = maze.cache.get(CACHE_KEY)
+    if table is None:
+        return False
+    table.save(table_filename(maze_filename))
+    return True
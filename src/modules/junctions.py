@@ -0,0 +1,207 @@
+"""
+Corridor-compressed junction graph of a maze.
+
+Most of a generated maze is one node wide corridors, which a search walks
+down one node at a time. A `JunctionGraph` collapses every corridor into a
+single weighted link between the nodes at its ends: junctions, where three or
+four paths meet, and dead ends. Searching the junction graph visits a small
+fraction of the nodes a search of the whole maze would, and corridors are
+only expanded back into nodes for the final path.
+
+Graphs are cached on the grid (see `grid.Grid.cache`), so they are reused by
+every solve until a cell is changed.
+"""
+# Compact per-node arrays
+from array import array
+# Grid model the graphs are built from
+from modules import grid
+
+
+# Key of the graph in grid.Grid.cache
+CACHE_KEY = 'junction_graph'
+
+
+class JunctionGraph(object):
+    """
+    The junctions and dead ends of a maze, linked by the corridors between
+    them.
+
+    Attributes:
+        `is_node` (bytearray): `1` for every junction or dead end.
+        `corridors` (list): `(a, b, cells, cost)` tuples, where `cells` are
+            the nodes strictly between nodes `a` and `b`, in order from `a`,
+            and `cost` is the sum of their terrain costs.
+        `corridor_of` (array): Index into `corridors` of the corridor each
+            node is inside of, or `-1` for junctions, dead ends and walls.
+        `position` (array): Position of each node in its corridor's `cells`.
+        `links` (dict): `(other, cost, corridor, step)` tuples, keyed by
+            node, for every corridor leaving the node. `step` is `1` if the
+            corridor is walked from its `a` end, and `-1` if from its `b` end.
+
+    Args:
+        `maze` (grid.Grid): The maze to compress.
+    """
+    def __init__(self, maze: grid.Grid) -> None:
+        self.maze = maze
+        self.is_node = bytearray(maze.size)
+        self.corridors = []
+        self.corridor_of = array('l', [-1]) * maze.size
+        self.position = array('l', [0]) * maze.size
+        self.links = {}
+        self.build()
+
+
+    def build(self) -> None:
+        """Finds the nodes of the graph and walks every corridor."""
+        maze = self.maze
+        cells = maze.cells
+        is_node = self.is_node
+        for index in range(maze.size):
+            if cells[index] != grid.WALL and len(maze.neighbors(index)) != 2:
+                is_node[index] = 1
+        for index in range(maze.size):
+            if is_node[index]:
+                self.walk_corridors(index)
+        # Whatever is left are rings of corridor without any junctions,
+        # which are given a node of their own
+        for index in range(maze.size):
+            if (cells[index] != grid.WALL and not is_node[index] and
+                    self.corridor_of[index] == -1):
+                is_node[index] = 1
+                self.walk_corridors(index)
+
+
+    def walk_corridors(self, node: int) -> None:
+        """Adds every corridor leaving `node` that hasn't been added yet."""
+        maze = self.maze
+        is_node = self.is_node
+        corridor_of = self.corridor_of
+        for first in maze.neighbors(node):
+            if corridor_of[first] != -1:
+                continue    # Walked from its other end already
+            previous = node
+            current = first
+            corridor = []
+            while not is_node[current]:
+                corridor.append(current)
+                a, b = maze.neighbors(current)
+                previous, current = current, (b if a == previous else a)
+            if not corridor and current < node:
+                continue    # Two neighboring nodes, linked from the other one
+            self.add_corridor(node, current, corridor)
+
+
+    def add_corridor(self, a: int, b: int, cells: list) -> None:
+        """Adds the corridor of `cells` between nodes `a` and `b`."""
+        costs = grid.COSTS
+        states = self.maze.cells
+        number = len(self.corridors)
+        cost = sum(costs[states[index]] for index in cells)
+        self.corridors.append((a, b, cells, cost))
+        for position, index in enumerate(cells):
+            self.corridor_of[index] = number
+            self.position[index] = position
+        if a == b:
+            return      # A loop back to the same node never shortens a path
+        self.links.setdefault(a, []).append(
+            (b, cost + costs[states[b]], number, 1))
+        self.links.setdefault(b, []).append(
+            (a, cost + costs[states[a]], number, -1))
+
+
+    def entry_links(self, index: int) -> list:
+        """
+        Returns the links out of a node inside a corridor, to the nodes at
+        both ends of the corridor. Junctions and dead ends return their own
+        links.
+        """
+        if self.is_node[index]:
+            return self.links.get(index, [])
+        number = self.corridor_of[index]
+        if number == -1:
+            return []
+        costs = grid.COSTS
+        states = self.maze.cells
+        a, b, cells, _ = self.corridors[number]
+        position = self.position[index]
+        return [
+            (a, sum(costs[states[cell]] for cell in cells[:position]) +
+             costs[states[a]], number, -1),
+            (b, sum(costs[states[cell]] for cell in cells[position+1:]) +
+             costs[states[b]], number, 1),
+        ]
+
+
+    def exit_links(self, index: int) -> dict:
+        """
+        Returns the links into a node inside a corridor, from the nodes at
+        both ends of the corridor, keyed by the node they leave from.
+        Junctions and dead ends return an empty dictionary.
+        """
+        number = self.corridor_of[index]
+        if self.is_node[index] or number == -1:
+            return {}
+        costs = grid.COSTS
+        states = self.maze.cells
+        a, b, cells, _ = self.corridors[number]
+        position = self.position[index]
+        to_a = sum(costs[states[cell]] for cell in cells[:position+1])
+        to_b = sum(costs[states[cell]] for cell in cells[position:])
+        if a == b:
+            # Both ends of a loop are the same node, so take the cheaper way
+            return {a: (index, to_a, number, 1) if to_a <= to_b
+                    else (index, to_b, number, -1)}
+        return {a: (index, to_a, number, 1), b: (index, to_b, number, -1)}
+
+
+    def direct_link(self, index: int, other: int) -> tuple:
+        """
+        Returns the link from `index` straight to `other` if both are inside
+        the same corridor, or `None` if they aren't.
+        """
+        number = self.corridor_of[index]
+        if (number == -1 or self.is_node[index] or
+                self.corridor_of[other] != number or self.is_node[other]):
+            return None
+        costs = grid.COSTS
+        states = self.maze.cells
+        cells = self.corridors[number][2]
+        position = self.position[index]
+        other_position = self.position[other]
+        if other_position > position:
+            return (other, sum(costs[states[cell]] for cell in
+                               cells[position+1:other_position+1]), number, 1)
+        return (other, sum(costs[states[cell]] for cell in
+                           cells[other_position:position]), number, -1)
+
+
+    def expand(self, index: int, link: tuple) -> list:
+        """
+        Returns the nodes walked through when following `link` out of the
+        node at `index`, ending with the node the link leads to.
+        """
+        other, _, number, step = link
+        a, b, cells, _ = self.corridors[number]
+        walk = [a] + cells + [b]
+        if self.is_node[index]:
+            position = 0 if step == 1 else len(walk)-1
+        else:
+            position = self.position[index] + 1
+        nodes = []
+        while True:
+            position += step
+            nodes.append(walk[position])
+            if walk[position] == other:
+                return nodes
+
+
+def get(maze: grid.Grid) -> JunctionGraph:
+    """
+    Returns the junction graph of a maze, building it if it isn't cached on
+    the grid yet.
+    """
+    graph = maze.cache.get(CACHE_KEY)
+    if graph is None:
+        graph = JunctionGraph(maze)
+        maze.cache[CACHE_KEY] = graph
+    return graph
@@ -1,15 +1,19 @@
 # https://codereview.stackexchange.com/questions/225030/updateable-priority-queue
 import heapq
+from abc import ABC, abstractmethod
 
-class UpdateableQueue:
-    """An updateable priority queue class"""
-    def __init__(self, iterable=None):
-        self._heap = []
+class PriorityQueue(ABC):
+    """
+    The interface shared by every priority queue the solvers can be given.
+
+    Keys are mapped to their priorities in `_entry_finder`, and `pop()`
+    returns the key with the lowest priority. Pushing a key that's already
+    queued changes its priority, like `update()`. Subclasses implement
+    `push()`, `remove()`, `peek()` and `pop()`, and can't be created
+    without them.
+    """
+    def __init__(self):
         self._entry_finder = {}
-        if iterable:
-            for item in iterable:
-                self._entry_finder[item[0]] = item[1]
-                heapq.heappush(self._heap, (item[1], item[0]))
 
     def __getitem__(self, key):
         """
@@ -27,7 +31,7 @@ class UpdateableQueue:
     def __contains__(self, key) -> bool:
         """Returns a boolean based on if the key is in the queue"""
         return key in self._entry_finder
-    
+
     def has(self, key) -> bool:
         """Returns a boolean based on if the key is in the queue"""
         # User-facing wrapper for __contains__
@@ -43,10 +47,106 @@ class UpdateableQueue:
         else:
             raise KeyError('Item not found in the priority queue')
 
+    @abstractmethod
+    def remove(self, key):
+        """
+        Removes a key from the queue.
+        If the key is not in the queue, a `KeyError` exception is raised.
+        """
+
+    @abstractmethod
+    def push(self, key, priority):
+        """Pushes a key into the queue, or changes its priority"""
+
+    @abstractmethod
+    def peek(self) -> tuple:
+        """Returns the highest priority item without removing it"""
+
+    @abstractmethod
+    def pop(self) -> tuple:
+        """Removes the highest priority item, and returns it"""
+
+class UpdateableQueue(PriorityQueue):
+    """
+    An updateable priority queue class
+
+    Updating a key pushes a new entry for it, and leaves the old one in the
+    heap as a stale entry, which `pop()` skips. Once there are more than
+    `compact_ratio` stale entries for every live one, the heap is rebuilt
+    from the live entries only, so it never grows far beyond the number of
+    keys in the queue.
+    """
+    # Heaps smaller than this are never compacted
+    MIN_COMPACT_SIZE = 64
+
+    def __init__(self, iterable=None, compact_ratio=1.0):
+        super().__init__()
+        self.compact_ratio = compact_ratio
+        # Number of times the heap has been compacted
+        self.compactions = 0
+        if iterable:
+            for item in iterable:
+                self._entry_finder[item[0]] = item[1]
+        # Build the heap in one go, rather than pushing every item
+        self._heap = [(priority, key) for key, priority in
+                      self._entry_finder.items()]
+        heapq.heapify(self._heap)
+
+    @property
+    def live(self) -> int:
+        """Returns the number of keys in the queue"""
+        return len(self._entry_finder)
+
+    @property
+    def stale(self) -> int:
+        """Returns the number of outdated entries left in the heap"""
+        # Every key in the queue has exactly one up to date entry
+        return len(self._heap) - len(self._entry_finder)
+
+    def compact(self):
+        """Rebuilds the heap without its stale entries"""
+        self._heap = [(priority, key) for key, priority in
+                      self._entry_finder.items()]
+        heapq.heapify(self._heap)
+        self.compactions += 1
+
+    def _compact_if_stale(self):
+        """Compacts the heap once it has too many stale entries"""
+        heap_size = len(self._heap)
+        live = len(self._entry_finder)
+        if (heap_size >= self.MIN_COMPACT_SIZE and
+                heap_size - live > live * self.compact_ratio):
+            self.compact()
+
+    def remove(self, key):
+        """
+        Removes a key from the queue.
+        If the key is not in the queue, a `KeyError` exception is raised.
+        """
+        if key in self._entry_finder:
+            # The heap entry is skipped by pop() from now on
+            del self._entry_finder[key]
+            self._compact_if_stale()
+        else:
+            raise KeyError('Item not found in the priority queue')
+
     def push(self, key, priority):
         """Pushses a priority into the queue"""
+        # Pushing a key that's already queued leaves its old entry stale
+        updated = key in self._entry_finder
         self._entry_finder[key] = priority
         heapq.heappush(self._heap, (priority, key))
+        if updated:
+            self._compact_if_stale()
+
+    def peek(self) -> tuple:
+        """Returns the highest priority item without removing it"""
+        while self._heap:
+            value, key = self._heap[0]
+            if key in self and self._entry_finder[key] == value:
+                return key, value
+            heapq.heappop(self._heap)
+        raise IndexError("The heap is empty")
 
     def pop(self) -> tuple:
         """Removes a priority from the queue"""
@@ -62,4 +162,459 @@ class UpdateableQueue:
 
         value, key = heapq.heappop(self._heap)
         del self._entry_finder[key]
-        return key, value
\ No newline at end of file
+        return key, value
+
+class BucketQueue(PriorityQueue):
+    """
+    A priority queue for whole-number priorities, such as the terrain costs
+    of grid paths (Dial's algorithm).
+
+    Keys are kept in a bucket per priority, and popped from the lowest
+    non-empty bucket. Pushing, updating and removing a key take constant
+    time, and the lowest bucket is found by stepping up from the last one
+    popped, which is amortized constant time when priorities never drop
+    below the last one popped, as in Dijkstra's algorithm and A*.
+
+    Priorities may also be tuples, which are bucketed by their first item.
+    Keys in the same bucket are popped last in, first out.
+    """
+    def __init__(self, iterable=None):
+        super().__init__()
+        # Lists of keys, keyed by bucket
+        self._buckets = {}
+        # Position of each key in its bucket's list
+        self._positions = {}
+        # No bucket below this one has any keys
+        self._lowest = 0
+        if iterable:
+            for item in iterable:
+                self.push(item[0], item[1])
+
+    @staticmethod
+    def bucket(priority) -> int:
+        """Returns the bucket of a priority"""
+        if isinstance(priority, tuple):
+            priority = priority[0]
+        return int(priority)
+
+    def remove(self, key):
+        """
+        Removes a key from the queue.
+        If the key is not in the queue, a `KeyError` exception is raised.
+        """
+        if key not in self._entry_finder:
+            raise KeyError('Item not found in the priority queue')
+        bucket = self.bucket(self._entry_finder.pop(key))
+        keys = self._buckets[bucket]
+        position = self._positions.pop(key)
+        # Fill the gap with the bucket's last key
+        last = keys.pop()
+        if last != key:
+            keys[position] = last
+            self._positions[last] = position
+        if not keys:
+            del self._buckets[bucket]
+
+    def push(self, key, priority):
+        """Pushses a priority into the queue"""
+        if key in self._entry_finder:
+            self.remove(key)
+        bucket = int(priority[0] if type(priority) is tuple else priority)
+        if bucket < self._lowest or not self._entry_finder:
+            self._lowest = bucket
+        keys = self._buckets.get(bucket)
+        if keys is None:
+            keys = self._buckets[bucket] = []
+        self._entry_finder[key] = priority
+        self._positions[key] = len(keys)
+        keys.append(key)
+
+    def _lowest_bucket(self) -> list:
+        """Returns the keys of the lowest non-empty bucket"""
+        if not self._entry_finder:
+            raise IndexError("The queue is empty")
+        while self._lowest not in self._buckets:
+            self._lowest += 1
+        return self._buckets[self._lowest]
+
+    def peek(self) -> tuple:
+        """Returns the highest priority item without removing it"""
+        key = self._lowest_bucket()[-1]
+        return key, self._entry_finder[key]
+
+    def pop(self) -> tuple:
+        """Removes a priority from the queue"""
+        keys = self._lowest_bucket()
+        key = keys.pop()
+        if not keys:
+            del self._buckets[self._lowest]
+        del self._positions[key]
+        return key, self._entry_finder.pop(key)
+
+class DaryHeapQueue(PriorityQueue):
+    """
+    A priority queue kept in a d-ary heap, 4-ary by default, which tracks
+    the position of every key in the heap.
+
+    Changing a key's priority moves its entry up or down the heap in place,
+    so the heap never holds stale entries. A wider heap is shallower than a
+    binary one, so entries move through fewer levels when pushed, at the
+    cost of comparing more children when popped.
+    """
+    def __init__(self, iterable=None, arity=4):
+        super().__init__()
+        self.arity = arity
+        # (priority, key) entries, in heap order
+        self._heap = []
+        # Position of each key's entry in the heap
+        self._positions = {}
+        if iterable:
+            for item in iterable:
+                self.push(item[0], item[1])
+
+    def _move_up(self, position: int):
+        """Moves the entry at `position` up until its parent is lower"""
+        heap = self._heap
+        positions = self._positions
+        arity = self.arity
+        entry = heap[position]
+        while position:
+            parent = (position - 1) // arity
+            if not entry < heap[parent]:
+                break
+            heap[position] = heap[parent]
+            positions[heap[position][1]] = position
+            position = parent
+        heap[position] = entry
+        positions[entry[1]] = position
+
+    def _move_down(self, position: int):
+        """Moves the entry at `position` down until its children are higher"""
+        heap = self._heap
+        positions = self._positions
+        arity = self.arity
+        size = len(heap)
+        entry = heap[position]
+        while True:
+            first = position * arity + 1
+            if first >= size:
+                break
+            lowest = first
+            for child in range(first + 1, min(first + arity, size)):
+                if heap[child] < heap[lowest]:
+                    lowest = child
+            if not heap[lowest] < entry:
+                break
+            heap[position] = heap[lowest]
+            positions[heap[position][1]] = position
+            position = lowest
+        heap[position] = entry
+        positions[entry[1]] = position
+
+    def remove(self, key):
+        """
+        Removes a key from the queue.
+        If the key is not in the queue, a `KeyError` exception is raised.
+        """
+        if key not in self._entry_finder:
+            raise KeyError('Item not found in the priority queue')
+        del self._entry_finder[key]
+        position = self._positions.pop(key)
+        # Fill the gap with the last entry, and move it to where it belongs
+        last = self._heap.pop()
+        if position < len(self._heap):
+            self._heap[position] = last
+            self._move_up(position)
+            self._move_down(self._positions[last[1]])
+
+    def push(self, key, priority):
+        """Pushes a key into the queue, or changes its priority"""
+        entry = (priority, key)
+        if key in self._entry_finder:
+            position = self._positions[key]
+            old_entry = self._heap[position]
+            self._entry_finder[key] = priority
+            self._heap[position] = entry
+            if entry < old_entry:
+                self._move_up(position)
+            else:
+                self._move_down(position)
+        else:
+            self._entry_finder[key] = priority
+            self._heap.append(entry)
+            self._move_up(len(self._heap) - 1)
+
+    def peek(self) -> tuple:
+        """Returns the highest priority item without removing it"""
+        if not self._heap:
+            raise IndexError("The heap is empty")
+        priority, key = self._heap[0]
+        return key, priority
+
+    def pop(self) -> tuple:
+        """Removes the highest priority item, and returns it"""
+        if not self._heap:
+            raise IndexError("The heap is empty")
+        priority, key = self._heap[0]
+        last = self._heap.pop()
+        del self._positions[key]
+        del self._entry_finder[key]
+        if self._heap:
+            self._heap[0] = last
+            self._move_down(0)
+        return key, priority
+
+class PairingNode:
+    """A node of a `PairingHeapQueue`"""
+    __slots__ = ('priority', 'key', 'child', 'sibling', 'previous')
+
+    def __init__(self, priority, key):
+        self.priority = priority
+        self.key = key
+        # Leftmost child, and next sibling to the right
+        self.child = None
+        self.sibling = None
+        # Left sibling, or the parent of a leftmost child
+        self.previous = None
+
+class PairingHeapQueue(PriorityQueue):
+    """
+    A priority queue kept in a pairing heap, with a real decrease-key.
+
+    Lowering a key's priority cuts its node out of the heap and melds it
+    with the root in constant time, rather than pushing a new entry. Popping
+    pairs up the root's children, and takes amortized logarithmic time.
+    """
+    def __init__(self, iterable=None):
+        super().__init__()
+        self._root = None
+        # Node of each key
+        self._nodes = {}
+        if iterable:
+            for item in iterable:
+                self.push(item[0], item[1])
+
+    @staticmethod
+    def _meld(node, other):
+        """Melds two heaps, returning the root of the result"""
+        if other.priority < node.priority:
+            node, other = other, node
+        # The higher root becomes the lower root's leftmost child
+        other.sibling = node.child
+        if node.child is not None:
+            node.child.previous = other
+        other.previous = node
+        node.child = other
+        return node
+
+    @staticmethod
+    def _cut(node):
+        """Detaches a node, and the heap under it, from its parent"""
+        if node.previous.child is node:
+            node.previous.child = node.sibling
+        else:
+            node.previous.sibling = node.sibling
+        if node.sibling is not None:
+            node.sibling.previous = node.previous
+        node.previous = None
+        node.sibling = None
+
+    def _merge_pairs(self, node):
+        """
+        Melds a list of siblings into one heap, pairing them up left to
+        right, then melding the pairs right to left.
+        Returns its root, or `None` if there are no siblings.
+        """
+        meld = self._meld
+        pairs = []
+        while node is not None:
+            other = node.sibling
+            node.previous = None
+            node.sibling = None
+            if other is None:
+                pairs.append(node)
+                break
+            following = other.sibling
+            other.previous = None
+            other.sibling = None
+            pairs.append(meld(node, other))
+            node = following
+        if not pairs:
+            return None
+        root = pairs.pop()
+        while pairs:
+            root = meld(pairs.pop(), root)
+        return root
+
+    def _detach(self, node):
+        """Takes a node out of the heap, keeping its children in it"""
+        if node is self._root:
+            self._root = self._merge_pairs(node.child)
+        else:
+            self._cut(node)
+            children = self._merge_pairs(node.child)
+            if children is not None:
+                self._root = self._meld(self._root, children)
+        node.child = None
+
+    def remove(self, key):
+        """
+        Removes a key from the queue.
+        If the key is not in the queue, a `KeyError` exception is raised.
+        """
+        if key not in self._entry_finder:
+            raise KeyError('Item not found in the priority queue')
+        del self._entry_finder[key]
+        self._detach(self._nodes.pop(key))
+
+    def push(self, key, priority):
+        """Pushes a key into the queue, or changes its priority"""
+        node = self._nodes.get(key)
+        if node is None:
+            node = self._nodes[key] = PairingNode(priority, key)
+        elif priority < node.priority:
+            # Decrease-key: cut the node out, and meld it with the root
+            self._entry_finder[key] = node.priority = priority
+            if node is not self._root:
+                self._cut(node)
+                self._root = self._meld(self._root, node)
+            return
+        else:
+            self._detach(node)
+            node.priority = priority
+        self._entry_finder[key] = priority
+        self._root = node if self._root is None else \
+            self._meld(self._root, node)
+
+    def peek(self) -> tuple:
+        """Returns the highest priority item without removing it"""
+        if self._root is None:
+            raise IndexError("The heap is empty")
+        return self._root.key, self._root.priority
+
+    def pop(self) -> tuple:
+        """Removes the highest priority item, and returns it"""
+        root = self._root
+        if root is None:
+            raise IndexError("The heap is empty")
+        self._root = self._merge_pairs(root.child)
+        root.child = None
+        del self._nodes[root.key]
+        del self._entry_finder[root.key]
+        return root.key, root.priority
+
+class RadixHeapQueue(PriorityQueue):
+    """
+    A monotone priority queue for whole-number priorities, kept in a radix
+    heap.
+
+    Keys are bucketed by the highest bit their priority differs in from the
+    last priority popped. Popping from an empty lowest bucket spreads the
+    next non-empty bucket out over the buckets below it, so each key moves
+    down at most once per bit. Like `BucketQueue`, tuple priorities are
+    bucketed by their first item, and keys of the same priority are popped
+    last in, first out.
+
+    Priorities may never be pushed below the last priority popped, which
+    holds for Dijkstra's algorithm, and for A* with a consistent heuristic.
+    """
+    def __init__(self, iterable=None):
+        super().__init__()
+        # Lists of keys, one per bit of difference from self._last
+        self._buckets = [[]]
+        # Position of each key in its bucket's list
+        self._positions = {}
+        # Priority value of the last key popped
+        self._last = 0
+        if iterable:
+            for item in iterable:
+                self.push(item[0], item[1])
+
+    @staticmethod
+    def value(priority) -> int:
+        """Returns the whole-number value a priority is bucketed by"""
+        if isinstance(priority, tuple):
+            priority = priority[0]
+        return int(priority)
+
+    def _add(self, key, value: int):
+        """Adds a key to the bucket of its priority value"""
+        slot = (value ^ self._last).bit_length()
+        buckets = self._buckets
+        while slot >= len(buckets):
+            buckets.append([])
+        self._positions[key] = len(buckets[slot])
+        buckets[slot].append(key)
+
+    def remove(self, key):
+        """
+        Removes a key from the queue.
+        If the key is not in the queue, a `KeyError` exception is raised.
+        """
+        if key not in self._entry_finder:
+            raise KeyError('Item not found in the priority queue')
+        value = self.value(self._entry_finder.pop(key))
+        keys = self._buckets[(value ^ self._last).bit_length()]
+        position = self._positions.pop(key)
+        # Fill the gap with the bucket's last key
+        last = keys.pop()
+        if last != key:
+            keys[position] = last
+            self._positions[last] = position
+
+    def push(self, key, priority):
+        """
+        Pushes a key into the queue, or changes its priority.
+        Raises a `ValueError` if the priority is below the last one popped.
+        """
+        if key in self._entry_finder:
+            self.remove(key)
+        value = int(priority[0] if type(priority) is tuple else priority)
+        if value < self._last:
+            if self._entry_finder:
+                raise ValueError('Priorities of a radix heap can\'t go below '
+                                 'the last priority popped')
+            self._last = value
+        self._entry_finder[key] = priority
+        self._add(key, value)
+
+    def _lowest_bucket(self) -> list:
+        """
+        Returns the keys of the lowest priority, redistributing the lowest
+        non-empty bucket if they aren't in the first bucket already.
+        """
+        if not self._entry_finder:
+            raise IndexError("The queue is empty")
+        buckets = self._buckets
+        if not buckets[0]:
+            slot = 1
+            while not buckets[slot]:
+                slot += 1
+            keys = buckets[slot]
+            buckets[slot] = []
+            entries = self._entry_finder
+            value = self.value
+            self._last = min(value(entries[key]) for key in keys)
+            for key in keys:
+                self._add(key, value(entries[key]))
+        return buckets[0]
+
+    def peek(self) -> tuple:
+        """Returns the highest priority item without removing it"""
+        key = self._lowest_bucket()[-1]
+        return key, self._entry_finder[key]
+
+    def pop(self) -> tuple:
+        """Removes the highest priority item, and returns it"""
+        key = self._lowest_bucket().pop()
+        del self._positions[key]
+        return key, self._entry_finder.pop(key)
+
+# Queue classes, keyed by the names accepted by solver.solve()
+QUEUES = {
+    'heap': UpdateableQueue,
+    'dary': DaryHeapQueue,
+    'pairing': PairingHeapQueue,
+    'bucket': BucketQueue,
+    'radix': RadixHeapQueue,
+}
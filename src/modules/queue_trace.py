@@ -0,0 +1,175 @@
+"""
+Recorded priority queue workloads, for comparing queue backends.
+
+A trace is recorded by solving a maze with a `RecordingQueue`, which passes
+every operation on to a real queue and notes it down. Replaying the trace
+runs the exact same pushes, lookups and pops on a new queue, without the
+rest of the solver, so the time and memory it takes are the queue's own.
+Solvers that search with more than one queue, like
+`solver.bidirectional_astar()`, have the operations of each queue recorded
+under its own number.
+
+Backends break ties between keys of the same priority differently, so a
+solve expands nodes in a different order, and does different operations, on
+each backend. A trace recorded with one backend would drift out of step with
+the queue contents when replayed on another, so each backend is replayed on
+a trace recorded with that backend.
+"""
+# Used to number the queues a solve makes
+from itertools import count
+# Used to time replays
+from time import perf_counter
+# Used to measure the peak memory of replays
+import tracemalloc
+# Grid model of the mazes traces are recorded from
+from modules import grid
+# Solvers the traces are recorded from
+from modules import solver
+# Queue backends
+from modules import priority_queue as pq
+
+
+# Operations in a trace, recorded as (queue, operation, key, priority) tuples,
+# where queue is the number of the queue in the order the solver made them
+PUSH = 0
+POP = 1
+REMOVE = 2
+CONTAINS = 3
+
+
+class RecordingQueue(object):
+    """
+    A priority queue that records every operation done on it in `trace`,
+    and passes it on to `queue`. Updates are recorded as pushes, since every
+    backend treats pushing a queued key as an update.
+
+    Args:
+        `queue` (pq.PriorityQueue): The queue that does the work.
+        `trace` (list): The list operations are appended to.
+        `number` (int: Optional): The number operations are recorded under.
+    """
+    def __init__(self, queue: pq.PriorityQueue, trace: list,
+                 number: int = 0) -> None:
+        self.queue = queue
+        self.trace = trace
+        self.number = number
+
+
+    def __len__(self) -> int:
+        """Returns the length of the queue, without recording it."""
+        return len(self.queue)
+
+
+    def __contains__(self, key) -> bool:
+        """Records and checks if the key is in the queue."""
+        self.trace.append((self.number, CONTAINS, key, None))
+        return key in self.queue
+
+
+    def push(self, key, priority) -> None:
+        """Records and pushes a key into the queue."""
+        self.trace.append((self.number, PUSH, key, priority))
+        self.queue.push(key, priority)
+
+
+    def update(self, key, priority) -> None:
+        """Records and updates the priority of a key."""
+        self.trace.append((self.number, PUSH, key, priority))
+        self.queue.update(key, priority)
+
+
+    def remove(self, key) -> None:
+        """Records and removes a key from the queue."""
+        self.trace.append((self.number, REMOVE, key, None))
+        self.queue.remove(key)
+
+
+    def peek(self) -> tuple:
+        """Returns the highest priority item, without recording it."""
+        return self.queue.peek()
+
+
+    def pop(self) -> tuple:
+        """Pops the highest priority item, recording the key popped."""
+        key, priority = self.queue.pop()
+        self.trace.append((self.number, POP, key, priority))
+        return key, priority
+
+
+def record_trace(maze: grid.Grid, algorithm: str = 'dijkstra',
+                 queue_class=pq.UpdateableQueue) -> list:
+    """
+    Solves a maze from its start node to its end node, and returns the
+    operations the solver did on its priority queue.
+
+    Args:
+        `maze` (grid.Grid): The maze to solve.
+        `algorithm` (str: Optional): One of `solver.QUEUE_ALGORITHMS`.
+        `queue_class` (class: Optional): The queue the solve is recorded
+            with.
+
+    Raises a `ValueError` if the algorithm doesn't take a queue, or if the
+    maze has no start or end node.
+    """
+    if algorithm not in solver.QUEUE_ALGORITHMS:
+        raise ValueError(f'The {algorithm} algorithm doesn\'t take a queue, '
+                         f'only {", ".join(solver.QUEUE_ALGORITHMS)} do')
+    if maze.start is None or maze.end is None:
+        raise ValueError('The maze needs a start and an end node')
+    trace = []
+    numbers = count()
+    solver.ALGORITHMS[algorithm](
+        maze, maze.start, maze.end,
+        queue_class=lambda: RecordingQueue(queue_class(), trace,
+                                           next(numbers)))
+    return trace
+
+
+def replay(trace: list, queue_class) -> None:
+    """
+    Runs the operations of a trace on new queues of `queue_class`, one for
+    each queue the trace was recorded from.
+    Raises a `ValueError` if a pop doesn't return the recorded key, i.e. if
+    the trace wasn't recorded with `queue_class`.
+    """
+    queues = []
+    for number, operation, key, priority in trace:
+        while number >= len(queues):
+            queues.append(queue_class())
+        queue = queues[number]
+        if operation == CONTAINS:
+            key in queue    # Only timed, the result isn't needed
+        elif operation == PUSH:
+            queue.push(key, priority)
+        elif operation == POP:
+            if queue.pop()[0] != key:
+                raise ValueError(f'{queue_class.__name__} popped another key '
+                                 f'than the one recorded')
+        else:
+            queue.remove(key)
+
+
+def benchmark(trace: list, queue_class, repeat: int = 3) -> dict:
+    """
+    Replays a trace on the queue backend it was recorded with.
+    Returns a JSON serializable dictionary of the number of operations, the
+    operations per second of the fastest of `repeat` replays, and the peak
+    memory allocated by a replay in bytes.
+    """
+    fastest = None
+    for _ in range(repeat):
+        started = perf_counter()
+        replay(trace, queue_class)
+        elapsed = perf_counter() - started
+        if fastest is None or elapsed < fastest:
+            fastest = elapsed
+    # Measured apart from the timings, which tracing would slow down
+    tracemalloc.start()
+    replay(trace, queue_class)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        'operations': len(trace),
+        'ops_per_sec': len(trace) / fastest if fastest else None,
+        'peak_memory': peak,
+    }
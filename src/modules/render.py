@@ -0,0 +1,57 @@
+"""
+Frame-coalescing render queue for animating the pathfinding algorithms.
+
+Drawing every node state change as it happens costs a round-trip to the GUI
+toolkit per change. A `RenderQueue` collects the changes in memory instead,
+and applies them in one batch per display frame. Repeated changes to the same
+node within a frame are merged, so only the latest one is drawn.
+"""
+# Used to time display frames
+from time import perf_counter
+
+
+class RenderQueue(object):
+    """
+    Collects node state changes and draws them once per display frame.
+
+    Args:
+        `draw` (callable): Called as `draw(index, state)` for every node that
+            changed since the last flush.
+        `frame_time` (float: Optional): Length of a display frame in seconds.
+    """
+    def __init__(self, draw, frame_time: float = 1/60) -> None:
+        self.draw = draw
+        self.frame_time = frame_time
+        # Pending node states, keyed by node index.
+        # Pushing a node that's already pending replaces its state.
+        self._pending = {}
+        self._last_flush = perf_counter()
+
+
+    def __len__(self) -> int:
+        """Returns the number of nodes waiting to be drawn."""
+        return len(self._pending)
+
+
+    def push(self, index: int, state) -> None:
+        """Queues `state` to be drawn for the node at `index`."""
+        self._pending[index] = state
+
+
+    def frame_is_due(self) -> bool:
+        """Returns `True` if a display frame has passed since the last flush."""
+        return perf_counter() - self._last_flush >= self.frame_time
+
+
+    def flush(self) -> None:
+        """Draws every pending node state and empties the queue."""
+        pending = self._pending
+        self._pending = {}
+        for index, state in pending.items():
+            self.draw(index, state)
+        self._last_flush = perf_counter()
+
+
+    def clear(self) -> None:
+        """Discards every pending node state without drawing it."""
+        self._pending = {}
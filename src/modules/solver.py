@@ -0,0 +1,1360 @@
+"""
+Headless pathfinding algorithms.
+
+The algorithms in this module run on a `grid.Grid` and never touch a window.
+A GUI can follow a solve by passing an `observer` callable to `solve()`, which
+is called as `observer(event, index)` for every step of the search:
+    `'active'`: The node at `index` is about to be expanded.
+    `'neighbor'`: The node at `index` was discovered.
+    `'visited'`: The node at `index` has been expanded.
+    `'filled'`: The node at `index` was filled in as part of a dead end.
+    `'wave'`: A batch of nodes has been reported, where `index` is the number
+        of batches so far. Algorithms that work on many nodes at once, like
+        `fill_dead_ends()` and `bit_parallel_bfs()`, report in batches.
+If the observer returns `True`, the search is interrupted.
+
+Dijkstra and the A* variants honour the cost of weighted terrain (see
+`grid.COSTS`), and return the cheapest path, as does the vectorized
+`npdijkstra` (see `wavefront`). BFS, DFS and dead end filling
+ignore terrain and treat every move as costing 1, so BFS returns the path
+with the fewest moves.
+"""
+# Data structure used in the Dijkstra and A* algorithms
+from modules import priority_queue as pq
+# Used to build solution paths
+from modules import grid
+# Precomputed jump distances used by the JPS+ algorithm
+from modules import jump_table
+# Incremental planner kept between solves by the LPA* algorithm
+from modules import incremental
+# Cluster abstraction used by the HPA* algorithm
+from modules import hierarchy
+# Corridor-compressed graph used by the junction graph A* algorithm
+from modules import junctions
+# Optional NumPy solvers, used by the npbfs and npdijkstra algorithms
+from modules import wavefront
+# Used to reject unsolvable mazes without searching them
+from modules import connectivity
+# Per-node arrays reused between solves by BFS, DFS, Dijkstra and A*
+from modules import buffers
+# Precomputed neighbors walked by BFS, DFS, Dijkstra and A* on repeat solves
+from modules import adjacency
+# Data structure used as a queue/stack for BFS/DFS algorithms
+from collections import deque
+# Used to mark the nodes filled in by dead end filling as visited
+from itertools import compress
+# Compact per-node arrays used by the algorithms
+from array import array
+# Used to time solves
+from time import perf_counter
+
+
+# Translates grid.Grid.cells into the digits of a bit_parallel_bfs() bitmask
+OPEN_DIGITS = bytes(ord('0') if state == grid.WALL else ord('1')
+                    for state in range(256))
+
+# Translates grid.Grid.cells into 1 for open nodes, and 0 for walls
+OPEN_NODES = bytes(0 if state == grid.WALL else 1 for state in range(256))
+
+# Counts the set bits of an integer, natively on Python 3.10 and higher
+popcount = getattr(int, 'bit_count', lambda bits: bin(bits).count('1'))
+
+
+class SolveResult(object):
+    """
+    The outcome of a `solve()` call.
+
+    Attributes:
+        `algorithm` (str): Name of the algorithm that was used.
+        `path` (list): Node indexes from start to end, or `None` if the maze
+            could not be solved.
+        `cost` (int): Terrain cost of `path`, or `None` if unsolved.
+        `expanded` (int): Number of nodes expanded by the search.
+        `peak_frontier` (int): Largest size the open queue/stack reached.
+        `wall_time` (float): Time taken by the search, in seconds.
+        `interrupted` (bool): `True` if the observer stopped the search.
+    """
+    def __init__(self, algorithm: str, path: list, expanded: int,
+                 peak_frontier: int, wall_time: float,
+                 interrupted: bool = False, cost: int = None) -> None:
+        self.algorithm = algorithm
+        self.path = path
+        self.cost = cost
+        self.expanded = expanded
+        self.peak_frontier = peak_frontier
+        self.wall_time = wall_time
+        self.interrupted = interrupted
+
+
+    @property
+    def solved(self) -> bool:
+        """`True` if a path from start to end was found."""
+        return self.path is not None
+
+
+    def to_dict(self) -> dict:
+        """Returns the result as a JSON serializable dictionary."""
+        return {
+            'algorithm': self.algorithm,
+            'solved': self.solved,
+            'path': self.path,
+            'path_length': len(self.path) if self.path else None,
+            'path_cost': self.cost,
+            'expanded': self.expanded,
+            'peak_frontier': self.peak_frontier,
+            'wall_time': self.wall_time,
+            'interrupted': self.interrupted,
+        }
+
+
+def fill_dead_ends(maze: grid.Grid, start: int, end: int,
+                   observer=None) -> tuple:
+    """
+    Fills in every dead end of the maze, other than the start and end nodes.
+    A node with a single open neighbor can't be on a path between the start
+    and end nodes, and filling it in can turn its neighbor into a dead end,
+    so whole dead end corridors are filled in a single pass over the maze.
+    In a maze without loops, only the solution path is left open.
+
+    Dead ends are filled in waves, each wave filling every dead end one node
+    further. The observer gets a `'filled'` event for every node, and a
+    `'wave'` event at the end of each wave.
+    Returns a tuple of `(filled, count, interrupted)`, where `filled` is a
+    `bytearray` with a `1` for every filled node, walls excluded.
+    """
+    cells = maze.cells
+    filled = bytearray(maze.size)
+    # Number of open, unfilled neighbors of each node
+    degrees = bytearray(maze.size)
+    wave = []
+    for index in range(maze.size):
+        if cells[index] == grid.WALL:
+            continue
+        degrees[index] = len(maze.neighbors(index))
+        if degrees[index] <= 1 and index != start and index != end:
+            wave.append(index)
+    count = 0
+    waves = 0
+    while wave:
+        next_wave = []
+        for index in wave:
+            filled[index] = 1
+            count += 1
+            if observer:
+                observer('filled', index)
+            for neighbor in maze.neighbors(index):
+                if filled[neighbor]:
+                    continue
+                degrees[neighbor] -= 1
+                # The neighbor became a dead end
+                if (degrees[neighbor] == 1 and neighbor != start and
+                        neighbor != end):
+                    next_wave.append(neighbor)
+        waves += 1
+        if observer and observer('wave', waves):
+            return (filled, count, True)
+        wave = next_wave
+    return (filled, count, False)
+
+
+def bfs_dfs(maze: grid.Grid, start: int, end: int, depth_first=False,
+            observer=None, dead_end_filling=False) -> tuple:
+    """
+    Traverses the maze using a breadth-first or depth-first search algorithm.
+    The two are the same except for the underlying data structure used.
+    Breadth-first uses a queue (first in, first out).
+    Depth first uses a stack (last in, first out).
+    If `dead_end_filling` is `True`, dead ends are filled in before
+    searching (see `fill_dead_ends()`), and the filled nodes count as
+    expanded. Mazes solved before walk the neighbors precomputed in their
+    `adjacency.Adjacency` index, instead of `maze.neighbors()`.
+
+    Returns a tuple of `(parents, current, expanded, peak_frontier,
+    interrupted)`, where `current` is the node the search finished on.
+    `parents` is taken from `buffers.POOL`, and can be given back to it
+    once the path has been built. It only links the nodes the search
+    reached, so follow it back from the end node (see `grid.build_path()`).
+    """
+    pool = buffers.POOL
+    parents = pool.take('i', maze.size)
+    parents[start] = -1
+    # A node has been visited if it's stamped with the solve's epoch
+    visited = pool.take_stamps(maze.size)
+    stamps = visited.stamps
+    epoch = visited.epoch
+    expanded = 0
+    if dead_end_filling:
+        filled, expanded, interrupted = fill_dead_ends(maze, start, end,
+                                                       observer)
+        if interrupted:
+            pool.give_back(visited)
+            return (parents, start, expanded, 0, True)
+        # Filled nodes are never searched, as if they had been visited
+        for index in compress(range(maze.size), filled):
+            stamps[index] = epoch
+    stamps[start] = epoch
+    peak_frontier = 1
+    adjacent = adjacency.get_adjacency(maze)
+    if adjacent is not None:
+        offsets = adjacent.offsets
+        targets = adjacent.targets
+    # use a stack suitable for both bfs and dfs,
+    # allowing for both lifo and fifo operations
+    stack = deque([start])
+    current = start
+
+    # as long as the stack has a node
+    while stack:
+        # set the top node as the currently active node
+        current = stack.pop()
+        if observer and observer('active', current):
+            pool.give_back(visited)
+            return (parents, current, expanded, peak_frontier, True)
+        # check if it's the end node
+        if current == end:
+            break
+        expanded += 1
+        # for all valid neighbor nodes:
+        # (in-bound nodes that are not walls, and have not been visited)
+        if adjacent is None:
+            for neighbor in maze.neighbors(current):
+                if stamps[neighbor] == epoch:
+                    continue
+                stamps[neighbor] = epoch
+                parents[neighbor] = current
+                if observer:
+                    observer('neighbor', neighbor)
+                # add the neighbor to a queue
+                if depth_first: # DFS, use stack: last in, first out
+                    stack.append(neighbor)
+                else: # BFS, use queue: first in, first out
+                    stack.appendleft(neighbor)
+        else:
+            # Same as above, walking the node's row of the index
+            for slot in range(offsets[current], offsets[current+1]):
+                neighbor = targets[slot]
+                if stamps[neighbor] == epoch:
+                    continue
+                stamps[neighbor] = epoch
+                parents[neighbor] = current
+                if observer:
+                    observer('neighbor', neighbor)
+                if depth_first:
+                    stack.append(neighbor)
+                else:
+                    stack.appendleft(neighbor)
+        if observer:
+            observer('visited', current)
+        peak_frontier = max(peak_frontier, len(stack))
+
+    pool.give_back(visited)
+    return (parents, current, expanded, peak_frontier, False)
+
+
+def bit_parallel_bfs(maze: grid.Grid, start: int, end: int,
+                     observer=None) -> tuple:
+    """
+    Finds the solution with the fewest moves using a breadth-first search
+    that advances a whole layer of the search at once.
+
+    The open nodes of the maze are stored as the bits of a single integer,
+    one row after another with a padding bit after each row, so moving every
+    node of a layer up, right, down or left is a single bit shift. A layer is
+    spread to its neighbors with a few shifts, ands and ors, which Python
+    runs over the whole maze at native speed. The search only remembers the
+    distance of each node modulo 3: in a grid, neighbors are always one move
+    closer to or further from the start node, so walking back from the end
+    node to a neighbor one move closer recovers the path.
+
+    This is several times faster than `bfs_dfs()` in open mazes, with few
+    layers of many nodes each, but slower in long winding mazes. The nodes of
+    each layer are reported to the observer as `'visited'`, followed by a
+    `'wave'` event.
+    Returns the same tuple as `bfs_dfs()`.
+    """
+    width = maze.width
+    stride = width+1
+    height = maze.height
+    parents = array('l', [-1]) * maze.size
+    # Open nodes written out as binary digits, with the last node as the most
+    # significant digit
+    digits = maze.cells.translate(OPEN_DIGITS)
+    open_nodes = int(b'0'.join(digits[y*width:(y+1)*width]
+                               for y in range(height))[::-1], 2)
+    start_bit = 1 << (start//width*stride + start%width)
+    end_bit = 1 << (end//width*stride + end%width)
+    # Nodes by distance from the start node, modulo 3
+    layers = [start_bit, 0, 0]
+    frontier = start_bit
+    previous = 0
+    distance = 0
+    expanded = 1
+    peak_frontier = 1
+    while not frontier & end_bit:
+        spread = ((frontier << 1) | (frontier >> 1) | (frontier << stride) |
+                  (frontier >> stride)) & open_nodes
+        # The neighbors of a layer are all in the layer before or after it,
+        # so only the previous layer has to be left out
+        previous, frontier = frontier, spread ^ (spread & previous)
+        if not frontier:
+            return (parents, start, expanded, peak_frontier, False)
+        distance += 1
+        layers[distance % 3] |= frontier
+        count = popcount(frontier)
+        expanded += count
+        peak_frontier = max(peak_frontier, count)
+        if observer:
+            for index in bit_indexes(frontier, width, stride):
+                observer('visited', index)
+            if observer('wave', distance):
+                return (parents, start, expanded, peak_frontier, True)
+
+    # Walk back from the end node, one move closer at a time
+    length = (height*stride + 7) // 8
+    layers = [layer.to_bytes(length, 'little') for layer in layers]
+    current = end
+    while distance > 0:
+        distance -= 1
+        closer = layers[distance % 3]
+        for neighbor in maze.neighbors(current):
+            bit = neighbor//width*stride + neighbor%width
+            if closer[bit >> 3] >> (bit & 7) & 1:
+                parents[current] = neighbor
+                current = neighbor
+                break
+    return (parents, end, expanded, peak_frontier, False)
+
+
+def bit_indexes(bits: int, width: int, stride: int) -> list:
+    """
+    Returns the node indexes of the set bits of a `bit_parallel_bfs()`
+    bitmask.
+    """
+    indexes = []
+    data = bits.to_bytes((bits.bit_length()+7) // 8, 'little')
+    for position, byte in enumerate(data):
+        while byte:
+            low = byte & -byte
+            bit = position*8 + low.bit_length()-1
+            indexes.append(bit//stride*width + bit%stride)
+            byte ^= low
+    return indexes
+
+
+def dijkstra(maze: grid.Grid, start: int, end: int, observer=None,
+             queue_class=pq.UpdateableQueue) -> tuple:
+    """
+    Finds the cheapest solution to the maze using Dijkstra's algorithm.
+    Moving into a node costs that node's terrain cost (see `grid.COSTS`).
+    `queue_class` is the priority queue to use, one of `pq.QUEUES`.
+    Like `bfs_dfs()`, mazes solved before walk their `adjacency.Adjacency`.
+    Returns the same tuple as `bfs_dfs()`.
+    """
+    pool = buffers.POOL
+    parents = pool.take('i', maze.size)
+    parents[start] = -1
+    distances = pool.take('i', maze.size)
+    distances[start] = 0
+    # A node's distance is only known if it's stamped with the solve's epoch,
+    # otherwise it's infinite
+    reached = pool.take_stamps(maze.size)
+    stamps = reached.stamps
+    epoch = reached.epoch
+    stamps[start] = epoch
+    cells = maze.cells
+    costs = grid.COSTS
+    expanded = 0
+    peak_frontier = 1
+    current = start
+    adjacent = adjacency.get_adjacency(maze)
+    if adjacent is not None:
+        offsets = adjacent.offsets
+        targets = adjacent.targets
+
+    # Initialize an updateable priority queue with the start node, at priority 0
+    # The 'keys' for the queue will be the indexes of the nodes
+    queue = queue_class()
+    queue.push(start, 0)
+
+    # As long as the queue isn't empty:
+    while len(queue) > 0:
+        # Get the closest node. Its distance is final from here on.
+        current = queue.pop()[0]
+        if observer and observer('active', current):
+            pool.give_back(distances, reached)
+            return (parents, current, expanded, peak_frontier, True)
+        # Check to see if it's the end node
+        if current == end:
+            break
+        expanded += 1
+
+        # Relax the edge to each valid neighbor node. Expanded nodes are
+        # never closer to the start node than the current node, so they're
+        # skipped by the distance check.
+        if adjacent is None:
+            for neighbor in maze.neighbors(current):
+                # Calculate the distance of that node to the start node
+                distance = distances[current] + costs[cells[neighbor]]
+                if (stamps[neighbor] == epoch and
+                        distance >= distances[neighbor]):
+                    continue
+                # A shorter path to the neighbor was found
+                stamps[neighbor] = epoch
+                distances[neighbor] = distance
+                parents[neighbor] = current
+                if neighbor in queue:
+                    # Change queue priority for neighbor since it's now closer
+                    queue.update(neighbor, distance)
+                else:
+                    queue.push(neighbor, distance)
+                if observer:
+                    observer('neighbor', neighbor)
+        else:
+            # Same as above, walking the node's row of the index
+            for slot in range(offsets[current], offsets[current+1]):
+                neighbor = targets[slot]
+                distance = distances[current] + costs[cells[neighbor]]
+                if (stamps[neighbor] == epoch and
+                        distance >= distances[neighbor]):
+                    continue
+                stamps[neighbor] = epoch
+                distances[neighbor] = distance
+                parents[neighbor] = current
+                if neighbor in queue:
+                    queue.update(neighbor, distance)
+                else:
+                    queue.push(neighbor, distance)
+                if observer:
+                    observer('neighbor', neighbor)
+        if observer:
+            observer('visited', current)
+        peak_frontier = max(peak_frontier, len(queue))
+
+    pool.give_back(distances, reached)
+    return (parents, current, expanded, peak_frontier, False)
+
+
+def manhattan_distance(maze: grid.Grid, index: int, other: int) -> int:
+    """
+    Returns the Manhattan distance between two nodes.
+    Nodes can only be entered from above, below, left or right, and every
+    move costs at least 1, so this never overestimates the cost of a path.
+    """
+    width = maze.width
+    return (abs(index % width - other % width) +
+            abs(index // width - other // width))
+
+
+def astar(maze: grid.Grid, start: int, end: int, observer=None,
+          dead_end_filling=False, queue_class=pq.UpdateableQueue) -> tuple:
+    """
+    Finds the solution to the maze using the A-star (A*) algorithm.
+    Nodes are expanded in order of `f = g + h`, where `g` is the terrain cost
+    of the best known path from the start node and `h` is the Manhattan
+    distance to the end node. Ties are broken in favor of the higher `g`,
+    i.e. the node closest to the end node.
+    `dead_end_filling` and the `adjacency.Adjacency` index work like in
+    `bfs_dfs()`, and `queue_class` like in `dijkstra()`.
+    Returns the same tuple as `bfs_dfs()`.
+    """
+    pool = buffers.POOL
+    parents = pool.take('i', maze.size)
+    parents[start] = -1
+    expanded = 0
+    filled = None
+    if dead_end_filling:
+        filled, expanded, interrupted = fill_dead_ends(maze, start, end,
+                                                       observer)
+        if interrupted:
+            return (parents, start, expanded, 0, True)
+    # Cost of the best known path from the start node to each node, only
+    # known if the node is stamped with the solve's epoch
+    costs = pool.take('i', maze.size)
+    costs[start] = 0
+    reached = pool.take_stamps(maze.size)
+    stamps = reached.stamps
+    epoch = reached.epoch
+    stamps[start] = epoch
+    cells = maze.cells
+    step_costs = grid.COSTS
+    peak_frontier = 1
+    current = start
+    adjacent = adjacency.get_adjacency(maze)
+    if adjacent is not None:
+        offsets = adjacent.offsets
+        targets = adjacent.targets
+
+    # Initialize an updateable priority queue with the start node.
+    # The 'keys' for the queue will be the indexes of the nodes, and the
+    # priorities will be (f, -g) tuples
+    queue = queue_class()
+    queue.push(start, (manhattan_distance(maze, start, end), 0))
+
+    # As long as the queue isn't empty:
+    while len(queue) > 0:
+        # Get the node with the lowest f
+        current = queue.pop()[0]
+        # Check to see if it's the end node
+        if current == end:
+            break
+        if observer and observer('active', current):
+            pool.give_back(costs, reached)
+            return (parents, current, expanded, peak_frontier, True)
+        expanded += 1
+
+        # Relax the edge to each valid neighbor node
+        if adjacent is None:
+            for neighbor in maze.neighbors(current):
+                if filled is not None and filled[neighbor]:
+                    continue
+                cost = costs[current] + step_costs[cells[neighbor]]
+                if stamps[neighbor] == epoch and cost >= costs[neighbor]:
+                    continue
+                # A cheaper path to the neighbor was found
+                stamps[neighbor] = epoch
+                costs[neighbor] = cost
+                parents[neighbor] = current
+                priority = (cost + manhattan_distance(maze, neighbor, end),
+                            -cost)
+                if neighbor in queue:
+                    queue.update(neighbor, priority)
+                else:
+                    # New node, or an expanded node that has to be reopened
+                    queue.push(neighbor, priority)
+                if observer:
+                    observer('neighbor', neighbor)
+        else:
+            # Same as above, walking the node's row of the index
+            for slot in range(offsets[current], offsets[current+1]):
+                neighbor = targets[slot]
+                if filled is not None and filled[neighbor]:
+                    continue
+                cost = costs[current] + step_costs[cells[neighbor]]
+                if stamps[neighbor] == epoch and cost >= costs[neighbor]:
+                    continue
+                stamps[neighbor] = epoch
+                costs[neighbor] = cost
+                parents[neighbor] = current
+                priority = (cost + manhattan_distance(maze, neighbor, end),
+                            -cost)
+                if neighbor in queue:
+                    queue.update(neighbor, priority)
+                else:
+                    queue.push(neighbor, priority)
+                if observer:
+                    observer('neighbor', neighbor)
+        if observer:
+            observer('visited', current)
+        peak_frontier = max(peak_frontier, len(queue))
+
+    pool.give_back(costs, reached)
+    return (parents, current, expanded, peak_frontier, False)
+
+
+def join_paths(parents, children, meet: int) -> None:
+    """
+    Joins the two halves of a bidirectional search at the node `meet`.
+    `parents` leads from `meet` back to the start node, and `children` leads
+    from `meet` on to the end node. The `children` links are copied into
+    `parents`, so `grid.build_path(parents, end)` returns the whole path.
+    """
+    index = meet
+    while children[index] != -1:
+        parents[children[index]] = index
+        index = children[index]
+
+
+def bidirectional_bfs(maze: grid.Grid, start: int, end: int,
+                      observer=None) -> tuple:
+    """
+    Traverses the maze with two breadth-first searches, one from the start
+    node and one from the end node. The smaller of the two frontiers is
+    expanded one whole layer at a time, until a layer reaches a node found by
+    the other search. The shortest of the connections made by that layer is
+    the solution path. Like `bfs_dfs()`, every move costs 1.
+    Returns the same tuple as `bfs_dfs()`.
+    """
+    parents = array('l', [-1]) * maze.size   # Links towards the start node
+    children = array('l', [-1]) * maze.size  # Links towards the end node
+    # Number of moves from the start node (forwards) or to the end node
+    # (backwards) for every node reached by either search
+    depths = array('l', [0]) * maze.size
+    # Which search reached each node first: 1 forwards, 2 backwards
+    reached = bytearray(maze.size)
+    reached[start] = 1
+    reached[end] = 2
+    forwards = [start]
+    backwards = [end]
+    expanded = 0
+    peak_frontier = 2
+    current = start
+    if start == end:
+        return (parents, end, 0, 1, False)
+
+    while forwards and backwards:
+        # Expand the smaller frontier
+        if len(forwards) <= len(backwards):
+            direction, layer, links = 1, forwards, parents
+        else:
+            direction, layer, links = 2, backwards, children
+        next_layer = []
+        # Best connection between the two searches: (moves, forward, backward)
+        best = None
+        for current in layer:
+            if observer and observer('active', current):
+                return (parents, current, expanded, peak_frontier, True)
+            expanded += 1
+            for neighbor in maze.neighbors(current):
+                if reached[neighbor] == direction:
+                    continue
+                if reached[neighbor]:
+                    # The other search already reached the neighbor
+                    moves = depths[current] + 1 + depths[neighbor]
+                    if best is None or moves < best[0]:
+                        if direction == 1:
+                            best = (moves, current, neighbor)
+                        else:
+                            best = (moves, neighbor, current)
+                    continue
+                reached[neighbor] = direction
+                depths[neighbor] = depths[current] + 1
+                links[neighbor] = current
+                next_layer.append(neighbor)
+                if observer:
+                    observer('neighbor', neighbor)
+            if observer:
+                observer('visited', current)
+        if direction == 1:
+            forwards = next_layer
+        else:
+            backwards = next_layer
+        peak_frontier = max(peak_frontier, len(forwards) + len(backwards))
+        if best:
+            moves, forward, backward = best
+            children[forward] = backward
+            join_paths(parents, children, forward)
+            return (parents, end, expanded, peak_frontier, False)
+
+    # The searches never met. The backwards search may have finished on the
+    # end node, so finish on the start node to report the maze as unsolved.
+    return (parents, start, expanded, peak_frontier, False)
+
+
+def bidirectional_astar(maze: grid.Grid, start: int, end: int, observer=None,
+                        queue_class=pq.UpdateableQueue) -> tuple:
+    """
+    Finds the solution to the maze with two A* searches, one from the start
+    node towards the end node, and one from the end node towards the start
+    node. The search with the smaller queue is stepped each time.
+
+    `mu` is the cost of the cheapest path found so far through a node that
+    both searches have reached. Each search's lowest `f` never overestimates
+    the cost of a path it hasn't found yet, so once either search pops a node
+    with `f >= mu`, no path cheaper than `mu` exists and the search stops.
+    Nodes already expanded by the other search are skipped, as `mu` already
+    accounts for the best path through them.
+    Both searches use a queue of `queue_class`, like in `dijkstra()`.
+    Returns the same tuple as `bfs_dfs()`.
+    """
+    parents = array('l', [-1]) * maze.size   # Links towards the start node
+    children = array('l', [-1]) * maze.size  # Links towards the end node
+    # Cost of the best known path from the start node to each node,
+    # including the node's own cost
+    forward_costs = array('d', [float('inf')]) * maze.size
+    forward_costs[start] = 0
+    # Cost of the best known path from each node to the end node,
+    # excluding the node's own cost
+    backward_costs = array('d', [float('inf')]) * maze.size
+    backward_costs[end] = 0
+    cells = maze.cells
+    step_costs = grid.COSTS
+    # Which searches have expanded each node: 1 forwards, 2 backwards
+    closed = bytearray(maze.size)
+    expanded = 0
+    peak_frontier = 2
+    current = start
+    mu = float('inf')
+    meet = -1
+    if start == end:
+        return (parents, end, 0, 1, False)
+
+    # Queue keys are node indexes, priorities are (f, -g) tuples like astar()
+    forwards = queue_class()
+    forwards.push(start, (manhattan_distance(maze, start, end), 0))
+    backwards = queue_class()
+    backwards.push(end, (manhattan_distance(maze, end, start), 0))
+
+    while len(forwards) > 0 and len(backwards) > 0:
+        forward = len(forwards) <= len(backwards)
+        if forward:
+            queue, costs, other_costs = forwards, forward_costs, backward_costs
+            links, target, side, other_side = parents, end, 1, 2
+        else:
+            queue, costs, other_costs = backwards, backward_costs, forward_costs
+            links, target, side, other_side = children, start, 2, 1
+        current, priority = queue.pop()
+        # No path through the unexpanded nodes can be cheaper than mu
+        if priority[0] >= mu:
+            break
+        # The other search already expanded this node, and mu already
+        # accounts for the best path through it
+        if closed[current] & other_side:
+            continue
+        closed[current] |= side
+        if observer and observer('active', current):
+            return (parents, current, expanded, peak_frontier, True)
+        expanded += 1
+
+        # Relax the edge to each valid neighbor node
+        for neighbor in maze.neighbors(current):
+            # Moving forwards costs the node moved into, and moving
+            # backwards costs the node moved out of
+            if forward:
+                cost = costs[current] + step_costs[cells[neighbor]]
+            else:
+                cost = costs[current] + step_costs[cells[current]]
+            if cost >= costs[neighbor]:
+                continue
+            # A cheaper path to the neighbor was found
+            costs[neighbor] = cost
+            links[neighbor] = current
+            # Check for a cheaper path through the neighbor
+            if cost + other_costs[neighbor] < mu:
+                mu = cost + other_costs[neighbor]
+                meet = neighbor
+            # Nodes expanded by the other search don't need expanding again
+            if closed[neighbor] & other_side:
+                continue
+            priority = (cost + manhattan_distance(maze, neighbor, target),
+                        -cost)
+            if neighbor in queue:
+                queue.update(neighbor, priority)
+            else:
+                queue.push(neighbor, priority)
+            if observer:
+                observer('neighbor', neighbor)
+        if observer:
+            observer('visited', current)
+        peak_frontier = max(peak_frontier, len(forwards) + len(backwards))
+
+    if meet == -1:
+        # As in bidirectional_bfs(), report the maze as unsolved
+        return (parents, start, expanded, peak_frontier, False)
+    join_paths(parents, children, meet)
+    return (parents, end, expanded, peak_frontier, False)
+
+
+def fill_jumps(maze: grid.Grid, parents, end: int) -> None:
+    """
+    Links up the nodes skipped over by a jump point search.
+    `parents` leads from `end` back to the start node one jump point at a
+    time, where every jump is a straight line. The nodes in between are
+    linked too, so `grid.build_path(parents, end)` returns every node.
+    """
+    index = end
+    while parents[index] != -1:
+        parent = parents[index]
+        if abs(index - parent) < maze.width:   # Horizontal jump
+            step = 1 if parent > index else -1
+        else:                                  # Vertical jump
+            step = maze.width if parent > index else -maze.width
+        while index + step != parent:
+            parents[index] = index + step
+            index += step
+        parents[index] = parent
+        index = parent
+
+
+def jump_point_search(maze: grid.Grid, start: int, end: int,
+                      observer=None, queue_class=pq.UpdateableQueue) -> tuple:
+    """
+    Finds the solution to the maze using Jump Point Search, an A* variant for
+    grids where every move costs the same.
+
+    Instead of queueing every neighbor of a node, the search scans in a
+    straight line until it reaches a jump point: the end node, a node beside
+    a wall corner that a path may have to turn around, or (when scanning
+    vertically) a node from which a horizontal scan finds a jump point. Only
+    jump points are queued and expanded, so the many equally short paths
+    across open areas aren't all explored. Paths are still optimal.
+
+    Scanning vertically means scanning horizontally from every node on the
+    way, so horizontal scans don't step through nodes one by one. Instead,
+    the nodes where a scan of a row would stop are marked in a byte string
+    the first time the row is scanned in a direction, and each scan is a
+    `find()` for the next mark or wall.
+
+    Terrain costs break the straight line symmetry that the search relies on,
+    so mazes with mud or water are solved with `astar()` instead.
+    `queue_class` works like in `dijkstra()`, and is passed on to `astar()`.
+    Returns the same tuple as `bfs_dfs()`.
+    """
+    if maze.is_weighted():
+        return astar(maze, start, end, observer=observer,
+                     queue_class=queue_class)
+
+    width = maze.width
+    height = maze.height
+    cells = maze.cells
+    parents = array('l', [-1]) * maze.size
+    # Cost of the best known path from the start node to each jump point
+    costs = array('d', [float('inf')]) * maze.size
+    costs[start] = 0
+    expanded = 0
+    peak_frontier = 1
+    current = start
+
+    def is_open(x: int, y: int) -> bool:
+        """Returns `True` if `(x, y)` is an in-bound, non-wall node."""
+        return (0 <= x < width and 0 <= y < height and
+                cells[y*width+x] != grid.WALL)
+
+    # Nodes that force a turn, marked with a 1 in a byte per node of a row,
+    # keyed by (y, dx) once the row has been scanned in direction dx
+    forced_rows = {}
+
+    def forced_row(y: int, dx: int) -> bytes:
+        """
+        Returns the marks of the nodes of row `y` that a scan in direction
+        `dx` has to stop at: open nodes with an open node above or below
+        them that has a wall (or the edge of the maze) behind it.
+        """
+        row = y * width
+        nodes = int.from_bytes(cells[row:row+width].translate(OPEN_NODES),
+                               'little')
+        forced = 0
+        for side in (y-1, y+1):
+            if not 0 <= side < height:
+                continue
+            start = side * width
+            beside = int.from_bytes(
+                cells[start:start+width].translate(OPEN_NODES), 'little')
+            # Move each node's byte onto the node in front of it
+            behind = beside << 8 if dx == 1 else beside >> 8
+            forced |= beside & ~behind
+        marks = (nodes & forced).to_bytes(width, 'little')
+        forced_rows[y, dx] = marks
+        return marks
+
+    def scan_row(x: int, y: int, dx: int) -> int:
+        """
+        Scans horizontally from `(x, y)` in the direction `dx`.
+        Returns the index of the next jump point, or `-1` if a wall or the
+        edge of the maze is reached first.
+        """
+        row = y * width
+        # The nodes the scan may reach are the ones before the next wall
+        if dx == 1:
+            wall = cells.find(grid.WALL, row+x+1, row+width)
+            first, last = x+1, (width if wall == -1 else wall-row)
+        else:
+            wall = cells.rfind(grid.WALL, row, row+x)
+            first, last = (0 if wall == -1 else wall-row+1), x
+        if first == last:
+            return -1
+        marks = forced_rows.get((y, dx)) or forced_row(y, dx)
+        if dx == 1:
+            found = marks.find(1, first, last)
+        else:
+            found = marks.rfind(1, first, last)
+        # The end node is a jump point too, if it's nearer than the mark
+        if row+first <= end < row+last and (
+                found == -1 or (end-row - found) * dx < 0):
+            return end
+        return -1 if found == -1 else row + found
+
+    def jump(x: int, y: int, dx: int, dy: int) -> int:
+        """
+        Scans from `(x, y)` in the direction `(dx, dy)`.
+        Returns the index of the next jump point, or `-1` if a wall or the
+        edge of the maze is reached first.
+        """
+        if dx:
+            return scan_row(x, y, dx)
+        while True:
+            y += dy
+            if not is_open(x, y):
+                return -1
+            index = y*width + x
+            if index == end:
+                return index
+            # A wall behind an open node left or right forces a turn
+            if ((is_open(x-1, y) and not is_open(x-1, y-dy)) or
+                    (is_open(x+1, y) and not is_open(x+1, y-dy))):
+                return index
+            # Stop if a jump point can be reached horizontally
+            if scan_row(x, y, 1) != -1 or scan_row(x, y, -1) != -1:
+                return index
+
+    # Queue keys are node indexes, priorities are (f, -g) tuples like astar()
+    queue = queue_class()
+    queue.push(start, (manhattan_distance(maze, start, end), 0))
+
+    # As long as the queue isn't empty:
+    while len(queue) > 0:
+        # Get the jump point with the lowest f
+        current = queue.pop()[0]
+        # Check to see if it's the end node
+        if current == end:
+            break
+        if observer and observer('active', current):
+            return (parents, current, expanded, peak_frontier, True)
+        expanded += 1
+
+        # Only scan in the directions a path through this node can take:
+        # every direction from the start node, otherwise onwards or sideways
+        x, y = current % width, current // width
+        parent = parents[current]
+        if parent == -1:
+            directions = ((0, -1), (1, 0), (0, 1), (-1, 0))
+        elif abs(current - parent) < width:
+            dx = 1 if current > parent else -1
+            directions = ((0, -1), (dx, 0), (0, 1))
+        else:
+            dy = 1 if current > parent else -1
+            directions = ((-1, 0), (0, dy), (1, 0))
+
+        for dx, dy in directions:
+            jump_point = jump(x, y, dx, dy)
+            if jump_point == -1:
+                continue
+            cost = costs[current] + manhattan_distance(maze, current,
+                                                       jump_point)
+            if cost >= costs[jump_point]:
+                continue
+            # A cheaper path to the jump point was found
+            costs[jump_point] = cost
+            parents[jump_point] = current
+            priority = (cost + manhattan_distance(maze, jump_point, end),
+                        -cost)
+            if jump_point in queue:
+                queue.update(jump_point, priority)
+            else:
+                queue.push(jump_point, priority)
+            if observer:
+                observer('neighbor', jump_point)
+        if observer:
+            observer('visited', current)
+        peak_frontier = max(peak_frontier, len(queue))
+
+    if current == end:
+        fill_jumps(maze, parents, end)
+    return (parents, current, expanded, peak_frontier, False)
+
+
+def jps_plus(maze: grid.Grid, start: int, end: int, observer=None,
+             queue_class=pq.UpdateableQueue) -> tuple:
+    """
+    Finds the solution to the maze using JPS+, a Jump Point Search that
+    reads the distance to the next jump point from the maze's precomputed
+    `jump_table.JumpTable` instead of scanning for it. The table is built on
+    the first solve, and reused until a cell of the maze is changed.
+
+    The end node can't be precomputed, so it's found while reading the table:
+    if the end node is within the distance read in some direction, the search
+    jumps straight to it, or when moving vertically, to the node level with it.
+    Like `jump_point_search()`, mazes with mud or water are solved with
+    `astar()` instead. `queue_class` works like in `dijkstra()`, and is
+    passed on to `astar()`.
+    Returns the same tuple as `bfs_dfs()`.
+    """
+    if maze.is_weighted():
+        return astar(maze, start, end, observer=observer,
+                     queue_class=queue_class)
+
+    width = maze.width
+    distances = jump_table.get(maze).distances
+    parents = array('l', [-1]) * maze.size
+    # Cost of the best known path from the start node to each jump point
+    costs = array('d', [float('inf')]) * maze.size
+    costs[start] = 0
+    end_x, end_y = end % width, end // width
+    expanded = 0
+    peak_frontier = 1
+    current = start
+    # Index offset of a single step in each direction of the table
+    steps = {jump_table.UP: -width, jump_table.RIGHT: 1,
+             jump_table.DOWN: width, jump_table.LEFT: -1}
+
+    # Queue keys are node indexes, priorities are (f, -g) tuples like astar()
+    queue = queue_class()
+    queue.push(start, (manhattan_distance(maze, start, end), 0))
+
+    # As long as the queue isn't empty:
+    while len(queue) > 0:
+        # Get the jump point with the lowest f
+        current = queue.pop()[0]
+        # Check to see if it's the end node
+        if current == end:
+            break
+        if observer and observer('active', current):
+            return (parents, current, expanded, peak_frontier, True)
+        expanded += 1
+
+        # Only follow the directions a path through this node can take,
+        # as in jump_point_search()
+        x, y = current % width, current // width
+        parent = parents[current]
+        if parent == -1:
+            directions = (jump_table.UP, jump_table.RIGHT,
+                          jump_table.DOWN, jump_table.LEFT)
+        elif abs(current - parent) < width:
+            directions = (jump_table.UP, jump_table.DOWN,
+                          jump_table.RIGHT if current > parent
+                          else jump_table.LEFT)
+        else:
+            directions = (jump_table.LEFT, jump_table.RIGHT,
+                          jump_table.DOWN if current > parent
+                          else jump_table.UP)
+
+        for direction in directions:
+            distance = distances[current*4 + direction]
+            reach = abs(distance)
+            step = steps[direction]
+            # Number of moves to the end node's row (when moving vertically)
+            # or to the end node (when moving horizontally along its row)
+            if direction in (jump_table.UP, jump_table.DOWN):
+                ahead = end_y - y if step > 0 else y - end_y
+            elif y == end_y:
+                ahead = end_x - x if step > 0 else x - end_x
+            else:
+                ahead = 0
+            if 0 < ahead <= reach:
+                # Jump to the end node, or to the node level with it
+                moves = ahead
+            elif distance > 0:
+                moves = distance
+            else:
+                continue
+            jump_point = current + moves * step
+            cost = costs[current] + moves
+            if cost >= costs[jump_point]:
+                continue
+            # A cheaper path to the jump point was found
+            costs[jump_point] = cost
+            parents[jump_point] = current
+            priority = (cost + manhattan_distance(maze, jump_point, end),
+                        -cost)
+            if jump_point in queue:
+                queue.update(jump_point, priority)
+            else:
+                queue.push(jump_point, priority)
+            if observer:
+                observer('neighbor', jump_point)
+        if observer:
+            observer('visited', current)
+        peak_frontier = max(peak_frontier, len(queue))
+
+    if current == end:
+        fill_jumps(maze, parents, end)
+    return (parents, current, expanded, peak_frontier, False)
+
+
+def lpa_star(maze: grid.Grid, start: int, end: int, observer=None) -> tuple:
+    """
+    Finds the cheapest solution to the maze using Lifelong Planning A*.
+    The search state is kept on the maze between solves, so solving again
+    after some cells were changed with `grid.Grid.set_cell()` only searches
+    the nodes affected by the change. See `incremental.LPAStar`.
+    Returns the same tuple as `bfs_dfs()`, where `expanded` only counts the
+    nodes searched by this solve, and `parents` is `None` if the maze wasn't
+    solved.
+    """
+    planner = incremental.get_planner(maze, start, end)
+    expanded, peak_frontier, interrupted = (
+        planner.compute_shortest_path(observer))
+    parents = None if interrupted else planner.parents()
+    if parents is None:
+        return (None, start, expanded, peak_frontier, interrupted)
+    return (parents, end, expanded, peak_frontier, False)
+
+
+def hpa_star(maze: grid.Grid, start: int, end: int, observer=None,
+             queue_class=pq.UpdateableQueue) -> tuple:
+    """
+    Finds a solution to the maze using Hierarchical Pathfinding A* (HPA*).
+
+    The search runs on the maze's `hierarchy.Hierarchy`, a small graph of the
+    entrances between clusters of nodes. Its clusters are linked as the
+    search first reaches them, and only linked again once they change,
+    so later solves reuse the links of earlier ones. The start and end nodes
+    are linked into it with a search of their own clusters, A* finds a path
+    through the entrances, and each step of that path is then refined into
+    nodes with a search inside a single cluster.
+
+    Only entrance nodes are reported to the observer. As a path has to cross
+    each border through an entrance, solutions are close to, but not always
+    exactly, the cheapest. `queue_class` is the queue of the search through
+    the entrances, like in `dijkstra()`.
+    Returns the same tuple as `bfs_dfs()`, where `parents` is `None` if the
+    maze wasn't solved.
+    """
+    abstraction = hierarchy.get_hierarchy(maze)
+    start_cluster = abstraction.cluster_of(start)
+    end_cluster = abstraction.cluster_of(end)
+
+    # Link the start node to the entrances of its cluster,
+    # and the entrances of the end node's cluster to the end node
+    from_start, _, expanded = hierarchy.local_search(
+        maze, start, abstraction.bounds(start_cluster))
+    to_end, _, end_expanded = hierarchy.local_search(
+        maze, end, abstraction.bounds(end_cluster), reverse=True)
+    expanded += end_expanded
+    start_links = [(node, from_start[node]) for node in
+                   abstraction.cluster_nodes(start_cluster)
+                   if node in from_start]
+    if end in from_start:
+        start_links.append((end, from_start[end]))
+    end_links = {node: to_end[node] for node in
+                 abstraction.cluster_nodes(end_cluster) if node in to_end}
+
+    # A* over the entrance nodes
+    abstract_parents = {start: -1}
+    costs = {start: 0}
+    peak_frontier = 1
+    current = start
+    queue = queue_class()
+    queue.push(start, (manhattan_distance(maze, start, end), 0))
+    while len(queue) > 0:
+        current = queue.pop()[0]
+        if current == end:
+            break
+        if observer and observer('active', current):
+            return (None, current, expanded, peak_frontier, True)
+        expanded += 1
+        links = abstraction.links(current)
+        if current == start:
+            links = links + start_links
+        if current in end_links:
+            links = links + [(end, end_links[current])]
+        for node, step in links:
+            cost = costs[current] + step
+            if cost >= costs.get(node, float('inf')):
+                continue
+            costs[node] = cost
+            abstract_parents[node] = current
+            priority = (cost + manhattan_distance(maze, node, end), -cost)
+            if node in queue:
+                queue.update(node, priority)
+            else:
+                queue.push(node, priority)
+            if observer:
+                observer('neighbor', node)
+        if observer:
+            observer('visited', current)
+        peak_frontier = max(peak_frontier, len(queue))
+
+    if current != end:
+        return (None, start, expanded, peak_frontier, False)
+
+    # Refine each step of the abstract path into nodes
+    abstract_path = grid.build_path(abstract_parents, end)
+    path = [start]
+    for node, next_node in zip(abstract_path, abstract_path[1:]):
+        cluster = abstraction.cluster_of(node)
+        if cluster != abstraction.cluster_of(next_node):
+            # Across an entrance
+            path.append(next_node)
+            continue
+        local_parents, local_expanded = hierarchy.local_search(
+            maze, node, abstraction.bounds(cluster), {next_node})[1:]
+        expanded += local_expanded
+        path.extend(grid.build_path(local_parents, next_node)[1:])
+    # Cut out any loops made where refined steps cross each other
+    parents = array('l', [-1]) * maze.size
+    positions = {}
+    trimmed = []
+    for index in path:
+        if index in positions:
+            for dropped in trimmed[positions[index]+1:]:
+                del positions[dropped]
+            del trimmed[positions[index]+1:]
+            continue
+        positions[index] = len(trimmed)
+        trimmed.append(index)
+    for parent, index in zip(trimmed, trimmed[1:]):
+        parents[index] = parent
+    return (parents, end, expanded, peak_frontier, False)
+
+
+def junction_astar(maze: grid.Grid, start: int, end: int,
+                   observer=None, queue_class=pq.UpdateableQueue) -> tuple:
+    """
+    Finds the cheapest solution to the maze using A* on the maze's
+    `junctions.JunctionGraph`, where every corridor is a single link between
+    the junctions or dead ends at its ends. The graph is built on the first
+    solve, and reused until the maze changes.
+
+    The start and end nodes are linked to the ends of the corridors they are
+    in. Only they, the junctions and the dead ends are reported to the
+    observer, and corridors are expanded into nodes for the solution path.
+    `queue_class` works like in `dijkstra()`.
+    Returns the same tuple as `bfs_dfs()`.
+    """
+    graph = junctions.get(maze)
+    start_links = graph.entry_links(start)
+    end_links = graph.exit_links(end)
+    direct = graph.direct_link(start, end)
+    if direct:
+        start_links = start_links + [direct]
+
+    # Link taken into each node of the graph, and the node it was taken from
+    via = {start: None}
+    costs = {start: 0}
+    expanded = 0
+    peak_frontier = 1
+    current = start
+    queue = queue_class()
+    queue.push(start, (manhattan_distance(maze, start, end), 0))
+    while len(queue) > 0:
+        current = queue.pop()[0]
+        if current == end:
+            break
+        if observer and observer('active', current):
+            return (array('l', [-1]) * maze.size, current, expanded,
+                    peak_frontier, True)
+        expanded += 1
+        links = start_links if current == start else graph.links.get(
+            current, [])
+        if current in end_links:
+            links = links + [end_links[current]]
+        for link in links:
+            node = link[0]
+            # Every step costs at least 1, so the Manhattan distance
+            # never overestimates a corridor's cost
+            cost = costs[current] + link[1]
+            if cost >= costs.get(node, float('inf')):
+                continue
+            costs[node] = cost
+            via[node] = (current, link)
+            priority = (cost + manhattan_distance(maze, node, end), -cost)
+            if node in queue:
+                queue.update(node, priority)
+            else:
+                queue.push(node, priority)
+            if observer:
+                observer('neighbor', node)
+        if observer:
+            observer('visited', current)
+        peak_frontier = max(peak_frontier, len(queue))
+
+    parents = array('l', [-1]) * maze.size
+    if current != end:
+        return (parents, start, expanded, peak_frontier, False)
+    # Expand the links of the solution back into nodes
+    node = end
+    while via[node]:
+        previous, link = via[node]
+        parent = previous
+        for index in graph.expand(previous, link):
+            parents[index] = parent
+            parent = index
+        node = previous
+    return (parents, end, expanded, peak_frontier, False)
+
+
+# Algorithm functions, keyed by the names accepted by solve()
+ALGORITHMS = {
+    'bfs': bfs_dfs,
+    'dfs': lambda maze, start, end, **options: bfs_dfs(
+        maze, start, end, depth_first=True, **options),
+    'bitbfs': bit_parallel_bfs,
+    'deadend': lambda maze, start, end, observer=None: bfs_dfs(
+        maze, start, end, observer=observer, dead_end_filling=True),
+    'dijkstra': dijkstra,
+    'astar': astar,
+    'bibfs': bidirectional_bfs,
+    'biastar': bidirectional_astar,
+    'jps': jump_point_search,
+    'jpsplus': jps_plus,
+    'lpastar': lpa_star,
+    'hpastar': hpa_star,
+    'junctions': junction_astar,
+    # Without NumPy, these fall back to the pure Python algorithms
+    'npbfs': wavefront.bfs if wavefront.AVAILABLE else bfs_dfs,
+    'npdijkstra': wavefront.dijkstra if wavefront.AVAILABLE else astar,
+}
+
+# Algorithms that can be given a priority queue class
+QUEUE_ALGORITHMS = ('dijkstra', 'astar', 'biastar', 'jps', 'jpsplus',
+                    'hpastar', 'junctions')
+
+# Algorithms that can fill in dead ends before searching (see fill_dead_ends())
+DEAD_END_ALGORITHMS = ('bfs', 'dfs', 'astar')
+
+# Algorithms whose parent links are taken from buffers.POOL
+POOLED_ALGORITHMS = ('bfs', 'dfs', 'deadend', 'dijkstra', 'astar')
+
+
+def solve(maze: grid.Grid, start: int = None, end: int = None,
+          algorithm: str = 'bfs', observer=None, queue: str = None,
+          check_connected: bool = False,
+          dead_end_filling: bool = False) -> SolveResult:
+    """
+    Solves a maze without a GUI.
+
+    Args:
+        `maze` (grid.Grid): The maze to solve.
+        `start` (int: Optional): Index of the start node.
+            Defaults to `maze.start`.
+        `end` (int: Optional): Index of the end node. Defaults to `maze.end`.
+        `algorithm` (str: Optional): One of the keys of `ALGORITHMS`.
+        `observer` (callable: Optional): Called as `observer(event, index)`
+            for every step of the search. See this module's docstring.
+        `queue` (str: Optional): One of the keys of `pq.QUEUES`, the priority
+            queue to use. Only the algorithms in `QUEUE_ALGORITHMS` take one.
+        `check_connected` (bool: Optional): If `True`, the start and end
+            nodes are looked up in the maze's `connectivity.Connectivity`
+            index first, and if no path connects them, the maze is returned
+            unsolved without searching it. Building the index takes about as
+            long as a BFS of the whole maze, and it's kept up to date on the
+            maze after that, so this pays off when a maze is solved many
+            times, or is often unsolvable.
+        `dead_end_filling` (bool: Optional): If `True`, dead ends are filled
+            in before searching (see `fill_dead_ends()`). Only the
+            algorithms in `DEAD_END_ALGORITHMS` can do this.
+
+    Raises a `ValueError` if the algorithm or queue is unknown, if the
+    algorithm doesn't take a queue or fill in dead ends when asked to, or if
+    the maze has no start or end node.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f'Unknown algorithm {algorithm!r}, expected one of '
+                         f'{", ".join(ALGORITHMS)}')
+    options = {}
+    if queue is not None:
+        if queue not in pq.QUEUES:
+            raise ValueError(f'Unknown queue {queue!r}, expected one of '
+                             f'{", ".join(pq.QUEUES)}')
+        if algorithm not in QUEUE_ALGORITHMS:
+            raise ValueError(f'The {algorithm} algorithm doesn\'t take a '
+                             f'queue, only {", ".join(QUEUE_ALGORITHMS)} do')
+        options['queue_class'] = pq.QUEUES[queue]
+    if dead_end_filling:
+        if algorithm not in DEAD_END_ALGORITHMS:
+            raise ValueError(f'The {algorithm} algorithm can\'t fill in dead '
+                             f'ends, only {", ".join(DEAD_END_ALGORITHMS)} '
+                             f'can')
+        options['dead_end_filling'] = True
+    start = maze.start if start is None else start
+    end = maze.end if end is None else end
+    if start is None or end is None:
+        raise ValueError('The maze needs a start and an end node')
+
+    started = perf_counter()
+    if check_connected and not connectivity.get_connectivity(maze).connected(
+            start, end):
+        return SolveResult(algorithm, None, 0, 0, perf_counter() - started)
+    parents, current, expanded, peak_frontier, interrupted = (
+        ALGORITHMS[algorithm](maze, start, end, observer=observer, **options))
+    wall_time = perf_counter() - started
+
+    path = None
+    cost = None
+    if current == end and not interrupted:
+        path = grid.build_path(parents, end)
+        cost = maze.path_cost(path)
+    if algorithm in POOLED_ALGORITHMS:
+        buffers.POOL.give_back(parents)
+    return SolveResult(algorithm, path, expanded, peak_frontier, wall_time,
+                       interrupted, cost)
@@ -0,0 +1,175 @@
+"""
+Vectorized wavefront solvers, for solving large mazes without the GUI.
+
+The maze is read into NumPy arrays: a mask of the open nodes, the terrain cost
+of every node, and a distance field. Instead of taking nodes off a queue one
+at a time, each step of a search takes a whole wavefront of nodes, held as an
+array of node indexes, and finds all of their neighbors at once by shifting
+the indexes one node up, right, down and left.
+
+NumPy is optional. If it isn't installed, `AVAILABLE` is `False`, and
+`solver.solve()` runs the pure Python algorithms in place of these.
+"""
+# Compact parent links, like the other solvers return
+from array import array
+# Grid model and terrain costs
+from modules import grid
+# Optional, the solvers in this module are skipped without it
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# True if NumPy is installed, and the solvers in this module can be used
+AVAILABLE = numpy is not None
+
+# Distance of nodes that haven't been reached
+UNREACHED = 2**62
+
+
+def cell_array(maze: grid.Grid):
+    """Returns the cells of the maze as a flat array."""
+    return numpy.frombuffer(bytes(maze.cells), dtype=numpy.uint8)
+
+
+def open_mask(maze: grid.Grid):
+    """
+    Returns a flat boolean array, `True` for every node of the maze that
+    isn't a wall.
+    """
+    return cell_array(maze) != grid.WALL
+
+
+def neighbors(nodes, maze: grid.Grid, free) -> tuple:
+    """
+    Returns a tuple of `(neighbors, sources)` arrays, holding every open
+    neighbor of the nodes in `nodes`, and the node it's a neighbor of.
+    """
+    width = maze.width
+    x = nodes % width
+    moves = ((nodes >= width, -width),              # up
+             (x != width-1, 1),                     # right
+             (nodes < maze.size-width, width),      # down
+             (x != 0, -1))                          # left
+    sources = numpy.concatenate([nodes[valid] for valid, _ in moves])
+    found = numpy.concatenate([nodes[valid]+step for valid, step in moves])
+    keep = free[found]
+    return (found[keep], sources[keep])
+
+
+def report(observer, nodes, wave: int) -> bool:
+    """
+    Reports a wavefront of nodes to the observer as `'visited'`, followed
+    by a `'wave'` event.
+    Returns `True` if the observer interrupts the search.
+    """
+    for index in nodes.tolist():
+        observer('visited', index)
+    return bool(observer('wave', wave))
+
+
+def path_parents(parents, maze: grid.Grid, start: int, end: int):
+    """
+    Copies the parent links along the path from the end node back to the
+    start node into an array, for `grid.build_path()`.
+    """
+    links = array('l', [-1]) * maze.size
+    current = end
+    while current != start:
+        links[current] = current = int(parents[current])
+    return links
+
+
+def bfs(maze: grid.Grid, start: int, end: int, observer=None) -> tuple:
+    """
+    Finds the solution with the fewest moves, moving a breadth-first
+    wavefront a whole layer at a time.
+    Returns the same tuple as `solver.bfs_dfs()`.
+    """
+    free = open_mask(maze)
+    visited = numpy.zeros(maze.size, dtype=bool)
+    visited[start] = True
+    parents = numpy.full(maze.size, -1, dtype=numpy.int64)
+    frontier = numpy.array([start], dtype=numpy.int64)
+    layers = 0
+    expanded = 1
+    peak_frontier = 1
+    while not visited[end]:
+        found, sources = neighbors(frontier, maze, free)
+        fresh = ~visited[found]
+        found, sources = found[fresh], sources[fresh]
+        parents[found] = sources
+        # A node found from more than one node of the wavefront keeps
+        # whichever parent was written last, and is only kept once
+        frontier = found[parents[found] == sources]
+        if not frontier.size:
+            return (array('l', [-1]) * maze.size, start, expanded,
+                    peak_frontier, False)
+        visited[frontier] = True
+        layers += 1
+        expanded += frontier.size
+        peak_frontier = max(peak_frontier, frontier.size)
+        if observer and report(observer, frontier, layers):
+            return (array('l', [-1]) * maze.size, start, expanded,
+                    peak_frontier, True)
+    return (path_parents(parents, maze, start, end), end, expanded,
+            peak_frontier, False)
+
+
+def dijkstra(maze: grid.Grid, start: int, end: int, observer=None) -> tuple:
+    """
+    Finds the cheapest solution, honouring terrain costs, by settling every
+    node of the same distance from the start node at once.
+
+    Terrain costs are small whole numbers, so nodes are kept in buckets by
+    distance, and each step settles the nodes of the nearest bucket and puts
+    their neighbors in the buckets further along (Dial's algorithm).
+    Returns the same tuple as `solver.bfs_dfs()`.
+    """
+    cells = cell_array(maze)
+    free = cells != grid.WALL
+    step_costs = numpy.array(grid.COSTS, dtype=numpy.int64)[cells]
+    distances = numpy.full(maze.size, UNREACHED, dtype=numpy.int64)
+    distances[start] = 0
+    settled = numpy.zeros(maze.size, dtype=bool)
+    parents = numpy.full(maze.size, -1, dtype=numpy.int64)
+    # Arrays of nodes, keyed by their distance from the start node
+    buckets = {0: [numpy.array([start], dtype=numpy.int64)]}
+    waves = 0
+    expanded = 0
+    peak_frontier = 1
+    while buckets:
+        distance = min(buckets)
+        nodes = numpy.concatenate(buckets.pop(distance))
+        # Skip nodes that were since found to be cheaper to reach
+        nodes = numpy.unique(nodes[(distances[nodes] == distance) &
+                                   ~settled[nodes]])
+        if not nodes.size:
+            continue
+        settled[nodes] = True
+        if settled[end]:
+            return (path_parents(parents, maze, start, end), end, expanded,
+                    peak_frontier, False)
+        waves += 1
+        expanded += nodes.size
+        if observer and report(observer, nodes, waves):
+            return (array('l', [-1]) * maze.size, start, expanded,
+                    peak_frontier, True)
+
+        found, sources = neighbors(nodes, maze, free)
+        costs = distance + step_costs[found]
+        better = costs < distances[found]
+        found, sources, costs = found[better], sources[better], costs[better]
+        numpy.minimum.at(distances, found, costs)
+        # Keep the cheapest way into each node
+        cheapest = costs == distances[found]
+        found, sources, costs = (found[cheapest], sources[cheapest],
+                                 costs[cheapest])
+        parents[found] = sources
+        for cost in numpy.unique(costs).tolist():
+            buckets.setdefault(cost, []).append(found[costs == cost])
+        peak_frontier = max(peak_frontier, sum(
+            bucket.size for queued in buckets.values() for bucket in queued))
+    return (array('l', [-1]) * maze.size, start, expanded, peak_frontier,
+            False)
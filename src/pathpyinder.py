@@ -1,13 +1,30 @@
+# Used to read command-line arguments
+import sys
+# Run from the command line if a command is given, before the GUI (and Tk)
+# is imported, e.g. `python -m pathpyinder solve ../mazes/*.txt --algo astar`
+if __name__ == '__main__' and len(sys.argv) > 1:
+    # Command-line interface for solving mazes without the GUI
+    from modules import cli
+    sys.exit(cli.main(sys.argv[1:]))
+
 # Gui wrapper library for tkinter
 from modules import PySimpleGUI as sg
-# Data structure used in A* algorithm
-from modules import priority_queue as pq
-# Data structure used as a queue/stack for BFS/DFS algorithms
-from collections import deque
+# Compact grid model that stores the state of every node
+from modules import grid
+# Headless pathfinding algorithms
+from modules import solver
+# Precomputed jump distances, saved next to maze files
+from modules import jump_table
+# Connected components, used to reject unsolvable mazes before solving
+from modules import connectivity
+# Batches node changes into display frames while solving
+from modules import render
+# Compact per-node arrays used by the maze graph
+from array import array
+# Image that large mazes are drawn into
+from tkinter import PhotoImage
 # Used to slow down pathfinding algos
 from time import sleep
-# Used in maze generation
-from random import choice as random_choice
 # Used to read and write settings.cfg
 from json import (load as jsonload, dump as jsondump)
 # Used to read and write settings.cfg
@@ -30,12 +47,36 @@ OS = operating_system
 MAZE_WIDTH = 51
 MAZE_HEIGHT = 51
 NODE_SIZE = 10
+# Mazes with more nodes than this are drawn as a single image
+RASTER_THRESHOLD = 100000
+# Largest width and height of that image, in pixels. Nodes are drawn smaller
+# than NODE_SIZE, down to a pixel each, to fit.
+RASTER_MAX_SIDE = 4096
 
-NODES = {}         # Dictionary of nodes in the grid with (x,y) tuples as keys
+GRID = None        # Instance of grid.Grid. Stores the state of every node
 START_NODE = None  # Instance of Node. The node from which the algorithm starts
 END_NODE = None    # Instance of Node. The node at which the maze is 'solved'
 
 ALGO = 'Breadth-First Search'   # Pathfinding algorithm to use.
+ALGORITHMS = {                  # Algorithm names and their solver.solve() keys
+    'Breadth-First Search': 'bfs',
+    'Depth-First Search': 'dfs',
+    'Bit-Parallel BFS': 'bitbfs',
+    'Dead-End Filling': 'deadend',
+    'Dijkstra': 'dijkstra',
+    'A* (A Star)': 'astar',
+    'Bidirectional BFS': 'bibfs',
+    'Bidirectional A*': 'biastar',
+    'Jump Point Search': 'jps',
+    'JPS+': 'jpsplus',
+    'LPA* (Replanning)': 'lpastar',
+    'HPA* (Hierarchical)': 'hpastar',
+    'Junction Graph A*': 'junctions',
+}
+# Algorithms that keep their search state after solving, and repair the
+# solution as the maze is edited instead of waiting for a reset
+INCREMENTAL_ALGORITHMS = ('lpastar',)
+REPLANNING = False              # True while edits repair the last solution
 MODE = 'wall'                   # None, 'wall', 'path', 'start', 'end'
 TEMP_DELAY = None               # Temporary variable to store original DELAY
 DELAY = 0                       # Algorithm iteration delay (in milliseconds)
@@ -49,16 +90,23 @@ PAUSED = False                  # Flipped if the pause button is clicked
 LOOP_COUNT = 0
 LOOP_CHECK = 0
 
+# Node changes made while solving are queued and drawn once per display frame
+# At the highest speed, user input is also only checked once per frame
+RENDER_QUEUE = None             # Instance of render.RenderQueue
+
 
 COLORS = {                      # Dictionary of colors to use in Node.style()
     'empty': '#CCCCCC',         # Grey
     'wall': '#003333',          # Black
+    'mud': '#A0825A',           # Brown
+    'water': '#5A8CD2',         # Blue
     'start': '#00CC00',         # Green
     'start_border': '#006000',  # Dark Green
     'end': '#FF3366',           # Red
     'end_border': '#890F1F',    # Dark Red
     'active': '#EFC700',        # Yellow
     'visited': '#999966',       # Olive
+    'filled': '#666655',        # Dark Olive
     'neighbor': '#96E8FF',      # Light Blue
     'solution': '#009900',      # Dark Green
     'error': '#FF6D70',         # Light red
@@ -66,6 +114,10 @@ COLORS = {                      # Dictionary of colors to use in Node.style()
     'white': '#FFFFFF',
 }
 
+# Node colors indexed by cell state: grid.EMPTY, WALL, MUD, WATER
+TERRAIN_COLORS = (COLORS['empty'], COLORS['wall'],
+                  COLORS['mud'], COLORS['water'])
+
 DEFAULT_SETTINGS = {
     "default_maze": "None",
     "default_algorithm": "Breadth-First Search",
@@ -99,27 +151,33 @@ def set_algo(new_algo: str) -> None:
     Valid values for `new_algo` are: 
     `'Breadth-First Search'`: Breadth-first
     `'Depth-First Search'`: Depth-first
+    `'Bit-Parallel BFS'`: Breadth-first, a whole layer of nodes at a time
+    `'Dead-End Filling'`: Breadth-first, after filling in every dead end
     `'Dijkstra'`: Dijkstra
     `'A* (A Star)'`: A*
+    `'Bidirectional BFS'`: Breadth-first from both the start and end nodes
+    `'Bidirectional A*'`: A* from both the start and end nodes
+    `'Jump Point Search'`: A* that only expands jump points
+    `'JPS+'`: Jump Point Search with precomputed jump distances
+    `'LPA* (Replanning)'`: Lifelong Planning A*, which replans as the maze 
+        is edited after solving
+    `'HPA* (Hierarchical)'`: A* over the entrances between clusters of nodes
+    `'Junction Graph A*'`: A* over the junctions linked by the corridors
     """
     global ALGO
     ALGO = new_algo
-    algo_ref = {
-        'Breadth-First Search': 'bfs',
-        'Depth-First Search': 'dfs',
-        'Dijkstra': 'dijkstra',
-        'A* (A Star)': 'astar',
-    }
     # Select the appropriate radio
-    window[f'radio_algo_{algo_ref[new_algo]}'].update(value=True)
+    window[f'radio_algo_{ALGORITHMS[new_algo]}'].update(value=True)
     # Print event
-    print(f"Algorithm set to {algo_ref[new_algo].upper()}")
+    print(f"Algorithm set to {ALGORITHMS[new_algo].upper()}")
     
     
 def set_draw_mode(draw_mode: str) -> None:
     """Establishes a draw mode. Valid values for draw_mode are:
     `'wall'`: Draw walls in the maze by clicking and dragging on the grid.
     `'path'`: Erase walls in the maze by clicking and dragging on the grid.
+    `'mud'`: Draw mud, which costs 3 to cross, by clicking and dragging.
+    `'water'`: Draw water, which costs 5 to cross, by clicking and dragging.
     `'start'`: Click somewhere on the grid to set a start point.
     `'end'`: Click somewhere on the grid to set an end point.
     """
@@ -128,12 +186,16 @@ def set_draw_mode(draw_mode: str) -> None:
     # Depress all draw mode buttons
     window['maze_tools_wall'].update(button_color=('#000', '#f0f0f0'))
     window['maze_tools_path'].update(button_color=('#000', '#f0f0f0'))
+    window['maze_tools_mud'].update(button_color=('#000', '#f0f0f0'))
+    window['maze_tools_water'].update(button_color=('#000', '#f0f0f0'))
     window['maze_tools_start'].update(button_color=('#000', '#f0f0f0'))
     window['maze_tools_end'].update(button_color=('#000', '#f0f0f0'))
     # Windows only button relief styles:
     if OS == 'nt':
         window['maze_tools_wall'].Widget.configure(relief='raised')
         window['maze_tools_path'].Widget.configure(relief='raised')
+        window['maze_tools_mud'].Widget.configure(relief='raised')
+        window['maze_tools_water'].Widget.configure(relief='raised')
         window['maze_tools_start'].Widget.configure(relief='raised')
         window['maze_tools_end'].Widget.configure(relief='raised')
         window['maze_tools_'+draw_mode].Widget.configure(relief='sunken')
@@ -146,12 +208,14 @@ def set_draw_mode(draw_mode: str) -> None:
 def reset() -> None:
     """
     Clears the solution from the maze and sets all nodes' `is_visited`, 
-    and `is_active` flags to `False` via the `Node.reset()` method.
+    and `is_active` flags to `False`. Only the nodes drawn by the last 
+    search are redrawn, via the `Node.reset_node()` method.
     """
     global PAUSED
+    global REPLANNING
     PAUSED = False
-    for node in NODES.values():
-        node.reset_node()
+    REPLANNING = False
+    MAZE.reset_nodes()
     MAZE.clear_solution()
     MAZE.bring_start_and_end_nodes_to_front()
     disable_element('controls_pause')
@@ -167,8 +231,14 @@ def reset() -> None:
 
 def clear() -> None:
     """Empties the entire grid, leaving only path/empty nodes."""
-    for node in NODES.values():
-        node.make_empty_node()
+    global START_NODE
+    global END_NODE
+    global REPLANNING
+    REPLANNING = False
+    GRID.fill(grid.EMPTY)
+    START_NODE = None
+    END_NODE = None
+    MAZE.draw_nodes()
     MAZE.clear_solution()
     disable_element('controls_pause')
     disable_element('controls_next')
@@ -210,7 +280,8 @@ def set_speed(speed: float) -> None:
     elif SPEED == 5:
         DELAY = 0
         TEMP_DELAY = 0
-        LOOP_CHECK = 10
+        # Input is already limited to once per display frame at this speed
+        LOOP_CHECK = 0
     print(f'Delay set to: {DELAY}ms.')
     
 
@@ -275,30 +346,44 @@ def enable_element(sg_key) -> None:
     
     
 def enable_drawing_tools() -> None:
-    """Enables the `wall`, `path`, `start, and `end` buttons in the UI and sets 
-    the draw mode to 'wall'."""
+    """Enables the `wall`, `path`, `mud`, `water`, `start, and `end` buttons 
+    in the UI and sets the draw mode to 'wall'."""
     for button in ['maze_tools_wall', 'maze_tools_path', 
+                   'maze_tools_mud', 'maze_tools_water',
                    'maze_tools_start', 'maze_tools_end']: 
         enable_element(button)
     
     
 def disable_drawing_tools() -> None:
-    """Disables the `wall`, `path`, `start, and `end` buttons in the UI and sets
-    the draw mode to `None`."""
+    """Disables the `wall`, `path`, `mud`, `water`, `start, and `end` buttons 
+    in the UI and sets the draw mode to `None`."""
     for button in ['maze_tools_wall', 'maze_tools_path', 
+                   'maze_tools_mud', 'maze_tools_water',
                    'maze_tools_start', 'maze_tools_end']: 
         window[button].update(disabled=True, button_color=('#000', '#f0f0f0'))
 
 
 def enable_algo_radios() -> None:
     """Enables the algorithm selection radios."""
-    for radio in ['radio_algo_bfs', 'radio_algo_dfs', 'radio_algo_astar']:
+    for radio in ['radio_algo_bfs', 'radio_algo_dfs', 'radio_algo_bitbfs', 
+                  'radio_algo_deadend', 
+                  'radio_algo_dijkstra', 'radio_algo_astar',
+                  'radio_algo_bibfs', 'radio_algo_biastar', 
+                  'radio_algo_jps', 'radio_algo_jpsplus', 
+                  'radio_algo_lpastar', 'radio_algo_hpastar', 
+                  'radio_algo_junctions']:
         enable_element(radio)
 
 
 def disable_algo_radios() -> None:
     """Disables the algorithm selection radios."""
-    for radio in ['radio_algo_bfs', 'radio_algo_dfs', 'radio_algo_astar']:
+    for radio in ['radio_algo_bfs', 'radio_algo_dfs', 'radio_algo_bitbfs', 
+                  'radio_algo_deadend', 
+                  'radio_algo_dijkstra', 'radio_algo_astar',
+                  'radio_algo_bibfs', 'radio_algo_biastar', 
+                  'radio_algo_jps', 'radio_algo_jpsplus', 
+                  'radio_algo_lpastar', 'radio_algo_hpastar', 
+                  'radio_algo_junctions']:
         disable_element(radio)
 
 
@@ -398,6 +483,11 @@ def check_for_input() -> bool:
     """
     global LOOP_COUNT
     global LOOP_CHECK
+    # Without a delay, only draw and check for input once per display frame
+    if DELAY == 0 and not RENDER_QUEUE.frame_is_due():
+        return (False, None)
+    # Draw the node changes queued since the last frame
+    RENDER_QUEUE.flush()
     if LOOP_COUNT > LOOP_CHECK:
         interrupted, event = read_algo_controls(timeout=DELAY)
         if interrupted:
@@ -417,209 +507,6 @@ def check_for_input() -> bool:
     return (False, None)
 
 
-"""
-########  ########  ######       ####       ########  ########  ######
-##     ## ##       ##    ##     ##  ##      ##     ## ##       ##    ##
-##     ## ##       ##            ####       ##     ## ##       ##
-########  ######    ######      ####        ##     ## ######    ######
-##     ## ##             ##    ##  ## ##    ##     ## ##             ##
-##     ## ##       ##    ##    ##   ##      ##     ## ##       ##    ##
-########  ##        ######      ####  ##    ########  ##        ######
-"""
-def bfs_dfs() -> None:
-    """
-    Traverses the maze using a breadth-first or depth-first search algorithm.
-    The two are the same except for the underlying data structure used. 
-    Breadth-first uses a queue (first in, first out).
-    Depth first uses a stack (last in, first out).
-    """
-    global LOOP_COUNT
-    global LOOP_CHECK
-    interrupted = False
-    # use a stack suitable for both bfs and dfs, 
-    # allowing for both lifo and fifo operations
-    stack = deque([])
-    # add the starting node to the stack
-    stack.append(START_NODE)
-    
-    # as long as the stack has a node
-    while stack:
-        # set the top node as the currently active node
-        current_node = stack.pop()
-        current_node.make_active_node()
-        
-        # Checks for and processes user input 
-        # every LOOP_CHECK iterations of this loop
-        interrupted, event = check_for_input()
-        if interrupted:
-            break
-        
-        # flag the current node as active
-        # check if it's the end node
-        if current_node.is_end_node:
-            break
-        # for all valid neighbor nodes:
-        # (in-bound nodes that are not walls, and have not been visited)
-        neighbors = current_node.get_neighbors()
-        if not neighbors:
-            print(f'No neighbors at {current_node.loc}')
-            current_node.make_visited_node()
-        else:
-            for neighbor in neighbors:
-                # mark the neighbor as visited and style as neighbor
-                neighbor.make_neighbor_node()
-                # mark the current node as visited
-                current_node.make_visited_node()
-                # print(f'{current_node.loc} visited.')
-                neighbor.parent = current_node
-                
-                # add the neighbor to a queue
-                if ALGO[0] == 'B': # BFS, use queue: first in, first out
-                    stack.appendleft(neighbor)
-                else: # DFS, use stack: last in, first out
-                    stack.append(neighbor)
-    
-    # Mark the solution path
-    if not interrupted: MAZE.highlight_solution(current_node)
-    # Return false if the window is closing
-    if event in ('Exit', sg.WIN_CLOSED): 
-        return False
-    # Continue as normal
-    return True
-
-
-
-"""
-########  ####       ## ##    ##  ######  ######## ########     ###
-##     ##  ##        ## ##   ##  ##    ##    ##    ##     ##   ## ##
-##     ##  ##        ## ##  ##   ##          ##    ##     ##  ##   ##
-##     ##  ##        ## #####     ######     ##    ########  ##     ##
-##     ##  ##  ##    ## ##  ##         ##    ##    ##   ##   #########
-##     ##  ##  ##    ## ##   ##  ##    ##    ##    ##    ##  ##     ##
-########  ####  ######  ##    ##  ######     ##    ##     ## ##     ##
-"""
-def dijkstra() -> None:
-    """Finds the solution to the maze using Dijkstra's algorithm.
-    """
-    interrupted = False
-    
-    # Initialize an updateable priority queue with the start node, at priority 0
-    # The 'keys' for the queue will be the coordinates for the nodes
-    queue = pq.UpdateableQueue()
-    queue.push(START_NODE.loc, 0)
-    
-    # As long as the queue isn't empty:
-    while queue.__len__() > 0:
-        
-        # Get the highest priority node
-        current_node = NODES[queue.pop()[0]]
-        # Check to see if it's the end node
-        if current_node.is_end_node:
-            break
-        # Mark it as visited
-        current_node.make_active_node()
-        window.refresh()
-        
-        # Checks for and processes user input 
-        # every LOOP_CHECK iterations of this loop
-        interrupted, event = check_for_input()
-        if interrupted:
-            break
-        
-        # Get all valid neighbor nodes of that node
-        neighbors = current_node.get_neighbors()
-        # If there are no neighbors, mark that node as visited
-        if not neighbors:
-            print(f'No neighbors at {current_node.loc}')
-            current_node.make_visited_node()
-        # If there are neighbors,
-        else:
-            # For each neighbor:
-            for neighbor in neighbors:
-                # Mark that neighbor as visited, and color it blue
-                neighbor.make_neighbor_node()
-                # Calculate the distance of that node to the start node
-                min_distance = min(neighbor.distance, current_node.distance + 1)
-                if min_distance != neighbor.distance:
-                    neighbor.distance = min_distance
-                    # Change queue priority for nieghbor since it's now closer
-                    queue.push(neighbor.loc, neighbor.distance)
-                    # Set the current node as the parent node for each neighbor
-                    neighbor.parent = current_node
-        # Mark the current node as visited
-        current_node.make_visited_node()
-            
-    # Mark the solution path
-    if not interrupted: MAZE.highlight_solution(current_node)
-    return True
-
-
-
-"""
-   ###             ######  ########    ###    ########
-  ## ##           ##    ##    ##      ## ##   ##     ##
- ##   ##          ##          ##     ##   ##  ##     ##
-##     ## #######  ######     ##    ##     ## ########
-#########               ##    ##    ######### ##   ##
-##     ##         ##    ##    ##    ##     ## ##    ##
-##     ##          ######     ##    ##     ## ##     ##
-"""
-def astar() -> None:
-    """Finds the solution to the maze using the A-star (A*) algorithm."""
-    interrupted = False
-    
-    # Initialize an updateable priority queue with the start node, at priority 0
-    # The 'keys' for the queue will be the coordinates for the nodes
-    queue = pq.UpdateableQueue()
-    queue.push(START_NODE.loc, 0)
-    
-    # As long as the queue isn't empty:
-    while queue.__len__() > 0:
-        
-        # Get the highest priority node
-        current_node = NODES[queue.pop()[0]]
-        # Check to see if it's the end node
-        if current_node.is_end_node:
-            break
-        # Mark it as visited
-        current_node.make_active_node()
-        window.refresh()
-        
-        # Checks for and processes user input 
-        # every LOOP_CHECK iterations of this loop
-        interrupted, event = check_for_input()
-        if interrupted:
-            break
-        
-        # Get all valid neighbor nodes of that node
-        neighbors = current_node.get_neighbors()
-        # If there are no neighbors, mark that node as visited
-        if not neighbors:
-            print(f'No neighbors at {current_node.loc}')
-            current_node.make_visited_node()
-        # If there are neighbors,
-        else:
-            # For each neighbor:
-            for neighbor in neighbors:
-                # Mark that neighbor as visited, and color it blue
-                neighbor.make_neighbor_node()
-                # Set distance to be distance from the neighbor to end node
-                neighbor.distance = (abs(END_NODE.x - neighbor.x) + 
-                                     abs(END_NODE.y - neighbor.y))
-                # Update the queue with the new distance as the priority 
-                # queue.push() ADDS a new entry, OR UPDATES an existing one
-                queue.push(neighbor.loc, neighbor.distance)
-                # Establish parent node
-                neighbor.parent = current_node
-                
-        # Mark the current node as visited
-        current_node.make_visited_node()
-            
-    # Mark the solution path
-    if not interrupted: MAZE.highlight_solution(current_node)
-    return True
-
-
 """
  ######   #######  ##       ##     ## ######## ########
 ##    ## ##     ## ##       ##     ## ##       ##     ##
@@ -630,10 +517,48 @@ def astar() -> None:
  ######   #######  ########    ###    ######## ##     ##
 """
         
+def replan() -> None:
+    """
+    Repairs the solution after the maze was edited, following a solve with an
+    incremental algorithm. The new solution is drawn without animating it.
+    """
+    if not (START_NODE and END_NODE):
+        MAZE.clear_solution()
+        return
+    result = solver.solve(GRID, algorithm=ALGORITHMS[ALGO])
+    MAZE.redraw_solution(result.path)
+    print(f'Replanned in {result.wall_time*1000:.2f}ms, '
+          f'expanded {result.expanded} nodes.')
+    if not result.solved:
+        print('Maze could not be solved.')
+
+
+def draw_node_state(index: int, state: str) -> None:
+    """Draws a node state queued in `RENDER_QUEUE` while solving."""
+    node = get_node(index)
+    if state == 'active':
+        node.make_active_node()
+    elif state == 'neighbor':
+        node.make_neighbor_node()
+    elif state == 'visited':
+        node.make_visited_node()
+    elif state == 'filled':
+        node.make_filled_node()
+        
+        
 def solve_maze() -> None:
     """Solves the current maze using the selected algorithm."""
     # Check to make sure there's a start and end node
     if START_NODE and END_NODE:
+        # Check that there's a path between them before searching for it
+        components = connectivity.get_connectivity(GRID)
+        if not components.connected(GRID.start, GRID.end):
+            print('Maze could not be solved: the start and end nodes '
+                  'are not connected.')
+            sg.popup('Maze could not be solved.', 
+                     'There is no path between the start and end nodes.')
+            return
+        
         # Disable UI elements that can't be used while solving
         disable_menu(window)
         disable_element('controls_solve')
@@ -647,19 +572,53 @@ def solve_maze() -> None:
         print(f'Solve started via {ALGO.upper()} algorithm.')
         print('*'*40)
         
+        # Last event read from the window while solving
+        last_event = None
+        global RENDER_QUEUE
+        RENDER_QUEUE = render.RenderQueue(draw_node_state)
+        
+        def queue_search_step(step: str, index: int) -> bool:
+            """
+            Queues each step of the search to be drawn as the solver reports 
+            it. Checks for and processes user input whenever a node is 
+            activated, or a wave of nodes has been reported, so algorithms 
+            that report in batches are animated a batch at a time. Returns 
+            `True` to interrupt the solver.
+            """
+            nonlocal last_event
+            if step != 'wave':
+                RENDER_QUEUE.push(index, step)
+            if step in ('active', 'wave'):
+                # Checks for and processes user input 
+                # every LOOP_CHECK iterations of the solver
+                interrupted, last_event = check_for_input()
+                return interrupted
+            return False
+        
         # Run algorithm
-        if ALGO in ('Breadth-First Search', 'Depth-First Search'):
-            # If algorithm returns false, window is closeing
-            if not bfs_dfs():
-                return False
-        elif ALGO == 'Dijkstra':
-            # If algorithm returns false, window is closeing
-            if not dijkstra():
-                return False
-        elif ALGO == 'A* (A Star)':
-            # If algorithm returns false, window is closeing
-            if not astar():
-                return False
+        result = solver.solve(GRID, algorithm=ALGORITHMS[ALGO], 
+                              observer=queue_search_step)
+        # Draw the last frame, unless the maze was reset while solving
+        if result.interrupted:
+            RENDER_QUEUE.clear()
+        else:
+            RENDER_QUEUE.flush()
+        print(f'Expanded {result.expanded} nodes, '
+              f'peak frontier of {result.peak_frontier} nodes.')
+        if result.solved:
+            print(f'Solution path costs {result.cost}.')
+        # If the window is closing
+        if result.interrupted and last_event in ('Exit', sg.WIN_CLOSED):
+            return False
+        # Mark the solution path
+        if not result.interrupted:
+            MAZE.highlight_solution(result.path)
+            # Let the maze be edited, and repair the solution on every edit
+            if ALGORITHMS[ALGO] in INCREMENTAL_ALGORITHMS:
+                global REPLANNING
+                REPLANNING = True
+                enable_drawing_tools()
+                print('Edit the maze to replan the solution.')
             
         # Disable elements that can only be used while solving
         disable_element('controls_pause')
@@ -689,14 +648,13 @@ def solve_maze() -> None:
 def open_maze_file(filename: str) -> bool:
     """
     Loads a maze from a txt file. 
-    Integer values represent nodes types:
-    `'█'`: Path node
-    `' '`: Wall node
+    Characters represent nodes types:
+    `' '`: Path node
+    `'█'`: Wall node
     `'S'`: Start node
     `'E'`: End node
     """
     
-    # TODO: parse maze file and make sure it's valid
     def valid_maze_file(filename: str):
         """Checks for validity of the maze file."""
         if filename and filename != 'None':
@@ -707,42 +665,32 @@ def open_maze_file(filename: str) -> bool:
     if valid_maze_file(filename):
         try:
             print(f'Open maze file: {filename}')
+            # parse the maze file, raises an error if it isn't valid
+            new_grid = grid.load_maze_file(filename)
             # clear out the existing maze
-            clear()
-            
-            # get the width and height of the new maze
-            with open(f'{filename}', 'r', encoding='utf8') as new_maze:
-                # Read the first line
-                # Subtract 1 from line length to account for newline character
-                width = len(new_maze.readline())-1  
-                # Read the total number of lines
-                # add 1 to account for last line already being read
-                height = len(new_maze.readlines())+1
+            if GRID:
+                clear()
             
             # resize the graph to accommodate new maze size
-            MAZE.resize_maze(width, height)
+            MAZE.resize_maze(new_grid.width, new_grid.height)
             
-            # modify nodes based on characters read from maze file
-            with open(f'{filename}', 'r', encoding='utf8') as new_maze:
-                x = 0 # x coordinate
-                y = 0 # y coordinate
-                for line in new_maze.readlines():
-                    for char in line:
-                        if char == ' ':
-                            NODES[(x,y)].make_empty_node()
-                        elif char == '█':
-                            NODES[(x,y)].make_wall_node()
-                        elif char == 'S':
-                            NODES[(x,y)].make_start_node()
-                        elif char == 'E':
-                            NODES[(x,y)].make_end_node()
-                        # reset the x coordinate at the end of each line
-                        x = x+1 if x < width else 0
-                    y += 1
+            # modify nodes based on the parsed maze
+            GRID.cells[:] = new_grid.cells
+            GRID.invalidate()
+            MAZE.draw_nodes()
+            if new_grid.start is not None:
+                get_node(new_grid.start).make_start_node()
+            if new_grid.end is not None:
+                get_node(new_grid.end).make_end_node()
             MAZE.bring_start_and_end_nodes_to_front()
-        except:
+            # Reuse the maze's jump table, if one was saved with it
+            if jump_table.load_for(GRID, filename):
+                print('Loaded jump table: '
+                      f'{jump_table.table_filename(filename)}')
+        except Exception as e:
+            print(f'Error loading maze: {e}')
             # If there's no nodes, generate them
-            if not NODES:
+            if not GRID:
                 MAZE.resize_maze(MAZE_WIDTH,MAZE_HEIGHT,NODE_SIZE)
             clear()
             sg.popup('Error loading maze.')
@@ -763,35 +711,13 @@ def save_maze_file(filename: str) -> bool:
     if not filename:
         return False
     
-    # list that stores the maze
-    maze_to_write = []
-    for col in range(MAZE_HEIGHT):
-        row_list = []
-        for row in range(MAZE_WIDTH):
-            if NODES[(row, col)].is_start_node:
-                row_list.append('S')
-            elif NODES[(row, col)].is_end_node:
-                row_list.append('E')
-            elif NODES[(row, col)].is_empty:
-                row_list.append(' ')
-            elif NODES[(row, col)].is_wall:
-                row_list.append('█')
-        maze_to_write.append(row_list)
-    
-    # remove trailing space from the last node in each row
-    for row in maze_to_write:
-        row[MAZE_WIDTH-1] = row[MAZE_WIDTH-1][0]
-        
-    # write maze_to_write to a file
-    with open(f'{filename.name}', 'w', encoding="utf-8") as file_to_write:
-        for row in range(MAZE_HEIGHT):
-            file_to_write.writelines(maze_to_write[row])
-            # write a new line at the end of each row, 
-            # but not at the end of the last line
-            if row != MAZE_HEIGHT-1:
-                file_to_write.write('\n')
-            
+    # write the grid to a file
+    grid.save_maze_file(GRID, filename.name)
     print(f'Save maze to: {filename}')
+    # Keep the maze's jump table next to it, if JPS+ has built one
+    if jump_table.save_for(GRID, filename.name):
+        print('Save jump table to: '
+              f'{jump_table.table_filename(filename.name)}')
     
     
     
@@ -820,89 +746,28 @@ def generate_maze() -> None:
     print('Generate Maze')
     clear()
     
-    
-    def pick_maze_generator_starting_point() -> tuple:
-        """Picks and returns a starting point for the maze generator."""
-        # List of permissible starting points for the x and y coordinates
-        coords_x = [x for x in range(1, MAZE_WIDTH-1, 2)]
-        coords_y = [x for x in range(1, MAZE_HEIGHT-1, 2)]
-        return (random_choice(coords_x), random_choice(coords_y))
-    
-    
-    def connect_nodes(current_node, old_node) -> None:
-        """Draws a path between two nodes."""
-        x_diff = current_node.x - old_node.x
-        y_diff = current_node.y - old_node.y
-        if x_diff == -2:
-            NODES[(current_node.x+1, current_node.y)].make_empty_node()
-        elif x_diff == 2:
-            NODES[(current_node.x-1, current_node.y)].make_empty_node()
-        elif y_diff == -2:
-            NODES[(current_node.x, current_node.y+1)].make_empty_node()
-        elif y_diff == 2:
-            NODES[(current_node.x, current_node.y-1)].make_empty_node()
-        
-        
     # Populates existing maze with wall nodes
     MAZE.clear_solution()
     MAZE.fill_maze()
-    # Set a start node
-    NODES[(1,0)].make_start_node()
-    # Set an end node
-    if MAZE_WIDTH % 2 == 0: # If the maze width is an even number
-        # The last two columns of nodes will be walls, 
-        # so the end node has to be two nodes away from the rightmost edge
-        NODES[(MAZE_WIDTH-3, MAZE_HEIGHT-1)].make_end_node()
-    else:
-        NODES[(MAZE_WIDTH-2, MAZE_HEIGHT-1)].make_end_node()
-    # Make sure a path to the end node exists
-    if MAZE_HEIGHT % 2 == 0:
-        NODES[(END_NODE.x, END_NODE.y-1)].make_empty_node()
-    
-    # Initialize stack with a randomly picked point on the grid
-    stack = []
-    stack.append(NODES[pick_maze_generator_starting_point()])
-    
-    # Tracks what the previous node was
-    old_node = None
-    
-    # As long as there's a node in the stack
-    while stack:
-        # Use the last node in the stack
-        current_node = stack[len(stack)-1]
-        # Connect the current node and old node with a path
-        if old_node:
-            connect_nodes(old_node, current_node)
-        current_node.make_empty_node()
-        window.refresh()
-        
-        # Store the current node
-        old_node = current_node
-        
-        # Get the potential directions to go in
-        directions = current_node.get_directions_to_dig()
-        
-        # If there's nowhere for the current node to go, 
-        # remove it from the stack and restart the loop
-        if not directions:
-            stack.pop()
-            continue
-        
-        # Choose a random direction to go in
-        direction = random_choice(directions)
-        
-        # Append the node one farther than the chosen node to the stack
-        x_diff = current_node.x - direction.x
-        y_diff = current_node.y - direction.y
-        if x_diff == -1: # append the right node
-            stack.append(NODES[(current_node.x+2, current_node.y)])
-        elif x_diff == 1: # append left node
-            stack.append(NODES[(current_node.x-2, current_node.y)])
-        elif y_diff == -1: # append bottom node
-            stack.append(NODES[(current_node.x, current_node.y+2)])
-        elif y_diff == 1: # append top node
-            stack.append(NODES[(current_node.x, current_node.y-2)])
     
+    def draw_empty_node(index: int, color: str) -> None:
+        """Draws a node emptied by the maze generator."""
+        get_node(index).style(color)
+    
+    # Carve the maze into the grid, drawing each node as it's emptied.
+    # Mazes drawn as an image are too large to refresh for every node,
+    # so they're only refreshed once per display frame.
+    render_queue = render.RenderQueue(draw_empty_node)
+    for index in grid.generate_maze(GRID):
+        render_queue.push(index, COLORS['empty'])
+        if not MAZE.raster or render_queue.frame_is_due():
+            render_queue.flush()
+            window.refresh()
+    render_queue.flush()
+    
+    # Style the end points chosen by the maze generator
+    get_node(GRID.start).make_start_node()
+    get_node(GRID.end).make_end_node()
     MAZE.bring_start_and_end_nodes_to_front()
             
             
@@ -1024,54 +889,87 @@ def apply_settings():
 ##    ## ##       ##     ## ##    ## ##    ##
  ######  ######## ##     ##  ######   ######
 """
+def get_node(index: int) -> object:
+    """Returns a `Node` view of the node at `index` in `GRID`."""
+    return Node(MAZE, GRID.coords(index))
+
+
 class Node(object):
     """
-    Creates a maze node on the window graph at `(location[0], location[1])`.
+    A view of the maze node at `(location[0], location[1])`.
+    The node's state is stored in `GRID`, and it is drawn by the `Maze` graph,
+    so views can be created and discarded freely.
     Nodes are represented as squares of `NODE_SIZE` pixels wide on the graph.
     """
+    # Views hold no state of their own, so they don't need a __dict__
+    __slots__ = ('maze', 'x', 'y', 'index')
+
     def __init__(self, maze: str, location: tuple) -> None:
         self.maze = maze                    # window graph object
         self.x = location[0]                # x coordinate    
         self.y = location[1]                # y coordinate
-        self.loc = location                 # tuple of (x,y)
-        
-        # Status attributes
-        self.is_empty = True
-        self.is_wall = False
-        self.is_start_node = False
-        self.is_end_node = False
-        self.is_visited = False
-        self.is_active = False
-        
-        # List of all surrounding node locations
-        self.surrounding_locations = (
-            (self.x, self.y+1),     # top
-            (self.x+1, self.y+1),   # top-right
-            (self.x+1, self.y),     # right
-            (self.x+1, self.y-1),   # bottom-right
-            (self.x, self.y-1),     # bottom
-            (self.x-1, self.y-1),   # bottom-left
-            (self.x-1, self.y),     # left
-            (self.x-1, self.y+1),   # top-left
-        )
-        
-        # parent node for backtracking and highlighting maze solution
-        self.parent = None
-        # distance attribute of the node (used in astar algorithm)
-        self.distance = float('inf')
-        
-        # Draw the node on the graph and store the drawn figure in the self.id
-        self.id = maze.draw_rectangle(top_left=(self.x*NODE_SIZE, 
-                                                self.y*NODE_SIZE), 
-                                      bottom_right=(self.x*NODE_SIZE+NODE_SIZE, 
-                                                    self.y*NODE_SIZE+NODE_SIZE),
-                                      fill_color=COLORS['empty'],
-                                      line_color='#fff',
-                                      line_width=1)
-        
-        # Add the node to the global nodes dictionary
-        NODES[(self.x, self.y)] = self
-        # print(f'Node created at {self.x}, {self.y}. Node id: {self.id}')
+        self.index = GRID.index(self.x, self.y)  # index of the node in GRID
+
+
+    @property
+    def loc(self) -> tuple:
+        """Tuple of `(x, y)`."""
+        return (self.x, self.y)
+
+
+    def __eq__(self, node) -> bool:
+        return isinstance(node, Node) and self.index == node.index
+
+
+    def __hash__(self) -> int:
+        return self.index
+
+
+    # Status attributes
+    @property
+    def is_empty(self) -> bool:
+        return GRID.cells[self.index] != grid.WALL
+
+    @property
+    def is_wall(self) -> bool:
+        return GRID.cells[self.index] == grid.WALL
+
+    @property
+    def is_start_node(self) -> bool:
+        return GRID.start == self.index
+
+    @property
+    def is_end_node(self) -> bool:
+        return GRID.end == self.index
+
+    @property
+    def is_visited(self) -> bool:
+        return bool(GRID.get_flags(self.index) & grid.VISITED)
+
+    @is_visited.setter
+    def is_visited(self, value: bool) -> None:
+        flags = GRID.get_flags(self.index)
+        if value:
+            GRID.set_flags(self.index, flags | grid.VISITED)
+        else:
+            GRID.set_flags(self.index, flags & ~grid.VISITED)
+
+    @property
+    def terrain(self) -> int:
+        """The cell state of the node, e.g. `grid.MUD`."""
+        return GRID.cells[self.index]
+
+    @property
+    def is_active(self) -> bool:
+        return bool(GRID.get_flags(self.index) & grid.ACTIVE)
+
+    @is_active.setter
+    def is_active(self, value: bool) -> None:
+        flags = GRID.get_flags(self.index)
+        if value:
+            GRID.set_flags(self.index, flags | grid.ACTIVE)
+        else:
+            GRID.set_flags(self.index, flags & ~grid.ACTIVE)
 
 
     def get_center(self) -> tuple:
@@ -1081,9 +979,12 @@ class Node(object):
         
     
     def is_next_to(self, node) -> bool:
-        """Returns `True` if node is next to node passed as parameter."""
-        if node:
-            if self.loc in node.surrounding_locations:
+        """
+        Returns `True` if node is next to node passed as parameter, 
+        including diagonally.
+        """
+        if node and node != self:
+            if abs(self.x - node.x) <= 1 and abs(self.y - node.y) <= 1:
                 return True
         return False
         
@@ -1092,6 +993,8 @@ class Node(object):
               send_to_back=False):
         """
         Updates a node color.
+        The node is recolored in place by the `Maze` graph, so its figure 
+        keeps its id and its position in the graph's stacking order.
 
         Args:
             `color` (str: Optional): Hexidecimal string of a color. 
@@ -1099,17 +1002,12 @@ class Node(object):
             `border_color` (str: Optional): Hexidecimal string of a color.
             `border_width` (int: Optional): Width of the border in pixels.
         """
-        self.maze.delete_figure(self.id)
-        self.id = self.maze.draw_rectangle(
-                        top_left=(self.x*NODE_SIZE, 
-                                  self.y*NODE_SIZE), 
-                        bottom_right=(self.x*NODE_SIZE+NODE_SIZE, 
-                                      self.y*NODE_SIZE+NODE_SIZE),
-                        fill_color=color,
-                        line_color=border_color,
-                        line_width=border_width)
+        self.maze.style_node(self.index, 
+                             fill_color=color,
+                             line_color=border_color,
+                             line_width=border_width)
         if send_to_back:
-            MAZE.send_figure_to_back(self.id)
+            self.maze.send_node_to_back(self.index)
     
 
     def get_neighbors(self) -> list:
@@ -1118,135 +1016,112 @@ class Node(object):
         Neighbor nodes are nodes that are above, below, left, or right 
         of the node this method was called on.
         """
-        neighbors = []  
-        if self.y != 0:
-            neighbors.append(NODES[(self.x, self.y-1)]) # top
-        # subtract 1 from MAZE_WIDTH because location indexes start at 0
-        if self.x != MAZE_WIDTH-1: 
-            neighbors.append(NODES[(self.x+1, self.y)]) # right
-        # subtract 1 from MAZE_HEIGHT because location indexes start at 0
-        if self.y != MAZE_HEIGHT-1: 
-            neighbors.append(NODES[(self.x, self.y+1)]) # bottom
-        if self.x != 0:
-            neighbors.append(NODES[(self.x-1, self.y)]) # left
-        # Prune neighbors list to remove visited nodes and wall nodes
-        return [node for node in neighbors if not node.is_wall and not node.is_visited]
-    
-    
-    def get_directions_to_dig(self) -> list:
-        """
-        Returns a list of nodes that can be emptied during maze generation. 
-        Viable node requirements:
-            1. Node direction + 1 must not be on the edge of the maze.
-            2. Node direction + 1 must not already be an empty node.
-        """
-        # Immediate neighbor nodes
-        neighbors = [
-            NODES[(self.x, self.y+1)],  # top
-            NODES[(self.x+1, self.y)],  # right
-            NODES[(self.x, self.y-1)],  # bottom
-            NODES[(self.x-1, self.y)],  # left
-            ]
-        # Look ahead one node in that direction and check for edges or paths
-        # Node direction + 1 must not be on the edge of the maze.
-        # Node direction + 1 must not already be an empty node.
-        if self.y+2 > MAZE_HEIGHT-2 or NODES[(self.x, self.y+2)].is_empty:
-            neighbors[0] = False
-        if self.x+2 > MAZE_WIDTH-2 or NODES[(self.x+2, self.y)].is_empty:
-            neighbors[1] = False
-        if self.y-2 < 1 or NODES[(self.x, self.y-2)].is_empty:
-            neighbors[2] = False
-        if self.x-2 < 1 or NODES[(self.x-2, self.y)].is_empty:
-            neighbors[3] = False
-        
-        # Return a list of neighbors that haven't been set to false
-        return [neighbor for neighbor in neighbors if neighbor]
+        return [get_node(index) for index in GRID.neighbors(self.index)
+                if not GRID.get_flags(index) & grid.VISITED]
     
 
     def make_start_node(self) -> None:
         """Converts the node to a start node."""
         global START_NODE
+        global END_NODE
         # Remove existing start node
-        if START_NODE:
+        if START_NODE and START_NODE != self:
             START_NODE.make_empty_node()
+        # The end node can't also be the start node
+        if self.is_end_node:
+            END_NODE = None
+            GRID.end = None
         START_NODE = self
+        GRID.start = self.index
+        GRID.set_cell(self.index, grid.EMPTY)
         self.style(COLORS['start'], 
                    border_color=COLORS['start_border'], 
                    border_width=4)
-        self.is_empty = True
-        self.is_wall = False
-        self.is_start_node = True
-        self.is_end_node = False
-        self.distance = 0
-        self.start_distance = 0
-        self.end_distance = float('inf')
+        # Keep the thick border above the surrounding nodes
+        self.maze.bring_node_to_front(self.index)
     
 
     def make_end_node(self) -> None:
         """Converts the node to an end node."""
+        global START_NODE
         global END_NODE
         # Remove existing end node
-        if END_NODE:
+        if END_NODE and END_NODE != self:
             END_NODE.make_empty_node()
+        # The start node can't also be the end node
+        if self.is_start_node:
+            START_NODE = None
+            GRID.start = None
         END_NODE = self
+        GRID.end = self.index
+        GRID.set_cell(self.index, grid.EMPTY)
         self.style(COLORS['end'], 
                    border_color=COLORS['end_border'], 
                    border_width=4)
-        self.is_empty = True
-        self.is_wall = False
-        self.is_start_node = False
-        self.is_end_node = True
-        self.distance = float('inf')
-        self.start_distance = float('inf')
-        self.end_distance = float('inf')
+        # Keep the thick border above the surrounding nodes
+        self.maze.bring_node_to_front(self.index)
         
 
     def make_wall_node(self) -> None:
         """Converts the node to a wall node."""
+        global START_NODE
+        global END_NODE
         self.style(color=COLORS['wall'], 
                    border_color=COLORS['wall'])
-        self.maze.send_figure_to_back(self.id)
-        self.is_empty = False
-        self.is_wall = True
-        self.is_visited = False
-        self.is_start_node = False
-        self.is_end_node = False
-        self.distance = float('inf')
-        self.start_distance = float('inf')
-        self.end_distance = float('inf')
+        self.maze.send_node_to_back(self.index)
+        if self.is_start_node:
+            START_NODE = None
+            GRID.start = None
+        elif self.is_end_node:
+            END_NODE = None
+            GRID.end = None
+        GRID.set_cell(self.index, grid.WALL)
+        GRID.set_flags(self.index, 0)
         
 
     def make_empty_node(self) -> None:
         """Converts the node to an empty node."""
         self.style(COLORS['empty'])
-        self.is_empty = True
-        self.is_wall = False
-        self.is_visited = False
-        self.is_active = False
-        self.distance = float('inf')
-        self.start_distance = float('inf')
-        self.end_distance = float('inf')
+        GRID.set_cell(self.index, grid.EMPTY)
+        GRID.set_flags(self.index, 0)
         if self.is_start_node:
             global START_NODE
-            self.is_start_node = False
+            GRID.start = None
             START_NODE = None
         elif self.is_end_node:
             global END_NODE
-            self.is_end_node = False
+            GRID.end = None
             END_NODE = None
-        # If drawn next to a start or end node,
-        # Make sure it's behind that node.
-        if self.is_next_to(START_NODE):
-            MAZE.bring_figure_to_front(START_NODE.id)
-        if self.is_next_to(END_NODE):
-            MAZE.bring_figure_to_front(END_NODE.id)
         
     
+    def make_terrain_node(self, terrain: int) -> None:
+        """
+        Converts the node to a weighted terrain node, e.g. `grid.MUD`.
+        Terrain can be traversed, but costs more than an empty node to cross.
+        """
+        global START_NODE
+        global END_NODE
+        self.style(TERRAIN_COLORS[terrain])
+        if self.is_start_node:
+            START_NODE = None
+            GRID.start = None
+        elif self.is_end_node:
+            END_NODE = None
+            GRID.end = None
+        GRID.set_cell(self.index, terrain)
+        GRID.set_flags(self.index, 0)
+
+
     def make_visited_node(self) -> None:
         """Flags and styles a node as visited."""
         self.style(COLORS['visited'])
         self.is_visited = True
         
+    def make_filled_node(self) -> None:
+        """Flags and styles a node as filled in as part of a dead end."""
+        self.style(COLORS['filled'])
+        self.is_visited = True
+        
     def make_neighbor_node(self) -> None:
         """Styles a node as a neighbor."""
         self.style(COLORS['neighbor'])
@@ -1271,20 +1146,29 @@ class Node(object):
     def reset_node(self):
         """
         Removes removes is_visited, and is_active flags. 
-        Returns original node color.
+        Returns original node color, without changing the node in `GRID`.
         """
         # reset flags
         self.is_visited = False
         self.is_active = False
         # reset colors
         if self.is_start_node:
-            self.make_start_node()
+            self.style(COLORS['start'], 
+                       border_color=COLORS['start_border'], 
+                       border_width=4)
+            self.maze.bring_node_to_front(self.index)
         elif self.is_end_node:
-            self.make_end_node()
+            self.style(COLORS['end'], 
+                       border_color=COLORS['end_border'], 
+                       border_width=4)
+            self.maze.bring_node_to_front(self.index)
         elif self.is_wall:
-            self.make_wall_node()
-        elif self.is_empty:
-            self.make_empty_node()
+            self.style(color=COLORS['wall'], 
+                       border_color=COLORS['wall'])
+            self.maze.send_node_to_back(self.index)
+        else:
+            # Empty or weighted terrain
+            self.style(TERRAIN_COLORS[self.terrain])
             
             
             
@@ -1305,7 +1189,12 @@ class Node(object):
  ######  ######## ##     ##  ######   ######
 """
 class Maze(sg.Graph): # Extend PySimpleGUI Graph Class
-    """Extension of the sg.Graph class."""
+    """
+    Extension of the sg.Graph class.
+    Nodes are drawn as one rectangle figure each, unless the maze has more 
+    than `RASTER_THRESHOLD` nodes. Larger mazes are drawn into a single image,
+    since the graph's canvas slows down badly with that many figures.
+    """
     
     def __init__(self, key, canvas_size, graph_bottom_left, graph_top_right, 
                  background_color, drag_submits, enable_events):
@@ -1318,6 +1207,10 @@ class Maze(sg.Graph): # Extend PySimpleGUI Graph Class
                          enable_events=enable_events)
         # List of figures in the solution line
         self.solution_figures = []
+        # Figure ids of every node on the graph, indexed like GRID.cells
+        self.figures = array('l')
+        # Image that every node is drawn into, for large mazes
+        self.raster = None
         
         """
         sg.Graph Super Class Initialization Vars:
@@ -1335,21 +1228,32 @@ class Maze(sg.Graph): # Extend PySimpleGUI Graph Class
         global MAZE_WIDTH
         global MAZE_HEIGHT
         global NODE_SIZE
-        global NODES
-        MAZE_WIDTH = nodes_across
-        MAZE_HEIGHT = nodes_down
-        NODE_SIZE = node_size
+        global GRID
+        global START_NODE
+        global END_NODE
+        MAZE_WIDTH = int(nodes_across)
+        MAZE_HEIGHT = int(nodes_down)
+        NODE_SIZE = int(node_size)
+        raster = MAZE_WIDTH * MAZE_HEIGHT > RASTER_THRESHOLD
+        if raster:
+            # Keep the image small enough to fit in memory
+            NODE_SIZE = max(1, min(NODE_SIZE, RASTER_MAX_SIDE // 
+                                   max(MAZE_WIDTH, MAZE_HEIGHT)))
         print(f"Resize maze:\n",
               f"\t{nodes_across} nodes wide,\n",
               f"\t{nodes_down} nodes down,\n",
-              f"\twith a node size of {node_size}"
+              f"\twith a node size of {NODE_SIZE}"
               )
         
         # Delete all figures
-        for node in NODES.values():
-            window['maze'].delete_figure(node.id)
-        # Empty NODES dictionary
-        NODES.clear()
+        self.erase()
+        self.solution_figures = []
+        self.figures = array('l')
+        self.raster = None
+        # Create a new, empty grid
+        GRID = grid.Grid(MAZE_WIDTH, MAZE_HEIGHT)
+        START_NODE = None
+        END_NODE = None
         
         # Create a new graph
         MAZE.clear_solution()
@@ -1358,45 +1262,151 @@ class Maze(sg.Graph): # Extend PySimpleGUI Graph Class
         MAZE.set_size(size=(MAZE_WIDTH*NODE_SIZE, 
                             MAZE_HEIGHT*NODE_SIZE))
         
-        # Initialize new nodes
-        for x in range(int(MAZE_WIDTH)):
-            for y in range(int(MAZE_HEIGHT)):
-                init_node = Node(window['maze'], (x,y))
+        # Draw new nodes
+        if raster:
+            # Draw every node into one image
+            self.raster = PhotoImage(width=MAZE_WIDTH*NODE_SIZE, 
+                                     height=MAZE_HEIGHT*NODE_SIZE)
+            self.raster.put(COLORS['empty'], 
+                            to=(0, 0, MAZE_WIDTH*NODE_SIZE, 
+                                MAZE_HEIGHT*NODE_SIZE))
+            self.TKCanvas.create_image(0, 0, image=self.raster, anchor='nw')
+            print('\tDrawing nodes as an image')
+            return
+        self.figures = array('l', [0]) * GRID.size
+        for y in range(MAZE_HEIGHT):
+            for x in range(MAZE_WIDTH):
+                self.figures[GRID.index(x, y)] = self.draw_rectangle(
+                    top_left=(x*NODE_SIZE, y*NODE_SIZE), 
+                    bottom_right=(x*NODE_SIZE+NODE_SIZE, 
+                                  y*NODE_SIZE+NODE_SIZE),
+                    fill_color=COLORS['empty'],
+                    line_color='#fff',
+                    line_width=1)
+        
+        
+    def recolor_figure(self, figure_id, fill_color=None, line_color=None,
+                       line_width=None) -> None:
+        """
+        Changes the colors of a figure drawn with `draw_rectangle()`,
+        without deleting and redrawing it.
+        """
+        self.TKCanvas.itemconfigure(figure_id, 
+                                    fill=fill_color, 
+                                    outline=line_color, 
+                                    width=line_width)
+        
+        
+    def style_node(self, index, fill_color=None, line_color=None,
+                   line_width=None) -> None:
+        """
+        Changes the colors of the node at `index` in `GRID`.
+        Nodes drawn into the maze image only show their fill color.
+        """
+        if self.raster:
+            x = index % MAZE_WIDTH * NODE_SIZE
+            y = index // MAZE_WIDTH * NODE_SIZE
+            self.raster.put(fill_color, to=(x, y, x+NODE_SIZE, y+NODE_SIZE))
+        else:
+            self.recolor_figure(self.figures[index], fill_color, 
+                                line_color, line_width)
+            
+            
+    def send_node_to_back(self, index) -> None:
+        """Sends the figure of the node at `index` to the back."""
+        if not self.raster:
+            self.send_figure_to_back(self.figures[index])
+            
+            
+    def bring_node_to_front(self, index) -> None:
+        """Brings the figure of the node at `index` to the front."""
+        if not self.raster:
+            self.bring_figure_to_front(self.figures[index])
+            
+            
+    def draw_nodes(self) -> None:
+        """
+        Redraws every node from the state stored in `GRID`, 
+        and restores the start and end nodes.
+        """
+        if self.raster:
+            # Draw every node into the image a row of nodes at a time.
+            # Each row's pixels are built once, and tiled down the
+            # NODE_SIZE rows of pixels the nodes cover.
+            colors = [f'{color} ' * NODE_SIZE for color in TERRAIN_COLORS]
+            width = MAZE_WIDTH * NODE_SIZE
+            for y in range(MAZE_HEIGHT):
+                cells = GRID.cells[y*MAZE_WIDTH:(y+1)*MAZE_WIDTH]
+                row = '{' + ''.join(map(colors.__getitem__, cells)) + '}'
+                self.raster.put(row, to=(0, y*NODE_SIZE, 
+                                         width, (y+1)*NODE_SIZE))
+            GRID.clear_flags()
+            if START_NODE:
+                START_NODE.reset_node()
+            if END_NODE:
+                END_NODE.reset_node()
+        else:
+            for index in range(GRID.size):
+                get_node(index).reset_node()
+
+
+    def reset_nodes(self) -> None:
+        """
+        Clears every node's flags, and redraws the nodes flagged since they
+        were last cleared from the state stored in `GRID`. Nodes untouched
+        by the last search are left as they are.
+        """
+        for index in GRID.clear_flags():
+            get_node(index).reset_node()
+        if START_NODE:
+            START_NODE.reset_node()
+        if END_NODE:
+            END_NODE.reset_node()
         
         
     def fill_maze(self) -> None:
         """Fills the entire maze with wall nodes."""
         clear()
-        for node in NODES.values():
-            node.make_wall_node()
+        GRID.fill(grid.WALL)
+        self.draw_nodes()
             
     
-    def highlight_solution(self, current_node):
+    def highlight_solution(self, path):
         """
         Highlights the maze solution when an algorithm finishes.
         If there is no solution, all visited nodes are highlighted red.
+        
+        Args:
+            `path` (list): Node indexes from the start node to the end node,
+                or `None` if the maze could not be solved.
         """
         maze_is_solvable = True
-        # If the current node is not the solution node, the maze is unsolvable
-        if not current_node.is_end_node:
+        # If there's no path, the maze is unsolvable
+        if path is None:
             maze_is_solvable = False
-            for node in [node for node in NODES.values() if node.is_visited]:
-                node.make_error_node()
+            for index in GRID.touched:
+                if GRID.get_flags(index) & grid.VISITED:
+                    get_node(index).make_error_node()
+        # If the maze has been solved, in a maze drawn as an image
+        elif self.raster:
+            # Draw the whole path as a single line figure
+            points = [get_node(index).get_center() for index in path]
+            if len(points) > 1:
+                self.solution_figures = [self.draw_lines(
+                    points=points, color=COLORS['end'], 
+                    width=min(3, NODE_SIZE))]
         # If the maze has been solved
-        if maze_is_solvable:
-            # Draw a path from the end node to the start node using node.parent
+        else:
+            # Draw a path from the end node to the start node
             self.solution_figures = []
-            while current_node.parent is not None:
-                if current_node.is_start_node == True:
-                    break
-                #current_node.make_solution_node()
-                fig = self.draw_line(point_from=current_node.get_center(),
-                                    point_to=current_node.parent.get_center(),
-                                    color=COLORS['end'],
-                                    width=3)
+            for index in range(len(path)-1, 0, -1):
+                fig = self.draw_line(
+                    point_from=get_node(path[index]).get_center(),
+                    point_to=get_node(path[index-1]).get_center(),
+                    color=COLORS['end'],
+                    width=3)
                 window.refresh()
                 self.solution_figures.append(fig)
-                current_node = current_node.parent
         # Re-establish the maze end points    
         START_NODE.make_start_node()
         END_NODE.make_end_node()
@@ -1405,6 +1415,23 @@ class Maze(sg.Graph): # Extend PySimpleGUI Graph Class
             sg.popup('Maze could not be solved.')
 
 
+    def redraw_solution(self, path) -> None:
+        """
+        Replaces the highlighted solution with `path` right away, as a single 
+        line figure. Removes the solution if `path` is `None`.
+        """
+        self.clear_solution()
+        if path and len(path) > 1:
+            points = [get_node(index).get_center() for index in path]
+            self.solution_figures = [self.draw_lines(
+                points=points, color=COLORS['end'], 
+                width=min(3, NODE_SIZE))]
+        if START_NODE:
+            START_NODE.make_start_node()
+        if END_NODE:
+            END_NODE.make_end_node()
+
+
     def clear_solution(self) -> list:
         """
         Removes all figures drawn for the solution.
@@ -1419,9 +1446,9 @@ class Maze(sg.Graph): # Extend PySimpleGUI Graph Class
     def bring_start_and_end_nodes_to_front(self):
         """Bring the starting and ending nodes to the front of the maze."""
         if START_NODE:
-            self.bring_figure_to_front(START_NODE.id)
+            self.bring_node_to_front(START_NODE.index)
         if END_NODE:
-            self.bring_figure_to_front(END_NODE.id)
+            self.bring_node_to_front(END_NODE.index)
 
 
 """
@@ -1446,7 +1473,7 @@ def create_settings_window(root_dir):
     settings = read_settings()
 
     # Valid values for maze and node dimensions
-    valid_maze_dims = tuple(range(2,201))
+    valid_maze_dims = tuple(range(2,4097))
     valid_node_dims = tuple(range(5,31,5))
     
     col_1 = [
@@ -1466,7 +1493,17 @@ def create_settings_window(root_dir):
                   default_value=settings['default_algorithm'], 
                   values=['Breadth-First Search', 
                           'Depth-First Search', 
-                          'A* (A Star)'], 
+                          'Bit-Parallel BFS', 
+                          'Dead-End Filling', 
+                          'Dijkstra', 
+                          'A* (A Star)', 
+                          'Bidirectional BFS', 
+                          'Bidirectional A*', 
+                          'Jump Point Search', 
+                          'JPS+', 
+                          'LPA* (Replanning)', 
+                          'HPA* (Hierarchical)', 
+                          'Junction Graph A*'], 
                   size=20, 
                   readonly=True)],
         # Default Speed
@@ -1535,11 +1572,11 @@ def create_resize_window():
     col_2 = [  
         [sg.Spin(key="resize_window_maze_width", 
                  initial_value =MAZE_WIDTH, 
-                 values=(list(range(500))), 
+                 values=(list(range(2, 4097))), 
                  size=(5,1))], 
         [sg.Spin(key="resize_window_maze_height", 
                  initial_value =MAZE_HEIGHT, 
-                 values=(list(range(500))), 
+                 values=(list(range(2, 4097))), 
                  size=(5,1))], 
         [sg.Spin(key="resize_window_node_size", 
                  initial_value =NODE_SIZE, 
@@ -1602,12 +1639,28 @@ def create_main_window() -> object:
                   text='Breadth First Search', default=True)],
         [sg.Radio(group_id='algo', key='radio_algo_dfs', enable_events=True, 
                   text='Depth First Search')],
-        # [sg.Radio(group_id='algo', 
-        #           key='radio_algo_dijkstra', 
-        #           enable_events=True, 
-        #           text='Dijkstra')],
+        [sg.Radio(group_id='algo', key='radio_algo_bitbfs', 
+                  enable_events=True, text='Bit-Parallel BFS')],
+        [sg.Radio(group_id='algo', key='radio_algo_deadend', 
+                  enable_events=True, text='Dead-End Filling')],
+        [sg.Radio(group_id='algo', key='radio_algo_dijkstra', 
+                  enable_events=True, text='Dijkstra')],
         [sg.Radio(group_id='algo', key='radio_algo_astar', enable_events=True, 
                   text='A* (A Star)')],
+        [sg.Radio(group_id='algo', key='radio_algo_bibfs', enable_events=True, 
+                  text='Bidirectional BFS')],
+        [sg.Radio(group_id='algo', key='radio_algo_biastar', 
+                  enable_events=True, text='Bidirectional A*')],
+        [sg.Radio(group_id='algo', key='radio_algo_jps', enable_events=True, 
+                  text='Jump Point Search')],
+        [sg.Radio(group_id='algo', key='radio_algo_jpsplus', 
+                  enable_events=True, text='JPS+')],
+        [sg.Radio(group_id='algo', key='radio_algo_lpastar', 
+                  enable_events=True, text='LPA* (Replanning)')],
+        [sg.Radio(group_id='algo', key='radio_algo_hpastar', 
+                  enable_events=True, text='HPA* (Hierarchical)')],
+        [sg.Radio(group_id='algo', key='radio_algo_junctions', 
+                  enable_events=True, text='Junction Graph A*')],
         ]
     
     # Maze draw mode buttons 
@@ -1616,6 +1669,10 @@ def create_main_window() -> object:
                    tooltip="Draw walls on the grid."), 
          sg.Button(button_text='Path', key='maze_tools_path', expand_x=True, 
                    tooltip="Erase walls and make paths.")],
+        [sg.Button(button_text='Mud', key='maze_tools_mud', expand_x=True, 
+                   tooltip="Draw mud, which costs 3 to cross."), 
+         sg.Button(button_text='Water', key='maze_tools_water', expand_x=True, 
+                   tooltip="Draw water, which costs 5 to cross.")],
         [sg.Button(button_text='Start Node', key='maze_tools_start', 
                    expand_x=True, tooltip="Designate a starting square.")], 
         [sg.Button(button_text='End Node', key='maze_tools_end', 
@@ -1673,12 +1730,15 @@ def create_main_window() -> object:
  ##  ##   ###  ##     ##
 #### ##    ## ####    ##
 """
-# Create the main window
-window = create_main_window()
-# Loads settings from settings.cfg from pathypyinder.py's directory
-# Resorts to loading from default_settings if settings.cfg fails to load
-apply_settings()
-set_draw_mode('wall')
+def init_window() -> None:
+    """Creates the main window and loads the initial maze into it."""
+    global window
+    # Create the main window
+    window = create_main_window()
+    # Loads settings from settings.cfg from pathypyinder.py's directory
+    # Resorts to loading from default_settings if settings.cfg fails to load
+    apply_settings()
+    set_draw_mode('wall')
 
 
 
@@ -1699,106 +1759,144 @@ set_draw_mode('wall')
 ##       ##     ## ##     ## ##
 ########  #######   #######  ##
 """
-# Continuously read the main window for user input
-while True:
-    if window is None:
-        window = create_main_window()
-    event, values = window.read()
-    # Break the loop if the window is closed
-    if event == sg.WIN_CLOSED or event == 'Exit':
-        break
-    
-    # Maze interactions
-    if event == 'maze':
-        if not MODE:
-            pass
-        else:
-            # get (x,y) coordinates of the node that was clicked
-            loc = (values['maze'][0] // NODE_SIZE, 
-                   values['maze'][1] // NODE_SIZE)
-            # make sure node location is in-bounds
-            if -1 < loc[0] < MAZE_WIDTH and -1 < loc[1] < MAZE_HEIGHT:
-                # set the current working node
-                clicked_node = NODES[loc]
-                # draw a node based on the draw mode
-                if MODE == 'wall':
-                    clicked_node.make_wall_node()
-                elif MODE == 'path':
-                    clicked_node.make_empty_node()
-                elif MODE == 'start':
-                    clicked_node.make_start_node()
-                elif MODE == 'end':
-                    clicked_node.make_end_node()
-    
-    # Algorithm radio switches
-    elif event == 'radio_algo_bfs':
-        set_algo('Breadth-First Search')
-    elif event == 'radio_algo_dfs':
-        set_algo('Depth-First Search')
-    elif event == 'radio_algo_dijkstra':
-        set_algo('Dijkstra')
-    elif event == 'radio_algo_astar':
-        set_algo('A* (A Star)')
-        
-    # Draw tools
-    elif event == 'maze_tools_wall':
-        set_draw_mode('wall')
-    elif event == 'maze_tools_path':
-        set_draw_mode('path')
-    elif event == 'maze_tools_start':
-        set_draw_mode('start')
-    elif event == 'maze_tools_end':
-        set_draw_mode('end')
-        
-    # Reset buttons
-    elif event == 'maze_tools_clear':
-        clear()
-    elif event == 'maze_tools_reset':
-        reset()
-        
-    # Algorithm controls
-    elif event == 'controls_solve':
-        solve_maze()
-    elif event == 'controls_speed_slider':
-        set_speed(values['controls_speed_slider'])
-        
-    # Menu
-    elif event == 'Open Maze':
-        open_maze_file(sg.filedialog.askopenfilename(
-            filetypes=[('Text Document', '*.txt')], 
-            defaultextension=[('Text Document', '*.txt')]))
-    elif event == 'Save Maze':
-        save_maze_file(sg.filedialog.asksaveasfile(
-            filetypes=[('Text Document', '*.txt')], 
-            defaultextension=[('Text Document', '*.txt')]))
-    elif event == 'Generate Maze':
-        generate_maze()
-    elif event == 'Maze Dimensions':
-        resize_window = create_resize_window()
-        event, values = resize_window.read(close=True)
-        if event == 'Resize':
-            MAZE.resize_maze(values['resize_window_maze_width'],
-                             values['resize_window_maze_height'],
-                             values['resize_window_node_size'])
-            resize_window.close()
-        elif event in ('Close', sg.WIN_CLOSED):
-            resize_window.close()
-    elif event == 'Fill Maze':
-        MAZE.fill_maze()
-    elif event == 'Runtime Info':
-        sg.popup_scrolled(sg.get_versions())
-    elif event == 'Defaults':
-        # Directory where pathpyinder.py is
-        root_dir = path.dirname(__file__)
-        settings_window = create_settings_window(root_dir)
-        event, values = settings_window.read(close=True)
-        if event == 'Save':
-            save_settings(values)
-        elif event in ('Close', sg.WIN_CLOSED):
-            settings_window.close()
-    
-    # Log window event and values
-    # print("Event: \t", event)
-    # print("Values: ", values)
+def main() -> None:
+    """Runs the GUI until the main window is closed."""
+    global window
+    init_window()
+    
+    # Continuously read the main window for user input
+    while True:
+        if window is None:
+            window = create_main_window()
+        event, values = window.read()
+        # Break the loop if the window is closed
+        if event == sg.WIN_CLOSED or event == 'Exit':
+            break
 
-window.close()
\ No newline at end of file
+        # Maze interactions
+        if event == 'maze':
+            if not MODE:
+                pass
+            else:
+                # get (x,y) coordinates of the node that was clicked
+                loc = (values['maze'][0] // NODE_SIZE, 
+                       values['maze'][1] // NODE_SIZE)
+                # make sure node location is in-bounds
+                if -1 < loc[0] < MAZE_WIDTH and -1 < loc[1] < MAZE_HEIGHT:
+                    # set the current working node
+                    clicked_node = get_node(GRID.index(*loc))
+                    # draw a node based on the draw mode
+                    if MODE == 'wall':
+                        clicked_node.make_wall_node()
+                    elif MODE == 'path':
+                        clicked_node.make_empty_node()
+                    elif MODE == 'mud':
+                        clicked_node.make_terrain_node(grid.MUD)
+                    elif MODE == 'water':
+                        clicked_node.make_terrain_node(grid.WATER)
+                    elif MODE == 'start':
+                        clicked_node.make_start_node()
+                    elif MODE == 'end':
+                        clicked_node.make_end_node()
+                    # Repair the last solution, if it's being replanned
+                    if REPLANNING:
+                        replan()
+
+        # Algorithm radio switches
+        elif event == 'radio_algo_bfs':
+            set_algo('Breadth-First Search')
+        elif event == 'radio_algo_dfs':
+            set_algo('Depth-First Search')
+        elif event == 'radio_algo_bitbfs':
+            set_algo('Bit-Parallel BFS')
+        elif event == 'radio_algo_deadend':
+            set_algo('Dead-End Filling')
+        elif event == 'radio_algo_dijkstra':
+            set_algo('Dijkstra')
+        elif event == 'radio_algo_astar':
+            set_algo('A* (A Star)')
+        elif event == 'radio_algo_bibfs':
+            set_algo('Bidirectional BFS')
+        elif event == 'radio_algo_biastar':
+            set_algo('Bidirectional A*')
+        elif event == 'radio_algo_jps':
+            set_algo('Jump Point Search')
+        elif event == 'radio_algo_jpsplus':
+            set_algo('JPS+')
+        elif event == 'radio_algo_lpastar':
+            set_algo('LPA* (Replanning)')
+        elif event == 'radio_algo_hpastar':
+            set_algo('HPA* (Hierarchical)')
+        elif event == 'radio_algo_junctions':
+            set_algo('Junction Graph A*')
+
+        # Draw tools
+        elif event == 'maze_tools_wall':
+            set_draw_mode('wall')
+        elif event == 'maze_tools_path':
+            set_draw_mode('path')
+        elif event == 'maze_tools_mud':
+            set_draw_mode('mud')
+        elif event == 'maze_tools_water':
+            set_draw_mode('water')
+        elif event == 'maze_tools_start':
+            set_draw_mode('start')
+        elif event == 'maze_tools_end':
+            set_draw_mode('end')
+
+        # Reset buttons
+        elif event == 'maze_tools_clear':
+            clear()
+        elif event == 'maze_tools_reset':
+            reset()
+
+        # Algorithm controls
+        elif event == 'controls_solve':
+            solve_maze()
+        elif event == 'controls_speed_slider':
+            set_speed(values['controls_speed_slider'])
+
+        # Menu
+        elif event == 'Open Maze':
+            open_maze_file(sg.filedialog.askopenfilename(
+                filetypes=[('Text Document', '*.txt')], 
+                defaultextension=[('Text Document', '*.txt')]))
+        elif event == 'Save Maze':
+            save_maze_file(sg.filedialog.asksaveasfile(
+                filetypes=[('Text Document', '*.txt')], 
+                defaultextension=[('Text Document', '*.txt')]))
+        elif event == 'Generate Maze':
+            generate_maze()
+        elif event == 'Maze Dimensions':
+            resize_window = create_resize_window()
+            event, values = resize_window.read(close=True)
+            if event == 'Resize':
+                MAZE.resize_maze(values['resize_window_maze_width'],
+                                 values['resize_window_maze_height'],
+                                 values['resize_window_node_size'])
+                resize_window.close()
+            elif event in ('Close', sg.WIN_CLOSED):
+                resize_window.close()
+        elif event == 'Fill Maze':
+            MAZE.fill_maze()
+        elif event == 'Runtime Info':
+            sg.popup_scrolled(sg.get_versions())
+        elif event == 'Defaults':
+            # Directory where pathpyinder.py is
+            root_dir = path.dirname(__file__)
+            settings_window = create_settings_window(root_dir)
+            event, values = settings_window.read(close=True)
+            if event == 'Save':
+                save_settings(values)
+            elif event in ('Close', sg.WIN_CLOSED):
+                settings_window.close()
+
+        # Log window event and values
+        # print("Event: \t", event)
+        # print("Values: ", values)
+
+    window.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,6 @@
 def main():
 	import pathpyinder
+	pathpyinder.main()
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()